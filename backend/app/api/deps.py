@@ -2,18 +2,39 @@
 
 from __future__ import annotations
 
-from typing import Generator
+import time
+from typing import AsyncGenerator, Generator
 
 from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.security import get_user_id_from_token
-from app.db.session import db_session
+from app.core.cache import ExpiringCache
+from app.core.config import get_settings
+from app.core.security import decode_jwt, token_expiry, user_id_from_claims
+from app.crud.user import async_user_crud
+from app.db.session import async_db_session, db_session
 from app.models.user import User
 
+# Profiles of recently authenticated users, each kept until the token that
+# loaded it expires (at most settings.user_cache_ttl seconds).
+user_cache: ExpiringCache[str, User] = ExpiringCache(get_settings().auth_cache_size)
 
-def get_db() -> Generator[Session, None, None]:
-    """FastAPI dependency that yields a request-scoped database session.
+
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that yields a request-scoped async database session.
+
+    Yields:
+        AsyncSession: Commits on success, rolls back on exception.
+    """
+    async with async_db_session() as session:
+        yield session
+
+
+def get_sync_db() -> Generator[Session, None, None]:
+    """FastAPI dependency that yields a request-scoped sync database session.
+
+    For sync handlers only; it holds a threadpool worker for the whole request.
 
     Yields:
         Session: A SQLAlchemy session. Commits on success, rolls back on exception.
@@ -22,14 +43,16 @@ def get_db() -> Generator[Session, None, None]:
         yield session
 
 
-def get_current_user_id(authorization: str = Header(..., alias="Authorization")) -> str:
-    """Extract and validate user ID from Authorization header.
+async def get_token_claims(authorization: str = Header(..., alias="Authorization")) -> dict:
+    """Validate the bearer token from the Authorization header.
+
+    Async so that cached verifications do not hop to the threadpool.
 
     Args:
         authorization: Authorization header (format: "Bearer <token>")
 
     Returns:
-        User ID (UUID as string) from the validated token.
+        Decoded claims of the validated token (shared with token_cache; read only).
 
     Raises:
         HTTPException: 401 if Authorization header is missing, malformed, or token is invalid.
@@ -40,29 +63,51 @@ def get_current_user_id(authorization: str = Header(..., alias="Authorization"))
             detail="Invalid authorization header format. Expected 'Bearer <token>'.",
         )
     token = authorization.replace("Bearer ", "", 1).strip()
-    return get_user_id_from_token(token)
+    return decode_jwt(token)
+
+
+async def get_current_user_id(claims: dict = Depends(get_token_claims)) -> str:
+    """Extract the user ID from the validated token.
+
+    Args:
+        claims: Decoded claims of the request's token.
+
+    Returns:
+        User ID (UUID as string) from the validated token.
+
+    Raises:
+        HTTPException: 401 if the token has no 'sub' claim.
+    """
+    return user_id_from_claims(claims)
 
 
-def get_current_user(
+async def get_current_user(
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    claims: dict = Depends(get_token_claims),
+    db: AsyncSession = Depends(get_db),
 ) -> User:
-    """Get the current authenticated user from the database.
+    """Get the current authenticated user, from user_cache or the database.
 
     Args:
         user_id: User ID extracted from JWT token.
+        claims: Decoded token claims (their exp bounds how long the user is cached).
         db: Database session.
 
     Returns:
-        User model instance for the authenticated user.
+        User model instance for the authenticated user (detached when cached).
 
     Raises:
         HTTPException: 404 if user not found in database.
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    user = user_cache.get(user_id)
+    if user is not None:
+        return user
+    user = await async_user_crud.get(db, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found. Please create a user profile first.",
         )
+    expires_at = min(token_expiry(claims), time.time() + get_settings().user_cache_ttl)
+    user_cache.put(user_id, user, expires_at)
     return user
@@ -1,22 +1,34 @@
-"""Game session endpoints: create and list sessions for a user."""
+"""Game session endpoints: create, list and patch sessions for a user."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
 from app.models.user import User
-from app.schemas.game import GameSessionCreate, GameSessionRead
+from app.schemas.game import (
+    GameSessionCreate,
+    GameSessionPage,
+    GameSessionPatch,
+    GameSessionRead,
+    GameSessionSummary,
+    GameSessionSummaryPage,
+)
 from app.services.game_service import game_service
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
 
 @router.post("/{user_id}/sessions", response_model=GameSessionRead)
-def create_session_for_user(
+async def create_session_for_user(
     user_id: str,
     payload: GameSessionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> GameSessionRead:
     """Create a game session for a user.
 
@@ -42,26 +54,37 @@ def create_session_for_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot create sessions for other users.",
         )
-    return game_service.create_session(db, user_id, payload)
+    return await game_service.create_session(db, user_id, payload)
 
 
-@router.get("/{user_id}/sessions", response_model=list[GameSessionRead])
-def list_sessions_for_user(
+@router.get(
+    "/{user_id}/sessions",
+    response_model=Union[GameSessionPage, GameSessionSummaryPage],
+)
+async def list_sessions_for_user(
     user_id: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page."),
+    summary: bool = Query(False, description="Omit each session's state."),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> list[GameSessionRead]:
-    """List game sessions for a user, newest first.
+    db: AsyncSession = Depends(get_db),
+) -> Union[GameSessionPage, GameSessionSummaryPage]:
+    """List a page of game sessions for a user, newest first.
 
     Args:
         user_id: User UUID as string (from path parameter).
+        limit: Maximum number of sessions on the page.
+        cursor: Cursor from the previous page's next_cursor; omit for the first page.
+        summary: Return sessions without their state.
         current_user: Authenticated user (injected dependency).
         db: Database session (injected dependency).
 
     Returns:
-        List of game sessions as GameSessionRead schemas, ordered by created_at descending.
+        GameSessionPage (GameSessionSummaryPage with summary) with sessions
+        ordered by created_at descending and the cursor of the next page.
 
     Raises:
+        HTTPException: 400 if the cursor is malformed.
         HTTPException: 403 if trying to access another user's sessions.
 
     Note:
@@ -73,4 +96,45 @@ def list_sessions_for_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot access other users' sessions.",
         )
-    return game_service.list_sessions(db, user_id)
+    return await game_service.list_sessions(
+        db, user_id, limit=limit, cursor=cursor, summary=summary
+    )
+
+
+@router.patch("/{user_id}/sessions/{session_id}", response_model=GameSessionSummary)
+async def patch_session_for_user(
+    user_id: str,
+    session_id: int,
+    payload: GameSessionPatch,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> GameSessionSummary:
+    """Update part of a game session's state with a JSON Patch or a turn delta.
+
+    Args:
+        user_id: User UUID as string (from path parameter).
+        session_id: Game session ID (from path parameter).
+        payload: RFC 6902 patch or delta, plus the version it was made against.
+        current_user: Authenticated user (injected dependency).
+        db: Database session (injected dependency).
+
+    Returns:
+        The session's new version and updated_at as GameSessionSummary (the
+        state itself is not sent back).
+
+    Raises:
+        HTTPException: 403 if trying to modify another user's session.
+        HTTPException: 404 if the session does not exist.
+        HTTPException: 409 if the session has changed since payload.version.
+        HTTPException: 422 if the patch cannot be applied (e.g. a failed test op).
+
+    Note:
+        Requires Authorization header with valid Supabase JWT token.
+        Users can only modify their own sessions.
+    """
+    if str(current_user.id) != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Cannot modify other users' sessions.",
+        )
+    return await game_service.patch_session(db, user_id, session_id, payload)
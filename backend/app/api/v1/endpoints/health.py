@@ -1,7 +1,12 @@
-"""Health check endpoint."""
+"""Health check endpoints: liveness, connection pool and auth cache metrics."""
 
 from fastapi import APIRouter
 
+from app.api.deps import user_cache
+from app.core.security import token_cache
+from app.db.base import async_engine, engine
+from app.db.pool import async_pool_metrics, sync_pool_metrics
+
 router = APIRouter()
 
 
@@ -13,3 +18,30 @@ def health() -> dict:
         dict: {"status": "ok"}.
     """
     return {"status": "ok"}
+
+
+@router.get("/pool")
+def pool_metrics() -> dict:
+    """Connection pool usage for sizing DB_POOL_SIZE / DB_MAX_OVERFLOW.
+
+    Returns:
+        dict: Per engine ("async" serves requests, "sync" scripts), the pool
+        configuration, connections in use, idle and in overflow, checkout /
+        connect / invalidation / timeout counters, peaks, and checkout wait
+        percentiles in milliseconds.
+    """
+    return {
+        "async": async_pool_metrics.snapshot(async_engine.pool),
+        "sync": sync_pool_metrics.snapshot(engine.pool),
+    }
+
+
+@router.get("/auth")
+def auth_cache_metrics() -> dict:
+    """Auth cache usage: verified tokens and user profiles.
+
+    Returns:
+        dict: For "tokens" and "users", size, maxsize, hits, misses, expired,
+        evicted and hit_rate.
+    """
+    return {"tokens": token_cache.as_dict(), "users": user_cache.as_dict()}
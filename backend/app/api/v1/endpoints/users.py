@@ -1,7 +1,7 @@
 """User endpoints: create and get user profiles."""
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_db
 from app.models.user import User
@@ -12,9 +12,9 @@ router = APIRouter()
 
 
 @router.post("", response_model=UserRead)
-def create_user(
+async def create_user(
     payload: UserCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> UserRead:
     """Create a user profile (id and email).
 
@@ -31,14 +31,14 @@ def create_user(
     Note:
         This endpoint is public - users create their profile after Supabase signup.
     """
-    return user_service.create_user(db, payload)
+    return await user_service.create_user(db, payload)
 
 
 @router.get("/{user_id}", response_model=UserRead)
-def get_user(
+async def get_user(
     user_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> UserRead:
     """Get a user by UUID.
 
@@ -63,4 +63,4 @@ def get_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Cannot access other users' profiles.",
         )
-    return user_service.get_user(db, user_id)
+    return await user_service.get_user(db, user_id)
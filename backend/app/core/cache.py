@@ -0,0 +1,131 @@
+"""Bounded in-process cache whose entries expire at a given time.
+
+Used by the auth path to remember verified token claims and user profiles
+until the token that produced them expires.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Cache counters.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that found nothing usable (including expired entries).
+        expired: Entries dropped because their expiry time had passed.
+        evicted: Entries dropped to stay within maxsize (least recently used first).
+    """
+
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evicted: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache.
+
+        Returns:
+            hits / (hits + misses), or 0.0 before any lookup.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ExpiringCache(Generic[K, V]):
+    """Thread-safe LRU mapping with a per-entry expiry (epoch seconds).
+
+    A maxsize of 0 disables the cache: nothing is stored and every lookup misses.
+    """
+
+    def __init__(self, maxsize: int, clock: Callable[[], float] = time.time) -> None:
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the value for key if present and not expired.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The cached value, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.stats.expired += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: K, value: V, expires_at: float) -> None:
+        """Store value until expires_at, evicting the least recently used entry if full.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            expires_at: Epoch seconds after which the entry is no longer returned.
+        """
+        if self.maxsize <= 0 or expires_at <= self._clock():
+            return
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evicted += 1
+
+    def pop(self, key: K) -> None:
+        """Drop key if present.
+
+        Args:
+            key: Cache key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Size and counters, as a JSON-ready dict.
+
+        Returns:
+            Dictionary with size, maxsize, hits, misses, expired, evicted and hit_rate.
+        """
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "expired": self.stats.expired,
+            "evicted": self.stats.evicted,
+            "hit_rate": round(self.stats.hit_rate, 4),
+        }
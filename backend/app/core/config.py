@@ -12,11 +12,17 @@ from typing import Optional
 
 from pydantic import BaseModel
 from dotenv import load_dotenv
+from sqlalchemy.engine import make_url
 
 # Load backend/.env so env vars are available without exporting manually.
 _backend_dir = Path(__file__).resolve().parent.parent.parent
 load_dotenv(_backend_dir / ".env")
 
+POOLER_MODES = ("session", "transaction")
+
+# Supabase's Supavisor serves transaction-mode pooling on this port.
+_TRANSACTION_POOLER_PORT = 6543
+
 
 class Settings(BaseModel):
     """Application settings loaded from environment variables.
@@ -28,6 +34,17 @@ class Settings(BaseModel):
         supabase_jwt_secret: Supabase JWT secret for token validation. Required for auth.
         supabase_service_role_key: Supabase service role key. Optional, backend-only.
         environment: "development" or "production". Defaults to "development".
+        db_pool_size: Connections kept open per engine.
+        db_max_overflow: Extra connections opened under load beyond db_pool_size.
+        db_pool_timeout: Seconds to wait for a free connection before failing.
+        db_pool_recycle: Seconds after which a connection is replaced (-1 never).
+        db_pool_pre_ping: Test connections on checkout and replace dead ones.
+        db_pooler_mode: "session" (direct or session pooler) or "transaction"
+            (pgbouncer / Supavisor transaction mode), which disables server-side
+            prepared statements.
+        auth_cache_size: Verified tokens (and user profiles) kept in memory; 0 disables.
+        user_cache_ttl: Longest a cached user profile is reused, in seconds
+            (it is also dropped when the token that loaded it expires).
     """
 
     database_url: str
@@ -36,6 +53,23 @@ class Settings(BaseModel):
     supabase_jwt_secret: Optional[str] = None
     supabase_service_role_key: Optional[str] = None
     environment: str = "development"
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_pooler_mode: str = "session"
+    auth_cache_size: int = 10_000
+    user_cache_ttl: float = 60.0
+
+    @property
+    def uses_transaction_pooler(self) -> bool:
+        """Whether connections go through a transaction-mode pooler.
+
+        Returns:
+            True if db_pooler_mode is "transaction".
+        """
+        return self.db_pooler_mode == "transaction"
 
     @property
     def is_production(self) -> bool:
@@ -53,12 +87,17 @@ def get_settings() -> Settings:
 
     Loads from os.environ and backend/.env. Requires SUPABASE_DATABASE_URL to be
     set and to be a Postgres connection string (not the Supabase project HTTPS URL).
+    Pool settings come from DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE, DB_POOL_PRE_PING and DB_POOLER_MODE; the pooler mode
+    defaults to "transaction" when the URL uses Supavisor's port 6543. Auth
+    caching comes from AUTH_CACHE_SIZE and USER_CACHE_TTL.
 
     Returns:
         Cached Settings instance with database_url, optional Supabase keys, and environment.
 
     Raises:
-        RuntimeError: If SUPABASE_DATABASE_URL is missing or starts with https://.
+        RuntimeError: If SUPABASE_DATABASE_URL is missing or starts with https://,
+            or a DB_* or cache setting is invalid.
     """
     database_url = os.environ.get("SUPABASE_DATABASE_URL")
     if not database_url:
@@ -69,10 +108,49 @@ def get_settings() -> Settings:
             "not the Supabase project URL (https://...). Get the DB URL from Supabase: Project Settings → Database → Connection string."
         )
 
+    pooler_mode = os.environ.get("DB_POOLER_MODE", "").strip().lower()
+    if not pooler_mode:
+        port = make_url(database_url).port
+        pooler_mode = "transaction" if port == _TRANSACTION_POOLER_PORT else "session"
+    if pooler_mode not in POOLER_MODES:
+        raise RuntimeError(f"DB_POOLER_MODE must be one of {', '.join(POOLER_MODES)}.")
+
     return Settings(
         database_url=database_url,
         supabase_project_url=os.environ.get("SUPABASE_PROJECT_URL"),
         supabase_anon_key=os.environ.get("SUPABASE_ANON_KEY"),
         supabase_jwt_secret=os.environ.get("SUPABASE_JWT_SECRET"),
         environment=os.environ.get("ENVIRONMENT", "development"),
+        db_pool_size=_env_number("DB_POOL_SIZE", int, 5),
+        db_max_overflow=_env_number("DB_MAX_OVERFLOW", int, 10),
+        db_pool_timeout=_env_number("DB_POOL_TIMEOUT", float, 30.0),
+        db_pool_recycle=_env_number("DB_POOL_RECYCLE", int, 1800),
+        db_pool_pre_ping=os.environ.get("DB_POOL_PRE_PING", "true").strip().lower()
+        not in ("0", "false", "no", "off"),
+        db_pooler_mode=pooler_mode,
+        auth_cache_size=_env_number("AUTH_CACHE_SIZE", int, 10_000),
+        user_cache_ttl=_env_number("USER_CACHE_TTL", float, 60.0),
     )
+
+
+def _env_number(name: str, kind: type, default: float) -> float:
+    """Read a numeric environment variable.
+
+    Args:
+        name: Environment variable name.
+        kind: int or float.
+        default: Value used when the variable is unset or empty.
+
+    Returns:
+        The parsed value.
+
+    Raises:
+        RuntimeError: If the variable is set but not a valid number.
+    """
+    raw = os.environ.get(name, "").strip()
+    if not raw:
+        return default
+    try:
+        return kind(raw)
+    except ValueError:
+        raise RuntimeError(f"{name} must be a number, got {raw!r}.")
@@ -1,4 +1,12 @@
 """Custom exceptions for the application.
 
-Placeholder for domain-specific exceptions and HTTP exception mapping.
+Domain-specific exceptions; services map them to HTTP responses.
 """
+
+
+class JsonPatchError(ValueError):
+    """A JSON Patch operation or state delta could not be applied.
+
+    Raised when a path does not exist, a `test` operation fails, or an
+    operation is malformed. The stored state is left unchanged.
+    """
@@ -0,0 +1,194 @@
+"""JSON Patch (RFC 6902) and path-delta application for game state.
+
+Postgres applies patches in place with the jsonb_patch / jsonb_set_paths
+functions from supabase/migrations/0003_game_session_patch.sql. This module
+implements the same semantics in Python for other databases (e.g. SQLite in
+local development) and for callers that patch state they already hold.
+"""
+
+from __future__ import annotations
+
+import copy
+import re
+from typing import Any, Dict, List, Sequence, Tuple
+
+from app.core.exceptions import JsonPatchError
+
+_INDEX = re.compile(r"0|[1-9][0-9]*")
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Split a JSON Pointer (RFC 6901) into unescaped reference tokens.
+
+    Args:
+        pointer: "" for the whole document, otherwise "/"-prefixed tokens.
+
+    Returns:
+        List of tokens (empty for the whole document).
+
+    Raises:
+        JsonPatchError: If the pointer does not start with "/".
+    """
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"invalid JSON pointer {pointer!r}")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _resolve(doc: Any, tokens: Sequence[str]) -> Tuple[bool, Any]:
+    for token in tokens:
+        if isinstance(doc, dict) and token in doc:
+            doc = doc[token]
+        elif isinstance(doc, list) and _INDEX.fullmatch(token) and int(token) < len(doc):
+            doc = doc[int(token)]
+        else:
+            return False, None
+    return True, doc
+
+
+def _get(doc: Any, tokens: Sequence[str], pointer: str) -> Any:
+    found, value = _resolve(doc, tokens)
+    if not found:
+        raise JsonPatchError(f"path {pointer!r} not found")
+    return value
+
+
+def _parent(doc: Any, tokens: Sequence[str], pointer: str) -> Any:
+    parent = _get(doc, tokens[:-1], pointer)
+    if not isinstance(parent, (dict, list)):
+        raise JsonPatchError(f"parent of {pointer!r} is not a container")
+    return parent
+
+
+def _array_index(parent: list, token: str, pointer: str, *, insert: bool) -> int:
+    if token == "-" and insert:
+        return len(parent)
+    if _INDEX.fullmatch(token):
+        index = int(token)
+        if index < len(parent) or (insert and index == len(parent)):
+            return index
+    raise JsonPatchError(f"array index in {pointer!r} out of range")
+
+
+def _add(doc: Any, tokens: List[str], value: Any, pointer: str) -> Any:
+    if not tokens:
+        return value
+    parent = _parent(doc, tokens, pointer)
+    if isinstance(parent, list):
+        parent.insert(_array_index(parent, tokens[-1], pointer, insert=True), value)
+    else:
+        parent[tokens[-1]] = value
+    return doc
+
+
+def _remove(doc: Any, tokens: List[str], pointer: str) -> Any:
+    if not tokens:
+        raise JsonPatchError("cannot remove the whole state")
+    _get(doc, tokens, pointer)
+    parent = _parent(doc, tokens, pointer)
+    if isinstance(parent, list):
+        del parent[int(tokens[-1])]
+    else:
+        del parent[tokens[-1]]
+    return doc
+
+
+def _replace(doc: Any, tokens: List[str], value: Any, pointer: str) -> Any:
+    _get(doc, tokens, pointer)
+    if not tokens:
+        return value
+    parent = _parent(doc, tokens, pointer)
+    parent[int(tokens[-1]) if isinstance(parent, list) else tokens[-1]] = value
+    return doc
+
+
+def _json_equal(a: Any, b: Any) -> bool:
+    # Python's == treats True == 1; JSON does not.
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list) and isinstance(b, list):
+        return len(a) == len(b) and all(_json_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def apply_patch(doc: Any, operations: Sequence[Dict[str, Any]]) -> Any:
+    """Apply RFC 6902 operations in order, all or nothing.
+
+    Args:
+        doc: JSON document (left unmodified).
+        operations: Operations as dicts with "op", "path" and, depending on
+            the op, "value" or "from".
+
+    Returns:
+        The patched document.
+
+    Raises:
+        JsonPatchError: If any operation fails; no partial result is returned.
+    """
+    doc = copy.deepcopy(doc)
+    for operation in operations:
+        op, pointer = operation.get("op"), operation.get("path", "")
+        tokens = parse_pointer(pointer)
+        if op == "add":
+            doc = _add(doc, tokens, copy.deepcopy(operation["value"]), pointer)
+        elif op == "remove":
+            doc = _remove(doc, tokens, pointer)
+        elif op == "replace":
+            doc = _replace(doc, tokens, copy.deepcopy(operation["value"]), pointer)
+        elif op in ("move", "copy"):
+            source = operation["from"]
+            from_tokens = parse_pointer(source)
+            value = _get(doc, from_tokens, source)
+            if op == "move":
+                if tokens == from_tokens:
+                    continue
+                if tokens[: len(from_tokens)] == from_tokens:
+                    raise JsonPatchError(f"cannot move {source!r} into its own child")
+                doc = _remove(doc, from_tokens, source)
+            else:
+                value = copy.deepcopy(value)
+            doc = _add(doc, tokens, value, pointer)
+        elif op == "test":
+            if not _json_equal(_get(doc, tokens, pointer), operation["value"]):
+                raise JsonPatchError(f"test failed at {pointer!r}")
+        else:
+            raise JsonPatchError(f"unknown operation {op!r}")
+    return doc
+
+
+def apply_delta(doc: Any, delta: Sequence[Tuple[str, Any]]) -> Any:
+    """Set values at JSON Pointers, in order (a turn's changes).
+
+    Each value replaces what is at its pointer; a missing object member is
+    created, and "-" appends to an array. The parent must already exist.
+
+    Args:
+        doc: JSON document (left unmodified).
+        delta: (pointer, value) pairs.
+
+    Returns:
+        The updated document.
+
+    Raises:
+        JsonPatchError: If a pointer's parent does not exist or an array index
+            is out of range.
+    """
+    doc = copy.deepcopy(doc)
+    for pointer, value in delta:
+        tokens = parse_pointer(pointer)
+        if not tokens:
+            doc = copy.deepcopy(value)
+            continue
+        parent = _parent(doc, tokens, pointer)
+        if isinstance(parent, list):
+            index = _array_index(parent, tokens[-1], pointer, insert=tokens[-1] == "-")
+            if index == len(parent):
+                parent.append(copy.deepcopy(value))
+            else:
+                parent[index] = copy.deepcopy(value)
+        else:
+            parent[tokens[-1]] = copy.deepcopy(value)
+    return doc
@@ -1,27 +1,34 @@
 """Security utilities: JWT validation for Supabase tokens.
 
-Validates JWTs issued by Supabase Auth to protect backend routes.
+Validates JWTs issued by Supabase Auth to protect backend routes. Verified
+claims are cached per token until the token's exp, so repeated requests with
+the same access token skip the signature check.
 """
 
 from __future__ import annotations
 
+import time
+from functools import lru_cache
+from typing import Tuple
+
 import jwt
 from fastapi import HTTPException, status
 
+from app.core.cache import ExpiringCache
 from app.core.config import get_settings
 
+token_cache: ExpiringCache[str, dict] = ExpiringCache(get_settings().auth_cache_size)
 
-def decode_jwt(token: str) -> dict:
-    """Decode and validate a Supabase JWT token.
 
-    Args:
-        token: JWT access token from Supabase Auth.
+@lru_cache
+def _verifier() -> Tuple[jwt.PyJWT, bytes]:
+    """Build the JWT decoder and HMAC key once.
 
     Returns:
-        Decoded token payload with user info.
+        A PyJWT instance with the Supabase options and the secret as bytes.
 
     Raises:
-        HTTPException: 401 if token is invalid, expired, or missing required claims.
+        HTTPException: 503 if SUPABASE_JWT_SECRET is not configured (not cached).
     """
     settings = get_settings()
     if not settings.supabase_jwt_secret:
@@ -29,15 +36,33 @@ def decode_jwt(token: str) -> dict:
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="JWT validation not configured (missing SUPABASE_JWT_SECRET).",
         )
+    # Supabase doesn't use aud claim by default
+    decoder = jwt.PyJWT(options={"verify_aud": False})
+    return decoder, settings.supabase_jwt_secret.encode()
 
+
+def decode_jwt(token: str) -> dict:
+    """Decode and validate a Supabase JWT token.
+
+    Claims of a token verified before and not yet expired are returned from
+    token_cache; callers must not modify them.
+
+    Args:
+        token: JWT access token from Supabase Auth.
+
+    Returns:
+        Decoded token payload with user info.
+
+    Raises:
+        HTTPException: 401 if token is invalid, expired, or missing required claims.
+    """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    decoder, key = _verifier()
     try:
-        payload = jwt.decode(
-            token,
-            settings.supabase_jwt_secret,
-            algorithms=["HS256"],
-            options={"verify_aud": False},  # Supabase doesn't use aud claim by default
-        )
-        return payload
+        payload = decoder.decode(token, key, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,25 +73,56 @@ def decode_jwt(token: str) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token.",
         )
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.put(token, payload, float(exp))
+    return payload
 
 
-def get_user_id_from_token(token: str) -> str:
-    """Extract user ID from a Supabase JWT token.
+def token_expiry(claims: dict) -> float:
+    """When a token's claims stop being valid.
 
     Args:
-        token: JWT access token from Supabase Auth.
+        claims: Decoded token payload.
 
     Returns:
-        User ID (UUID as string) from the token's 'sub' claim.
+        The exp claim as epoch seconds, or the current time if it has none.
+    """
+    exp = claims.get("exp")
+    return float(exp) if isinstance(exp, (int, float)) else time.time()
+
+
+def user_id_from_claims(claims: dict) -> str:
+    """Extract the user ID from decoded token claims.
+
+    Args:
+        claims: Decoded token payload.
+
+    Returns:
+        User ID (UUID as string) from the 'sub' claim.
 
     Raises:
-        HTTPException: 401 if token is invalid or missing 'sub' claim.
+        HTTPException: 401 if the 'sub' claim is missing.
     """
-    payload = decode_jwt(token)
-    user_id = payload.get("sub")
+    user_id = claims.get("sub")
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token missing user ID (sub claim).",
         )
     return user_id
+
+
+def get_user_id_from_token(token: str) -> str:
+    """Extract user ID from a Supabase JWT token.
+
+    Args:
+        token: JWT access token from Supabase Auth.
+
+    Returns:
+        User ID (UUID as string) from the token's 'sub' claim.
+
+    Raises:
+        HTTPException: 401 if token is invalid or missing 'sub' claim.
+    """
+    return user_id_from_claims(decode_jwt(token))
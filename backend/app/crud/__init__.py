@@ -1,6 +1,6 @@
-"""CRUD operations."""
+"""CRUD operations (sync and async)."""
 
-from app.crud.user import user_crud
-from app.crud.game import game_crud
+from app.crud.user import async_user_crud, user_crud
+from app.crud.game import async_game_crud, game_crud
 
-__all__ = ["user_crud", "game_crud"]
+__all__ = ["user_crud", "game_crud", "async_user_crud", "async_game_crud"]
@@ -2,13 +2,35 @@
 
 from __future__ import annotations
 
+import re
 import uuid
-from typing import List
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, Select, Update, cast, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, defer
 
+from app.core.exceptions import JsonPatchError
+from app.core.json_patch import apply_delta, apply_patch
 from app.models.game import GameSession
 
+# Columns returned by patch_state; the (possibly large) state is not sent back.
+_PATCH_RETURNING = (
+    GameSession.id,
+    GameSession.user_id,
+    GameSession.created_at,
+    GameSession.updated_at,
+    GameSession.version,
+)
+
+
+def _owner(user_id: uuid.UUID | str) -> uuid.UUID:
+    """user_id as a UUID; a string only binds on drivers with a native uuid type."""
+    return user_id if isinstance(user_id, uuid.UUID) else uuid.UUID(user_id)
+
 
 def create(db: Session, *, user_id: uuid.UUID, state: dict) -> GameSession:
     """Create a game session.
@@ -30,28 +52,315 @@ def create(db: Session, *, user_id: uuid.UUID, state: dict) -> GameSession:
     return session
 
 
-def list_by_user_id(db: Session, user_id: uuid.UUID | str) -> List[GameSession]:
+def _list_query(
+    user_id: uuid.UUID | str,
+    limit: Optional[int],
+    before: Optional[Tuple[datetime, int]],
+    summary: bool,
+) -> Select:
+    """Build the newest-first query behind list_by_user_id.
+
+    Rows are ordered by (created_at, id) descending, which the
+    game_sessions_user_created_idx index serves directly. A keyset `before`
+    continues after the last row of the previous page, so a page costs the
+    same however deep it is (unlike OFFSET).
+    """
+    q = select(GameSession).where(GameSession.user_id == _owner(user_id))
+    if before is not None:
+        q = q.where(tuple_(GameSession.created_at, GameSession.id) < tuple_(*before))
+    if summary:
+        # Leave the state blob out of the SELECT; touching it would raise
+        # instead of quietly issuing one extra query per row.
+        q = q.options(defer(GameSession.state, raiseload=True))
+    q = q.order_by(GameSession.created_at.desc(), GameSession.id.desc())
+    if limit is not None:
+        q = q.limit(limit)
+    return q
+
+
+def list_by_user_id(
+    db: Session,
+    user_id: uuid.UUID | str,
+    *,
+    limit: Optional[int] = None,
+    before: Optional[Tuple[datetime, int]] = None,
+    summary: bool = False,
+) -> List[GameSession]:
     """List game sessions for a user, newest first.
 
     Args:
         db: Database session.
         user_id: User UUID as UUID object or string.
+        limit: Maximum number of sessions to return (all if None).
+        before: (created_at, id) of the last session already seen; only older
+            sessions are returned.
+        summary: Skip loading the state column.
+
+    Returns:
+        List of GameSession model instances ordered by created_at (then id) descending.
+    """
+    return list(db.scalars(_list_query(user_id, limit, before, summary)).all())
+
+
+async def create_async(db: AsyncSession, *, user_id: uuid.UUID, state: dict) -> GameSession:
+    """Create a game session (async).
+
+    Args:
+        db: Async database session.
+        user_id: User UUID who owns the game session.
+        state: Serialized Catan game state as dictionary.
+
+    Returns:
+        Created GameSession model instance.
+
+    Note:
+        Caller must commit or use within async_db_session context manager.
+    """
+    session = GameSession(user_id=user_id, state=state)
+    db.add(session)
+    await db.flush()
+    return session
+
+
+async def list_by_user_id_async(
+    db: AsyncSession,
+    user_id: uuid.UUID | str,
+    *,
+    limit: Optional[int] = None,
+    before: Optional[Tuple[datetime, int]] = None,
+    summary: bool = False,
+) -> List[GameSession]:
+    """List game sessions for a user, newest first (async).
+
+    Args:
+        db: Async database session.
+        user_id: User UUID as UUID object or string.
+        limit: Maximum number of sessions to return (all if None).
+        before: (created_at, id) of the last session already seen; only older
+            sessions are returned.
+        summary: Skip loading the state column.
 
     Returns:
-        List of GameSession model instances ordered by created_at descending.
+        List of GameSession model instances ordered by created_at (then id) descending.
     """
-    q = db.query(GameSession).filter(GameSession.user_id == user_id)
-    return q.order_by(GameSession.created_at.desc()).all()
+    result = await db.scalars(_list_query(user_id, limit, before, summary))
+    return list(result.all())
+
+
+def _state_in_place(
+    patch: Optional[Sequence[Dict[str, Any]]], delta: Optional[Dict[str, Any]]
+) -> Any:
+    """jsonb expression applying the change inside Postgres.
+
+    Uses jsonb_patch / jsonb_set_paths from
+    supabase/migrations/0003_game_session_patch.sql, so only the patch travels
+    to the database.
+    """
+    state = cast(GameSession.state, JSONB)
+    if patch is not None:
+        return func.jsonb_patch(state, literal(list(patch), JSONB), type_=JSONB)
+    pairs = [[pointer, value] for pointer, value in (delta or {}).items()]
+    return func.jsonb_set_paths(state, literal(pairs, JSONB), type_=JSONB)
+
+
+def _state_applied(
+    state: Any, patch: Optional[Sequence[Dict[str, Any]]], delta: Optional[Dict[str, Any]]
+) -> Any:
+    """The change applied in Python, for databases without the jsonb functions."""
+    if patch is not None:
+        return apply_patch(state, patch)
+    return apply_delta(state, list((delta or {}).items()))
+
+
+def _versioned_update(
+    session_id: int, user_id: uuid.UUID | str, version: int, new_state: Any
+) -> Update:
+    return (
+        update(GameSession)
+        .where(
+            GameSession.id == session_id,
+            GameSession.user_id == _owner(user_id),
+            GameSession.version == version,
+        )
+        .values(state=new_state, version=GameSession.version + 1)
+        .returning(*_PATCH_RETURNING)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _patch_error(exc: DBAPIError) -> Optional[JsonPatchError]:
+    """JsonPatchError for a failure raised by jsonb_patch / jsonb_set_paths, else None."""
+    code = getattr(exc.orig, "sqlstate", None) or getattr(exc.orig, "pgcode", None)
+    match = re.search(r"json patch: ([^\n]*)", str(exc.orig))
+    if code != "22023" or not match:
+        return None
+    return JsonPatchError(match.group(1))
+
+
+def get_version(db: Session, session_id: int, user_id: uuid.UUID | str) -> Optional[int]:
+    """Current version of a user's game session.
+
+    Args:
+        db: Database session.
+        session_id: Game session ID.
+        user_id: Owner's UUID as UUID object or string.
+
+    Returns:
+        The session's version, or None if the user has no such session.
+    """
+    return db.scalar(
+        select(GameSession.version).where(
+            GameSession.id == session_id, GameSession.user_id == _owner(user_id)
+        )
+    )
+
+
+def patch_state(
+    db: Session,
+    session_id: int,
+    user_id: uuid.UUID | str,
+    *,
+    version: int,
+    patch: Optional[Sequence[Dict[str, Any]]] = None,
+    delta: Optional[Dict[str, Any]] = None,
+) -> Optional[Row]:
+    """Apply a JSON Patch or a path delta to a session's state, if still at version.
+
+    On Postgres the change is applied in the UPDATE itself; elsewhere the
+    state is read, patched in Python and written back. Either way the UPDATE
+    only matches the expected version and increments it.
+
+    Args:
+        db: Database session.
+        session_id: Game session ID.
+        user_id: Owner's UUID as UUID object or string.
+        version: Version the change was made against.
+        patch: RFC 6902 operations as dicts (exactly one of patch and delta).
+        delta: JSON Pointer -> new value.
+
+    Returns:
+        Row of (id, user_id, created_at, updated_at, version) after the update,
+        or None if the user has no such session at that version.
+
+    Raises:
+        JsonPatchError: If the change cannot be applied to the stored state.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        new_state = _state_in_place(patch, delta)
+    else:
+        state = db.scalar(
+            select(GameSession.state).where(
+                GameSession.id == session_id,
+                GameSession.user_id == _owner(user_id),
+                GameSession.version == version,
+            )
+        )
+        if state is None:
+            return None
+        new_state = _state_applied(state, patch, delta)
+    try:
+        return db.execute(_versioned_update(session_id, user_id, version, new_state)).first()
+    except DBAPIError as exc:
+        error = _patch_error(exc)
+        if error is None:
+            raise
+        raise error from exc
+
+
+async def get_version_async(
+    db: AsyncSession, session_id: int, user_id: uuid.UUID | str
+) -> Optional[int]:
+    """Current version of a user's game session (async).
+
+    Args:
+        db: Async database session.
+        session_id: Game session ID.
+        user_id: Owner's UUID as UUID object or string.
+
+    Returns:
+        The session's version, or None if the user has no such session.
+    """
+    return await db.scalar(
+        select(GameSession.version).where(
+            GameSession.id == session_id, GameSession.user_id == _owner(user_id)
+        )
+    )
+
+
+async def patch_state_async(
+    db: AsyncSession,
+    session_id: int,
+    user_id: uuid.UUID | str,
+    *,
+    version: int,
+    patch: Optional[Sequence[Dict[str, Any]]] = None,
+    delta: Optional[Dict[str, Any]] = None,
+) -> Optional[Row]:
+    """Apply a JSON Patch or a path delta to a session's state, if still at version (async).
+
+    See patch_state.
+
+    Args:
+        db: Async database session.
+        session_id: Game session ID.
+        user_id: Owner's UUID as UUID object or string.
+        version: Version the change was made against.
+        patch: RFC 6902 operations as dicts (exactly one of patch and delta).
+        delta: JSON Pointer -> new value.
+
+    Returns:
+        Row of (id, user_id, created_at, updated_at, version) after the update,
+        or None if the user has no such session at that version.
+
+    Raises:
+        JsonPatchError: If the change cannot be applied to the stored state.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        new_state = _state_in_place(patch, delta)
+    else:
+        state = await db.scalar(
+            select(GameSession.state).where(
+                GameSession.id == session_id,
+                GameSession.user_id == _owner(user_id),
+                GameSession.version == version,
+            )
+        )
+        if state is None:
+            return None
+        new_state = _state_applied(state, patch, delta)
+    try:
+        result = await db.execute(_versioned_update(session_id, user_id, version, new_state))
+    except DBAPIError as exc:
+        error = _patch_error(exc)
+        if error is None:
+            raise
+        raise error from exc
+    return result.first()
 
 
 class GameCRUD:
     """Game session CRUD operations namespace.
 
-    Provides database operations for GameSession model: create and list by user.
+    Provides database operations for GameSession model: create, list by user
+    and incremental state updates.
     """
 
     create = staticmethod(create)
     list_by_user_id = staticmethod(list_by_user_id)
+    get_version = staticmethod(get_version)
+    patch_state = staticmethod(patch_state)
 
 
 game_crud = GameCRUD()
+
+
+class AsyncGameCRUD:
+    """Async game session CRUD operations namespace, mirroring GameCRUD on AsyncSession."""
+
+    create = staticmethod(create_async)
+    list_by_user_id = staticmethod(list_by_user_id_async)
+    get_version = staticmethod(get_version_async)
+    patch_state = staticmethod(patch_state_async)
+
+
+async_game_crud = AsyncGameCRUD()
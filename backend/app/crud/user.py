@@ -5,6 +5,8 @@ from __future__ import annotations
 import uuid
 from typing import Optional
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.user import User
@@ -56,6 +58,53 @@ def create(db: Session, *, id: uuid.UUID, email: str) -> User:
     return user
 
 
+async def get_by_id_async(db: AsyncSession, user_id: uuid.UUID | str) -> Optional[User]:
+    """Get a user by primary key (async).
+
+    Args:
+        db: Async database session.
+        user_id: User UUID as UUID object or string.
+
+    Returns:
+        User model instance if found, None otherwise.
+    """
+    return await db.get(User, user_id)
+
+
+async def get_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+    """Get a user by email (async).
+
+    Args:
+        db: Async database session.
+        email: User email address.
+
+    Returns:
+        User model instance if found, None otherwise.
+    """
+    result = await db.execute(select(User).where(User.email == email).limit(1))
+    return result.scalars().first()
+
+
+async def create_async(db: AsyncSession, *, id: uuid.UUID, email: str) -> User:
+    """Create a user (async).
+
+    Args:
+        db: Async database session.
+        id: User UUID (must match Supabase auth user id).
+        email: User email address.
+
+    Returns:
+        Created User model instance.
+
+    Note:
+        Caller must commit or use within async_db_session context manager.
+    """
+    user = User(id=id, email=email)
+    db.add(user)
+    await db.flush()
+    return user
+
+
 # Expose a simple namespace for endpoints that want to use crud
 class UserCRUD:
     """User CRUD operations namespace.
@@ -69,3 +118,14 @@ class UserCRUD:
 
 
 user_crud = UserCRUD()
+
+
+class AsyncUserCRUD:
+    """Async User CRUD operations namespace, mirroring UserCRUD on AsyncSession."""
+
+    get = staticmethod(get_by_id_async)
+    get_by_email = staticmethod(get_by_email_async)
+    create = staticmethod(create_async)
+
+
+async_user_crud = AsyncUserCRUD()
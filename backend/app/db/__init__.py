@@ -1,6 +1,14 @@
-"""Database: base, engine, session."""
+"""Database: base, engines, sessions."""
 
-from .base import Base, engine
-from .session import SessionLocal, db_session
+from .base import Base, async_engine, engine
+from .session import AsyncSessionLocal, SessionLocal, async_db_session, db_session
 
-__all__ = ["Base", "engine", "SessionLocal", "db_session"]
+__all__ = [
+    "Base",
+    "engine",
+    "async_engine",
+    "SessionLocal",
+    "AsyncSessionLocal",
+    "db_session",
+    "async_db_session",
+]
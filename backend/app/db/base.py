@@ -1,24 +1,68 @@
-"""SQLAlchemy declarative base and engine."""
+"""SQLAlchemy declarative base and engines (sync and async)."""
 
 from __future__ import annotations
 
 from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlalchemy.orm import declarative_base
 
 from app.core.config import get_settings
+from app.db.pool import async_pool_metrics, engine_options, instrument, sync_pool_metrics
 
 Base = declarative_base()
 
 
+def async_database_url(database_url: str) -> str:
+    """Rewrite a Postgres URL to use the asyncpg driver.
+
+    Args:
+        database_url: Connection string as configured (postgresql://,
+            postgres:// or postgresql+<driver>://).
+
+    Returns:
+        The same connection string with the postgresql+asyncpg driver; a libpq
+        sslmode parameter becomes asyncpg's ssl.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() in ("postgresql", "postgres"):
+        url = url.set(drivername="postgresql+asyncpg")
+        sslmode = url.query.get("sslmode")
+        if sslmode is not None:
+            url = url.difference_update_query(["sslmode"]).update_query_dict({"ssl": sslmode})
+    return url.render_as_string(hide_password=False)
+
+
 def _get_engine() -> Engine:
     """Build the SQLAlchemy engine from settings.
 
     Returns:
-        Engine configured with settings.database_url and future=True.
+        Engine configured with settings.database_url, future=True and the
+        db_* pool settings.
+    """
+    settings = get_settings()
+    sync_engine = create_engine(
+        settings.database_url, future=True, **engine_options(settings, use_async=False)
+    )
+    instrument(sync_engine, sync_pool_metrics)
+    return sync_engine
+
+
+def _get_async_engine() -> AsyncEngine:
+    """Build the async SQLAlchemy engine used by the request path.
+
+    Returns:
+        AsyncEngine on the asyncpg driver for settings.database_url, with the
+        db_* pool settings (and prepared statements off behind a transaction
+        pooler).
     """
     settings = get_settings()
-    return create_engine(settings.database_url, future=True)
+    async_engine_ = create_async_engine(
+        async_database_url(settings.database_url), **engine_options(settings, use_async=True)
+    )
+    instrument(async_engine_.sync_engine, async_pool_metrics)
+    return async_engine_
 
 
 engine = _get_engine()
+async_engine = _get_async_engine()
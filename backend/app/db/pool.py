@@ -0,0 +1,178 @@
+"""Connection pool configuration and metrics.
+
+Both engines use a QueuePool subclass that times every checkout (waiting for a
+free connection, or opening a new one) and records how far the pool has grown
+into its overflow. The numbers are served by GET /health/pool, to size
+DB_POOL_SIZE / DB_MAX_OVERFLOW from observed load.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import Settings
+
+# Checkout waits kept for the percentiles.
+_WAIT_SAMPLES = 4096
+
+
+@dataclass
+class PoolMetrics:
+    """Running pool counters.
+
+    Attributes:
+        checkouts: Connections handed out.
+        connects: New DB connections opened (including replacements).
+        invalidations: Connections discarded as dead or after an error.
+        timeouts: Checkouts that gave up after db_pool_timeout.
+        peak_checked_out: Most connections in use at once.
+        peak_overflow: Most overflow connections open at once.
+        waits: Recent checkout times in seconds.
+    """
+
+    checkouts: int = 0
+    connects: int = 0
+    invalidations: int = 0
+    timeouts: int = 0
+    peak_checked_out: int = 0
+    peak_overflow: int = 0
+    waits: Deque[float] = field(default_factory=lambda: deque(maxlen=_WAIT_SAMPLES))
+
+    def record_checkout(self, seconds: float, checked_out: int, overflow: int) -> None:
+        """Record one checkout and the pool's state right after it.
+
+        Args:
+            seconds: Time spent in the checkout.
+            checked_out: Connections in use after the checkout.
+            overflow: Overflow connections open after the checkout.
+        """
+        self.checkouts += 1
+        self.waits.append(seconds)
+        self.peak_checked_out = max(self.peak_checked_out, checked_out)
+        self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def snapshot(self, pool: QueuePool) -> Dict[str, Any]:
+        """Counters plus the pool's current state, as a JSON-ready dict.
+
+        Args:
+            pool: The engine's current pool.
+
+        Returns:
+            Dictionary of configuration, current usage, counters and checkout
+            wait percentiles in milliseconds.
+        """
+        waits = sorted(self.waits)
+
+        def pick(q: float) -> float:
+            if not waits:
+                return 0.0
+            return round(1000 * waits[min(len(waits) - 1, int(q * len(waits)))], 3)
+
+        return {
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "peak_checked_out": self.peak_checked_out,
+            "peak_overflow": self.peak_overflow,
+            "wait_ms": {"p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99), "max": pick(1.0)},
+        }
+
+
+sync_pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+class _InstrumentedPool:
+    """Mixin timing QueuePool.connect; metrics live on the class so they
+    survive Pool.recreate() (e.g. on engine.dispose())."""
+
+    metrics: PoolMetrics
+
+    def connect(self):  # type: ignore[no-untyped-def]
+        start = time.perf_counter()
+        try:
+            conn = super().connect()  # type: ignore[misc]
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.record_checkout(
+            time.perf_counter() - start,
+            self.checkedout(),  # type: ignore[attr-defined]
+            max(0, self.overflow()),  # type: ignore[attr-defined]
+        )
+        return conn
+
+
+class InstrumentedQueuePool(_InstrumentedPool, QueuePool):
+    """QueuePool for the sync engine, recording into sync_pool_metrics."""
+
+    metrics = sync_pool_metrics
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool for the async engine, recording into async_pool_metrics."""
+
+    metrics = async_pool_metrics
+
+
+def engine_options(settings: Settings, *, use_async: bool) -> Dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine.
+
+    Args:
+        settings: Application settings with the db_* pool options.
+        use_async: Build options for the asyncpg engine.
+
+    Returns:
+        Pool class and sizing, pre-ping and recycle options, plus asyncpg
+        connect_args that disable prepared statements in transaction pooler
+        mode (a pooled server connection may change between statements, so
+        a statement prepared on one is missing on the next).
+    """
+    options: Dict[str, Any] = {
+        "poolclass": InstrumentedAsyncQueuePool if use_async else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if use_async and settings.uses_transaction_pooler:
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # Unnamed statements can still collide across clients sharing a
+            # server connection; unique names avoid that.
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    return options
+
+
+def instrument(engine: Any, metrics: PoolMetrics) -> None:
+    """Count new and invalidated connections for an engine's pool.
+
+    Args:
+        engine: A sync Engine (for an AsyncEngine, its sync_engine).
+        metrics: Metrics to update.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        metrics.connects += 1
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        metrics.invalidations += 1
@@ -1,16 +1,23 @@
-"""Database session factory and context manager."""
+"""Database session factories and context managers (sync and async)."""
 
 from __future__ import annotations
 
-from contextlib import contextmanager
-from typing import Generator
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncGenerator, Generator
 
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
 
-from app.db.base import engine
+from app.db.base import async_engine, engine
 
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, future=True)
 
+# expire_on_commit=False: objects are serialized after the commit, and an
+# AsyncSession cannot lazily reload expired attributes.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 @contextmanager
 def db_session() -> Generator[Session, None, None]:
@@ -34,3 +41,25 @@ def db_session() -> Generator[Session, None, None]:
         raise
     finally:
         session.close()
+
+
+@asynccontextmanager
+async def async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """Async counterpart of db_session.
+
+    Yields:
+        AsyncSession: Commits on normal exit, rolls back on exception, and is
+        always closed when the block exits.
+
+    Raises:
+        Exception: Re-raises any exception after rolling back the transaction.
+    """
+    session: AsyncSession = AsyncSessionLocal()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
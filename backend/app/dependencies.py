@@ -1,5 +1,5 @@
 """Shared dependencies (re-export API deps for convenience)."""
 
-from app.api.deps import get_db
+from app.api.deps import get_db, get_sync_db
 
-__all__ = ["get_db"]
+__all__ = ["get_db", "get_sync_db"]
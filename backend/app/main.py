@@ -13,7 +13,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.v1.api import api_router
-from app.db.base import Base, engine
+from app.db.base import Base, async_engine
 
 # Import models so they register with Base.metadata before create_all.
 import app.models  # noqa: F401
@@ -21,7 +21,7 @@ import app.models  # noqa: F401
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Run startup logic (create tables if missing). Shutdown is a no-op.
+    """Run startup logic (create tables if missing); on shutdown close DB connections.
 
     Args:
         app: The FastAPI application instance (unused; required by lifespan signature).
@@ -29,8 +29,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Yields:
         None: Control returns to the caller while the app is running.
     """
-    Base.metadata.create_all(bind=engine)
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     yield
+    await async_engine.dispose()
 
 
 def create_app() -> FastAPI:
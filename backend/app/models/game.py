@@ -5,7 +5,7 @@ from __future__ import annotations
 import uuid
 from datetime import datetime
 
-from sqlalchemy import UUID, DateTime, ForeignKey, Integer, JSON
+from sqlalchemy import UUID, DateTime, ForeignKey, Index, Integer, JSON
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from app.models.base import Base
@@ -22,6 +22,8 @@ class GameSession(Base):
         created_at: When the session was created.
         updated_at: When the session was last updated.
         state: Serialized Catan game state (JSON).
+        version: Incremented on every state change; PATCH requests must name
+            the version they were made against (optimistic concurrency).
         user: Related User instance.
     """
 
@@ -32,7 +34,6 @@ class GameSession(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow
@@ -41,5 +42,11 @@ class GameSession(Base):
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
     )
     state: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    # Serves the newest-first, keyset-paginated session listing.
+    __table_args__ = (
+        Index("game_sessions_user_created_idx", user_id, created_at.desc(), id.desc()),
+    )
 
     user: Mapped["User"] = relationship("User", back_populates="game_sessions")
@@ -1,7 +1,16 @@
 """Pydantic schemas for API request/response validation."""
 
 from app.schemas.user import UserBase, UserCreate, UserRead
-from app.schemas.game import GameSessionBase, GameSessionCreate, GameSessionRead
+from app.schemas.game import (
+    GameSessionBase,
+    GameSessionCreate,
+    GameSessionPage,
+    GameSessionPatch,
+    GameSessionRead,
+    GameSessionSummary,
+    GameSessionSummaryPage,
+    JsonPatchOperation,
+)
 from app.schemas.auth import AuthLoginRequest, AuthSignupRequest
 
 __all__ = [
@@ -11,6 +20,11 @@ __all__ = [
     "GameSessionBase",
     "GameSessionCreate",
     "GameSessionRead",
+    "GameSessionSummary",
+    "GameSessionPage",
+    "GameSessionSummaryPage",
+    "GameSessionPatch",
+    "JsonPatchOperation",
     "AuthLoginRequest",
     "AuthSignupRequest",
 ]
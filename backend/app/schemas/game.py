@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+# A JSON Pointer (RFC 6901): "" for the whole state, otherwise "/"-prefixed.
+JSON_POINTER = r"^(/.*)?$"
 
 
 class GameSessionBase(BaseModel):
@@ -38,15 +41,126 @@ class GameSessionRead(GameSessionBase):
     Attributes:
         id: Game session ID (primary key).
         user_id: User UUID who owns the session.
-        state: Serialized Catan game state as dictionary (inherited from GameSessionBase).
+        state: Serialized Catan game state as dictionary.
+        created_at: Timestamp when the session was created.
+        updated_at: Timestamp when the session was last updated.
+        version: State version, incremented on every update.
+    """
+
+    id: int
+    user_id: uuid.UUID
+    # Required here, unlike on create, so a summary never passes for a session.
+    state: Dict[str, Any] = Field(..., description="Serialized Catan game state.")
+    created_at: datetime
+    updated_at: datetime
+    version: int
+
+    class Config:
+        from_attributes = True
+
+
+class GameSessionSummary(BaseModel):
+    """Game session without its state, as listed in summary mode.
+
+    Attributes:
+        id: Game session ID (primary key).
+        user_id: User UUID who owns the session.
         created_at: Timestamp when the session was created.
         updated_at: Timestamp when the session was last updated.
+        version: State version, incremented on every update.
     """
 
     id: int
     user_id: uuid.UUID
     created_at: datetime
     updated_at: datetime
+    version: int
 
     class Config:
         from_attributes = True
+
+
+class GameSessionPage(BaseModel):
+    """One page of a user's game sessions, newest first.
+
+    Attributes:
+        items: Sessions on this page, with their state.
+        next_cursor: Opaque cursor for the following page, or None on the last page.
+    """
+
+    items: List[GameSessionRead]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the next page; null on the last page.",
+    )
+
+
+class GameSessionSummaryPage(BaseModel):
+    """One page of a user's game sessions without their state, newest first.
+
+    Attributes:
+        items: Session summaries on this page.
+        next_cursor: Opaque cursor for the following page, or None on the last page.
+    """
+
+    items: List[GameSessionSummary]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as `cursor` to fetch the next page; null on the last page.",
+    )
+
+
+class JsonPatchOperation(BaseModel):
+    """One RFC 6902 JSON Patch operation.
+
+    Attributes:
+        op: Operation name.
+        path: JSON Pointer the operation targets.
+        value: New value (add, replace) or expected value (test).
+        from_: Source pointer for move and copy (sent as "from").
+    """
+
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str = Field(..., pattern=JSON_POINTER)
+    value: Any = None
+    from_: Optional[str] = Field(default=None, alias="from", pattern=JSON_POINTER)
+
+    class Config:
+        populate_by_name = True
+
+    @model_validator(mode="after")
+    def _check_operands(self) -> "JsonPatchOperation":
+        if self.op in ("add", "replace", "test") and "value" not in self.model_fields_set:
+            raise ValueError(f"'{self.op}' requires 'value'")
+        if self.op in ("move", "copy") and self.from_ is None:
+            raise ValueError(f"'{self.op}' requires 'from'")
+        return self
+
+
+class GameSessionPatch(BaseModel):
+    """Incremental change to a session's state: a JSON Patch or a turn delta.
+
+    Attributes:
+        version: Session version the change was made against; the update is
+            rejected with 409 if the session has changed since.
+        patch: RFC 6902 operations, applied in order, all or nothing.
+        delta: JSON Pointer -> new value, applied in order. Each value replaces
+            what is at its pointer; missing object members are created and "-"
+            appends to an array.
+    """
+
+    version: int = Field(..., ge=0)
+    patch: Optional[List[JsonPatchOperation]] = None
+    delta: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description='Values to set, keyed by JSON Pointer (e.g. {"/turn_number": 13}).',
+    )
+
+    @model_validator(mode="after")
+    def _check_change(self) -> "GameSessionPatch":
+        if (self.patch is None) == (self.delta is None):
+            raise ValueError("send exactly one of 'patch' or 'delta'")
+        for pointer in self.delta or {}:
+            if pointer and not pointer.startswith("/"):
+                raise ValueError(f"invalid JSON pointer {pointer!r}")
+        return self
@@ -1,20 +1,70 @@
-"""Game session service: create and list sessions."""
+"""Game session service: create, list and patch sessions."""
 
 from __future__ import annotations
 
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Tuple, Union
+
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import JsonPatchError
+from app.crud.game import async_game_crud
+from app.crud.user import async_user_crud
+from app.models.game import GameSession
+from app.schemas.game import (
+    GameSessionCreate,
+    GameSessionPage,
+    GameSessionPatch,
+    GameSessionRead,
+    GameSessionSummary,
+    GameSessionSummaryPage,
+)
+
+
+def encode_cursor(session: GameSession) -> str:
+    """Opaque cursor pointing just after a session in the newest-first listing.
+
+    Args:
+        session: Last session of the current page.
+
+    Returns:
+        URL-safe string encoding the session's (created_at, id).
+    """
+    raw = json.dumps([session.created_at.isoformat(), session.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
 
-from app.crud.game import game_crud
-from app.crud.user import user_crud
-from app.schemas.game import GameSessionCreate, GameSessionRead
 
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor from a previous page's next_cursor.
 
-def create_session(db: Session, user_id: str, payload: GameSessionCreate) -> GameSessionRead:
+    Returns:
+        (created_at, id) of the last session already returned.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, session_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(session_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def create_session(
+    db: AsyncSession, user_id: str, payload: GameSessionCreate
+) -> GameSessionRead:
     """Create a game session for a user.
 
     Args:
-        db: Database session.
+        db: Async database session.
         user_id: User UUID as string.
         payload: Game session creation data containing optional initial state.
 
@@ -24,25 +74,93 @@ def create_session(db: Session, user_id: str, payload: GameSessionCreate) -> Gam
     Raises:
         HTTPException: 404 if user not found.
     """
-    user = user_crud.get(db, user_id)
+    user = await async_user_crud.get(db, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    session = game_crud.create(db, user_id=user.id, state=payload.state)
+    session = await async_game_crud.create(db, user_id=user.id, state=payload.state)
     return GameSessionRead.model_validate(session)
 
 
-def list_sessions(db: Session, user_id: str) -> list[GameSessionRead]:
-    """List game sessions for a user, newest first.
+async def list_sessions(
+    db: AsyncSession,
+    user_id: str,
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    summary: bool = False,
+) -> Union[GameSessionPage, GameSessionSummaryPage]:
+    """List one page of a user's game sessions, newest first.
 
     Args:
-        db: Database session.
+        db: Async database session.
         user_id: User UUID as string.
+        limit: Maximum number of sessions on the page.
+        cursor: next_cursor of the previous page, or None for the first page.
+        summary: Return a GameSessionSummaryPage, without loading state.
 
     Returns:
-        List of game sessions as GameSessionRead schemas, ordered by created_at descending.
+        GameSessionPage (GameSessionSummaryPage in summary mode) with the
+        sessions and the cursor of the next page (None if this is the last one).
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    before = decode_cursor(cursor) if cursor else None
+    # One extra row tells whether another page follows.
+    sessions = await async_game_crud.list_by_user_id(
+        db, user_id, limit=limit + 1, before=before, summary=summary
+    )
+    has_more = len(sessions) > limit
+    sessions = sessions[:limit]
+    next_cursor = encode_cursor(sessions[-1]) if has_more else None
+    if summary:
+        return GameSessionSummaryPage(
+            items=[GameSessionSummary.model_validate(s) for s in sessions],
+            next_cursor=next_cursor,
+        )
+    return GameSessionPage(
+        items=[GameSessionRead.model_validate(s) for s in sessions],
+        next_cursor=next_cursor,
+    )
+
+
+async def patch_session(
+    db: AsyncSession, user_id: str, session_id: int, payload: GameSessionPatch
+) -> GameSessionSummary:
+    """Apply an incremental state change to a user's game session.
+
+    Args:
+        db: Async database session.
+        user_id: User UUID as string.
+        session_id: Game session ID.
+        payload: JSON Patch or turn delta, and the version it was made against.
+
+    Returns:
+        The updated session (new version and updated_at) as GameSessionSummary.
+
+    Raises:
+        HTTPException: 404 if the user has no such session.
+        HTTPException: 409 if the session is no longer at payload.version.
+        HTTPException: 422 if the change cannot be applied to the stored state.
     """
-    sessions = game_crud.list_by_user_id(db, user_id)
-    return [GameSessionRead.model_validate(s) for s in sessions]
+    patch = None
+    if payload.patch is not None:
+        patch = [op.model_dump(by_alias=True, exclude_unset=True) for op in payload.patch]
+    try:
+        row = await async_game_crud.patch_state(
+            db, session_id, user_id, version=payload.version, patch=patch, delta=payload.delta
+        )
+    except JsonPatchError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(exc))
+    if row is not None:
+        return GameSessionSummary.model_validate(row)
+    current = await async_game_crud.get_version(db, session_id, user_id)
+    if current is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Game session not found")
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Game session is at version {current}, not {payload.version}. Reload and retry.",
+    )
 
 
 class GameService:
@@ -53,6 +171,7 @@ class GameService:
 
     create_session = staticmethod(create_session)
     list_sessions = staticmethod(list_sessions)
+    patch_session = staticmethod(patch_session)
 
 
 game_service = GameService()
@@ -3,18 +3,18 @@
 from __future__ import annotations
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.user import user_crud
+from app.crud.user import async_user_crud
 from app.models.user import User
 from app.schemas.user import UserCreate, UserRead
 
 
-def create_user(db: Session, payload: UserCreate) -> UserRead:
+async def create_user(db: AsyncSession, payload: UserCreate) -> UserRead:
     """Create a user profile.
 
     Args:
-        db: Database session.
+        db: Async database session.
         payload: User creation data containing id (UUID) and email.
 
     Returns:
@@ -23,21 +23,23 @@ def create_user(db: Session, payload: UserCreate) -> UserRead:
     Raises:
         HTTPException: 400 if id or email already exists.
     """
-    existing = user_crud.get(db, payload.id) or user_crud.get_by_email(db, payload.email)
+    existing = await async_user_crud.get(db, payload.id) or await async_user_crud.get_by_email(
+        db, payload.email
+    )
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User already exists.",
         )
-    user = user_crud.create(db, id=payload.id, email=payload.email)
+    user = await async_user_crud.create(db, id=payload.id, email=payload.email)
     return UserRead.model_validate(user)
 
 
-def get_user(db: Session, user_id: str) -> UserRead:
+async def get_user(db: AsyncSession, user_id: str) -> UserRead:
     """Get a user by UUID.
 
     Args:
-        db: Database session.
+        db: Async database session.
         user_id: User UUID as string.
 
     Returns:
@@ -46,7 +48,7 @@ def get_user(db: Session, user_id: str) -> UserRead:
     Raises:
         HTTPException: 404 if user not found.
     """
-    user = user_crud.get(db, user_id)
+    user = await async_user_crud.get(db, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
     return UserRead.model_validate(user)
@@ -0,0 +1,145 @@
+"""
+Auth overhead per request, with and without the token and user caches.
+
+Two measurements:
+
+- ``verify``: ``decode_jwt`` on one token, repeatedly, with the token cache
+  disabled (full HS256 verification each time) and enabled
+- ``request`` (needs the database in ``SUPABASE_DATABASE_URL``; skip with
+  ``--no-db``): in-process requests through httpx's ASGI transport to a route
+  depending on ``get_current_user``, minus the same route without auth, with
+  both caches disabled and enabled
+
+Tokens are signed with ``SUPABASE_JWT_SECRET`` (a random secret if unset). A
+throwaway user is created for ``request`` and deleted afterwards:
+
+    cd backend && python -m benchmarks.auth_bench --iterations 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List
+
+import jwt
+
+os.environ.setdefault("SUPABASE_JWT_SECRET", secrets.token_urlsafe(32))
+
+from app.core.config import get_settings  # noqa: E402
+from app.core.security import decode_jwt, token_cache  # noqa: E402
+
+
+def make_token(user_id: str, lifetime: float = 3600.0) -> str:
+    now = time.time()
+    claims = {"sub": user_id, "exp": int(now + lifetime), "iat": int(now), "role": "authenticated"}
+    return jwt.encode(claims, get_settings().supabase_jwt_secret, algorithm="HS256")
+
+
+def per_call_us(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return round(1e6 * (time.perf_counter() - start) / iterations, 3)
+
+
+def bench_verify(args: argparse.Namespace) -> Dict[str, Any]:
+    token = make_token(str(uuid.uuid4()))
+    size = token_cache.maxsize
+    token_cache.maxsize = 0
+    uncached = per_call_us(lambda: decode_jwt(token), args.iterations)
+    token_cache.maxsize = size
+    decode_jwt(token)
+    cached = per_call_us(lambda: decode_jwt(token), args.iterations)
+    return {"uncached_us": uncached, "cached_us": cached, "tokens": token_cache.as_dict()}
+
+
+async def bench_request(args: argparse.Namespace, user_id: str) -> Dict[str, Any]:
+    import httpx
+    from fastapi import Depends, FastAPI
+
+    from app.api.deps import get_current_user, user_cache
+    from app.db.base import async_engine
+
+    app = FastAPI()
+
+    @app.get("/anonymous")
+    async def anonymous() -> dict:
+        return {}
+
+    @app.get("/me")
+    async def me(user: Any = Depends(get_current_user)) -> dict:
+        return {"id": str(user.id)}
+
+    headers = {"Authorization": f"Bearer {make_token(user_id)}"}
+
+    async def mean_latency(client: httpx.AsyncClient, path: str) -> float:
+        samples: List[float] = []
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            resp = await client.get(path, headers=headers)
+            samples.append(time.perf_counter() - start)
+            resp.raise_for_status()
+        return statistics.fmean(samples)
+
+    results: Dict[str, Any] = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        sizes = (token_cache.maxsize, user_cache.maxsize)
+        await mean_latency(client, "/me")  # warm the pool
+        for mode in ("uncached", "cached"):
+            token_cache.clear()
+            user_cache.clear()
+            if mode == "uncached":
+                token_cache.maxsize = user_cache.maxsize = 0
+            else:
+                token_cache.maxsize, user_cache.maxsize = sizes
+            base = await mean_latency(client, "/anonymous")
+            auth = await mean_latency(client, "/me")
+            results[mode] = {
+                "request_us": round(1e6 * auth, 1),
+                "auth_overhead_us": round(1e6 * (auth - base), 1),
+            }
+        results["users"] = user_cache.as_dict()
+    await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000, help="decode_jwt calls.")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route and mode.")
+    parser.add_argument("--no-db", action="store_true", help="Only measure token verification.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    results: Dict[str, Any] = {"verify": bench_verify(args)}
+    if not args.no_db:
+        from app.crud.user import user_crud
+        from app.db.session import db_session
+        from app.models.user import User
+
+        user_id = uuid.uuid4()
+        with db_session() as db:
+            user_crud.create(db, id=user_id, email=f"authbench-{user_id}@example.com")
+        try:
+            results["request"] = asyncio.run(bench_request(args, str(user_id)))
+        finally:
+            with db_session() as db:
+                db.delete(db.get(User, user_id))
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Load test: sync vs async database path at high concurrency.
+
+Drives the read endpoints (``GET /users/{user_id}`` and
+``GET /users/{user_id}/sessions``) in-process through httpx's ASGI transport,
+against the database in ``SUPABASE_DATABASE_URL``:
+
+- ``sync``: the previous request path, sync ``def`` handlers on the sync
+  engine (``get_sync_db``, ``user_crud``, ``game_crud``), each request holding
+  a threadpool worker for its whole database round-trip
+- ``async``: the application's own async handlers (``get_db`` on the
+  asyncpg engine)
+
+Authentication is bypassed (the token's claims are fixed) and the user cache
+is disabled so only the data path is compared. A throwaway user with
+``--sessions`` game sessions is created first and deleted afterwards. Results
+(requests/sec, latency percentiles, errors) are printed as JSON:
+
+    cd backend && python -m benchmarks.load_test --concurrency 200 --requests 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_current_user_id, get_sync_db, get_token_claims, user_cache
+from app.crud.game import game_crud
+from app.crud.user import user_crud
+from app.db.base import Base, async_engine, engine
+from app.db.session import db_session
+from app.main import create_app
+from app.models.user import User
+from app.schemas.game import GameSessionRead
+from app.schemas.user import UserRead
+
+SAMPLE_STATE: Dict[str, Any] = {
+    "turn_number": 12,
+    "phase": "main_action",
+    "players": [
+        {"id": i, "name": f"player-{i}", "victory_points": 3, "resources": {"ore": 2}}
+        for i in range(4)
+    ],
+}
+
+
+def build_sync_app() -> FastAPI:
+    """The read endpoints as they were before the async data path."""
+
+    app = FastAPI()
+
+    def current_user(
+        user_id: str = Depends(get_current_user_id), db: Session = Depends(get_sync_db)
+    ) -> User:
+        user = db.query(User).filter(User.id == user_id).first()
+        if not user:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+        return user
+
+    @app.get("/users/{user_id}", response_model=UserRead)
+    def get_user(
+        user_id: str,
+        current: User = Depends(current_user),
+        db: Session = Depends(get_sync_db),
+    ) -> UserRead:
+        return UserRead.model_validate(user_crud.get(db, user_id))
+
+    @app.get("/users/{user_id}/sessions", response_model=list[GameSessionRead])
+    def list_sessions(
+        user_id: str,
+        current: User = Depends(current_user),
+        db: Session = Depends(get_sync_db),
+    ) -> list[GameSessionRead]:
+        return [GameSessionRead.model_validate(s) for s in game_crud.list_by_user_id(db, user_id)]
+
+    return app
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]  # noqa: E731
+    return {
+        "p50_ms": round(1000 * statistics.median(ordered), 2),
+        "p95_ms": round(1000 * pick(0.95), 2),
+        "p99_ms": round(1000 * pick(0.99), 2),
+    }
+
+
+async def drive(app: FastAPI, user_id: str, args: argparse.Namespace) -> Dict[str, Any]:
+    paths = [f"/users/{user_id}", f"/users/{user_id}/sessions"]
+    latencies: List[float] = []
+    errors = 0
+    remaining = args.requests
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            resp = await client.get(paths[remaining % len(paths)])
+            latencies.append(time.perf_counter() - start)
+            if resp.status_code != 200:
+                errors += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "requests_per_s": round(len(latencies) / elapsed, 1),
+        **percentiles(latencies),
+    }
+
+
+async def run(args: argparse.Namespace, user_id: str) -> Dict[str, Any]:
+    sync_app = build_sync_app()
+    async_app = create_app()
+    claims = {"sub": user_id, "exp": time.time() + 3600}
+    for app in (sync_app, async_app):
+        app.dependency_overrides[get_token_claims] = lambda: claims
+    user_cache.maxsize = 0
+
+    results: Dict[str, Any] = {}
+    # Warm both pools before measuring.
+    warmup = argparse.Namespace(requests=args.concurrency, concurrency=args.concurrency)
+    for name, app in (("sync", sync_app), ("async", async_app)):
+        await drive(app, user_id, warmup)
+        results[name] = await drive(app, user_id, args)
+    await async_engine.dispose()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--sessions", type=int, default=20, help="Game sessions for the user.")
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    user_id = uuid.uuid4()
+    with db_session() as db:
+        user_crud.create(db, id=user_id, email=f"loadtest-{user_id}@example.com")
+        for _ in range(args.sessions):
+            game_crud.create(db, user_id=user_id, state=SAMPLE_STATE)
+    try:
+        results = asyncio.run(run(args, str(user_id)))
+    finally:
+        with db_session() as db:
+            db.delete(db.get(User, user_id))
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
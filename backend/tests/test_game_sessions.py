@@ -0,0 +1,97 @@
+"""Keyset pagination of GET /users/{user_id}/sessions."""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+import pytest
+
+from app.models.game import GameSession
+
+CREATED_AT = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _add_sessions(db, user, count, created_at=CREATED_AT):
+    sessions = [
+        GameSession(user_id=user.id, state={"turn": i}, created_at=created_at)
+        for i in range(count)
+    ]
+    db.add_all(sessions)
+    db.commit()
+    return [s.id for s in sessions]
+
+
+def _pages(client, user, limit, **params):
+    pages = []
+    cursor = None
+    while True:
+        query = {"limit": limit, **params}
+        if cursor is not None:
+            query["cursor"] = cursor
+        resp = client.get(f"/users/{user.id}/sessions", params=query)
+        assert resp.status_code == 200, resp.text
+        page = resp.json()
+        pages.append(page)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+# 6 sessions fill the last page exactly; it must still have no next_cursor.
+@pytest.mark.parametrize("count, sizes", [(7, [3, 3, 1]), (6, [3, 3])])
+def test_pages_of_sessions_sharing_created_at(client, db, user, count, sizes):
+    ids = _add_sessions(db, user, count)
+
+    pages = _pages(client, user, limit=3)
+    listed = [item["id"] for page in pages for item in page["items"]]
+    # Ties on created_at are broken by id, newest first: no gaps, no repeats.
+    assert listed == sorted(ids, reverse=True)
+    assert [len(page["items"]) for page in pages] == sizes
+    assert all(page["next_cursor"] for page in pages[:-1])
+    assert pages[-1]["next_cursor"] is None
+    assert pages[0]["items"][0]["state"] == {"turn": count - 1}
+
+
+def test_summary_pages_leave_out_state(client, db, user):
+    older = _add_sessions(db, user, 2, created_at=datetime(2025, 12, 31))
+    newer = _add_sessions(db, user, 3)
+
+    pages = _pages(client, user, limit=2, summary=True)
+    listed = [item["id"] for page in pages for item in page["items"]]
+    assert listed == sorted(newer, reverse=True) + sorted(older, reverse=True)
+    assert all("state" not in item for page in pages for item in page["items"])
+    assert all(item["version"] == 0 for page in pages for item in page["items"])
+
+
+def _cursor(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor!",
+        _cursor(b"not json"),
+        _cursor(b'["2026-01-01T12:00:00"]'),
+        _cursor(b'["yesterday", 1]'),
+        _cursor(b'["2026-01-01T12:00:00", "one"]'),
+    ],
+)
+def test_malformed_cursor_is_rejected(client, db, user, cursor):
+    _add_sessions(db, user, 2)
+    resp = client.get(f"/users/{user.id}/sessions", params={"cursor": cursor})
+    assert resp.status_code == 400
+    assert resp.json()["detail"] == "Invalid cursor"
+
+
+def test_openapi_tells_page_shapes_apart(client):
+    schemas = client.get("/openapi.json").json()["components"]["schemas"]
+    assert "state" in schemas["GameSessionRead"]["required"]
+    assert "state" not in schemas["GameSessionSummary"]["properties"]
+    assert schemas["GameSessionPage"]["properties"]["items"]["items"] == {
+        "$ref": "#/components/schemas/GameSessionRead"
+    }
+    assert schemas["GameSessionSummaryPage"]["properties"]["items"]["items"] == {
+        "$ref": "#/components/schemas/GameSessionSummary"
+    }
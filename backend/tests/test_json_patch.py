@@ -0,0 +1,208 @@
+"""JSON Patch / delta application and versioned state updates."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.core.exceptions import JsonPatchError
+from app.core.json_patch import apply_delta, apply_patch, parse_pointer
+from app.crud.game import game_crud
+from app.models.game import GameSession
+
+STATE = {
+    "turn_number": 12,
+    "players": [
+        {"id": 1, "resources": {"brick": 2, "ore": 0}},
+        {"id": 2, "resources": {"brick": 0, "ore": 3}},
+    ],
+    "log": ["roll 8"],
+    "a/b": {"~": True},
+}
+
+
+def test_parse_pointer_unescapes_tokens():
+    assert parse_pointer("") == []
+    assert parse_pointer("/a~1b/~0") == ["a/b", "~"]
+    assert parse_pointer("/log/0") == ["log", "0"]
+    with pytest.raises(JsonPatchError):
+        parse_pointer("log")
+
+
+@pytest.mark.parametrize(
+    "operation, expected",
+    [
+        ({"op": "add", "path": "/winner", "value": 2}, {**STATE, "winner": 2}),
+        ({"op": "add", "path": "/log/-", "value": "end"}, {**STATE, "log": ["roll 8", "end"]}),
+        ({"op": "add", "path": "/log/0", "value": "start"}, {**STATE, "log": ["start", "roll 8"]}),
+        ({"op": "remove", "path": "/log/0"}, {**STATE, "log": []}),
+        ({"op": "replace", "path": "/turn_number", "value": 13}, {**STATE, "turn_number": 13}),
+        ({"op": "replace", "path": "", "value": {}}, {}),
+        ({"op": "test", "path": "/a~1b/~0", "value": True}, STATE),
+        (
+            {"op": "copy", "from": "/turn_number", "path": "/log/-"},
+            {**STATE, "log": ["roll 8", 12]},
+        ),
+    ],
+)
+def test_apply_patch_operations(operation, expected):
+    assert apply_patch(STATE, [operation]) == expected
+
+
+def test_apply_patch_applies_operations_in_order():
+    patched = apply_patch(
+        STATE,
+        [
+            {"op": "test", "path": "/players/0/resources/brick", "value": 2},
+            {"op": "replace", "path": "/players/0/resources/brick", "value": 1},
+            {"op": "move", "from": "/players/1", "path": "/players/0"},
+            {"op": "remove", "path": "/a~1b"},
+        ],
+    )
+    assert [p["id"] for p in patched["players"]] == [2, 1]
+    assert patched["players"][1]["resources"]["brick"] == 1
+    assert "a/b" not in patched
+
+
+def test_apply_patch_leaves_input_unmodified():
+    before = repr(STATE)
+    patched = apply_patch(STATE, [{"op": "add", "path": "/players/0/resources/wool", "value": 1}])
+    assert patched["players"][0]["resources"]["wool"] == 1
+    assert repr(STATE) == before
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "remove", "path": "/missing"},
+        {"op": "remove", "path": ""},
+        {"op": "replace", "path": "/players/2", "value": {}},
+        {"op": "add", "path": "/log/2", "value": "x"},
+        {"op": "add", "path": "/log/01", "value": "x"},
+        {"op": "add", "path": "/missing/child", "value": 1},
+        {"op": "add", "path": "/turn_number/child", "value": 1},
+        {"op": "move", "from": "/players", "path": "/players/0/copy"},
+        {"op": "copy", "from": "/missing", "path": "/x"},
+        # JSON distinguishes true from 1.
+        {"op": "test", "path": "/a~1b/~0", "value": 1},
+        {"op": "test", "path": "/turn_number", "value": 13},
+        {"op": "increment", "path": "/turn_number"},
+        {"op": "add", "path": "turn_number", "value": 1},
+    ],
+)
+def test_apply_patch_failures(operation):
+    with pytest.raises(JsonPatchError):
+        apply_patch(STATE, [operation])
+
+
+def test_apply_patch_is_all_or_nothing():
+    with pytest.raises(JsonPatchError):
+        apply_patch(
+            STATE,
+            [
+                {"op": "replace", "path": "/turn_number", "value": 13},
+                {"op": "test", "path": "/turn_number", "value": 12},
+            ],
+        )
+    assert STATE["turn_number"] == 12
+
+
+def test_apply_delta_sets_values_in_order():
+    updated = apply_delta(
+        STATE,
+        [
+            ("/turn_number", 13),
+            ("/players/1/resources/ore", 2),
+            ("/players/1/resources/wool", 1),
+            ("/log/-", "roll 6"),
+            ("/log/0", "roll 9"),
+        ],
+    )
+    assert updated["turn_number"] == 13
+    assert updated["players"][1]["resources"] == {"brick": 0, "ore": 2, "wool": 1}
+    assert updated["log"] == ["roll 9", "roll 6"]
+    assert STATE["log"] == ["roll 8"]
+    assert apply_delta(STATE, [("", {"reset": True})]) == {"reset": True}
+
+
+@pytest.mark.parametrize(
+    "pointer",
+    ["/log/1", "/log/x", "/missing/child", "/turn_number/child", "log"],
+)
+def test_apply_delta_failures(pointer):
+    with pytest.raises(JsonPatchError):
+        apply_delta(STATE, [(pointer, 1)])
+
+
+# --- game_crud.patch_state on SQLite (patched in Python) ---------------------
+
+
+@pytest.fixture
+def session_id(db, user):
+    session = game_crud.create(db, user_id=user.id, state=STATE)
+    db.commit()
+    return session.id
+
+
+def _stored(db, session_id):
+    db.expire_all()
+    return db.get(GameSession, session_id)
+
+
+def test_patch_state_bumps_version(db, user, session_id):
+    row = game_crud.patch_state(
+        db, session_id, str(user.id), version=0, delta={"/turn_number": 13}
+    )
+    db.commit()
+    assert row.version == 1
+    assert not hasattr(row, "state")
+
+    row = game_crud.patch_state(
+        db, session_id, user.id, version=1, patch=[{"op": "add", "path": "/log/-", "value": "x"}]
+    )
+    db.commit()
+    assert row.version == 2
+    stored = _stored(db, session_id)
+    assert stored.version == 2
+    assert stored.state["turn_number"] == 13
+    assert stored.state["log"] == ["roll 8", "x"]
+    assert game_crud.get_version(db, session_id, str(user.id)) == 2
+
+
+def test_patch_state_rejects_a_stale_version(db, user, session_id):
+    game_crud.patch_state(db, session_id, user.id, version=0, delta={"/turn_number": 13})
+    db.commit()
+
+    stale = game_crud.patch_state(db, session_id, user.id, version=0, delta={"/turn_number": 99})
+    assert stale is None
+    stored = _stored(db, session_id)
+    assert (stored.version, stored.state["turn_number"]) == (1, 13)
+
+
+def test_patch_state_leaves_state_unchanged_on_a_bad_patch(db, user, session_id):
+    with pytest.raises(JsonPatchError):
+        game_crud.patch_state(
+            db,
+            session_id,
+            user.id,
+            version=0,
+            patch=[
+                {"op": "replace", "path": "/turn_number", "value": 13},
+                {"op": "test", "path": "/turn_number", "value": 12},
+            ],
+        )
+    db.rollback()
+    stored = _stored(db, session_id)
+    assert (stored.version, stored.state) == (0, STATE)
+
+
+def test_patch_endpoint_statuses(client, db, user, session_id):
+    url = f"/users/{user.id}/sessions/{session_id}"
+    resp = client.patch(url, json={"version": 0, "delta": {"/turn_number": 13}})
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["version"] == 1
+
+    assert client.patch(url, json={"version": 0, "delta": {"/turn_number": 14}}).status_code == 409
+    bad = {"version": 1, "patch": [{"op": "remove", "path": "/missing"}]}
+    assert client.patch(url, json=bad).status_code == 422
+    missing = f"/users/{user.id}/sessions/{session_id + 1}"
+    assert client.patch(missing, json={"version": 0, "delta": {}}).status_code == 404
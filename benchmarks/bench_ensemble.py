@@ -0,0 +1,113 @@
+"""
+Ensemble decision latency: quorum with cancellation vs. waiting for everyone.
+
+Each member gets its own mock Ollama server with its own latency (member ``i``
+takes ``latency * (i + 1)`` seconds plus jitter) and mostly, but not always,
+answers with the same move. Every configuration decides the same number of
+states:
+
+- ``single``: the fastest member on its own
+- ``quorum``: ``EnsembleClient`` with a majority quorum
+- ``all``: ``EnsembleClient`` with a quorum of every member (no early stop)
+
+Results (decision latency percentiles plus the ensemble's per-member metrics)
+are printed and optionally written as JSON:
+
+    python -m benchmarks.bench_ensemble --members 5 --decisions 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+from contextlib import ExitStack
+from typing import Any, Dict, List
+
+from catan_bot.async_client import AsyncOllamaClient
+from catan_bot.ensemble import EnsembleClient, EnsembleMember
+from catan_bot.newgame import random_game_state
+from catan_bot.ollama_client import OllamaConfig
+
+from .mock_ollama import DEFAULT_MOVES, MockOllamaServer
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]  # noqa: E731
+    return {
+        "p50_ms": round(1000 * statistics.median(ordered), 2),
+        "p95_ms": round(1000 * pick(0.95), 2),
+        "mean_ms": round(1000 * statistics.fmean(ordered), 2),
+    }
+
+
+async def run(args: argparse.Namespace, urls: List[str]) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    states = [random_game_state(rng=rng) for _ in range(args.decisions)]
+    results: Dict[str, Any] = {}
+
+    # Members differ only in their (mock) server; give each its own model name.
+    members = [EnsembleMember(f"mock-{i}", base_url=url) for i, url in enumerate(urls)]
+
+    async def ensemble(quorum: int) -> Dict[str, Any]:
+        async with EnsembleClient(members, quorum=quorum) as client:
+            for state in states:
+                await client.choose_move(state)
+        return {**percentiles(client.stats.latencies), **client.stats.as_dict()}
+
+    async with AsyncOllamaClient(OllamaConfig(base_url=urls[0])) as single:
+        latencies = []
+        for state in states:
+            start = asyncio.get_running_loop().time()
+            await single.choose_move(state)
+            latencies.append(asyncio.get_running_loop().time() - start)
+    results["single"] = percentiles(latencies)
+    results["quorum"] = await ensemble(len(urls) // 2 + 1)
+    results["all"] = await ensemble(len(urls))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--members", type=int, default=5)
+    parser.add_argument("--decisions", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="Fastest member's latency.")
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument(
+        "--agreement", type=float, default=0.8, help="Chance a member gives the common move."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    # Weight the common move so a member picks it with probability ~agreement.
+    common, others = DEFAULT_MOVES[0], DEFAULT_MOVES[1:]
+    weight = max(1, round(args.agreement * len(others) / max(1e-9, 1 - args.agreement)))
+    moves = [common] * weight + others
+
+    with ExitStack() as stack:
+        servers = [
+            stack.enter_context(
+                MockOllamaServer(
+                    latency=args.latency * (i + 1),
+                    jitter=args.jitter,
+                    moves=moves,
+                    seed=args.seed + i,
+                )
+            )
+            for i in range(args.members)
+        ]
+        results = asyncio.run(run(args, [s.url for s in servers]))
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
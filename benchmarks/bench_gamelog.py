@@ -0,0 +1,125 @@
+"""
+Binary game log vs. JSONL of ``GameState`` dumps.
+
+Self-play games between rollout-policy agents are recorded once, then
+written both as a binary log (:mod:`catan_bot.gamelog`) and as JSON lines of
+``{"game_state": ..., "move": ...}``. Reported per format: file size, write
+time, a full scan of every move, and decoding randomly chosen records back to
+``GameState`` (for JSONL from lines already split in memory, so without the
+seek); for the log also to ``CompactState``, which is what search and
+training code consume:
+
+    python -m benchmarks.bench_gamelog --games 20 --samples 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from catan_bot.gamelog import GameLogReader, GameLogWriter
+from catan_bot.jsonio import dumps, loads
+from catan_bot.models import GameState
+from catan_bot.tournament import play_game
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(args: argparse.Namespace, directory: str) -> Dict[str, Any]:
+    seats = [f"policy#{i}" for i in range(args.players)]
+    specs = {label: "policy" for label in seats}
+    recordings = [
+        play_game(seats, specs, args.seed + g, game=g, record=True)["recording"]
+        for g in range(args.games)
+    ]
+    log_path = os.path.join(directory, "games.catlog")
+    jsonl_path = os.path.join(directory, "games.jsonl")
+
+    def write_log() -> None:
+        with GameLogWriter(log_path, args.players) as writer:
+            for recording in recordings:
+                writer.append(recording)
+
+    write_log_s = timed(write_log)
+    reader = GameLogReader(log_path)
+    records = len(reader)
+
+    def write_jsonl() -> None:
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            for record in reader:
+                line = {"game_state": record.state.game_state_data(), "move": record.move}
+                f.write(dumps(line) + "\n")
+
+    write_jsonl_s = timed(write_jsonl)
+
+    rng = random.Random(args.seed)
+    samples = [rng.randrange(records) for _ in range(args.samples)]
+
+    scan_log_s = timed(lambda: sum(code for _, code in reader.moves()))
+    seek_log_s = timed(lambda: [reader.game_state(i) for i in samples])
+    state_log_s = timed(lambda: [reader.state(i) for i in samples])
+
+    def scan_jsonl() -> None:
+        with open(jsonl_path, "rb") as f:
+            sum(loads(line)["move"] for line in f)
+
+    with open(jsonl_path, "rb") as f:
+        lines: List[bytes] = f.readlines()
+
+    scan_jsonl_s = timed(scan_jsonl)
+    seek_jsonl_s = timed(
+        lambda: [GameState.model_validate(loads(lines[i])["game_state"]) for i in samples]
+    )
+    reader.close()
+
+    def per_record(seconds: float, n: int) -> float:
+        return round(1e6 * seconds / n, 3)
+
+    return {
+        "records": records,
+        "log": {
+            "bytes": os.path.getsize(log_path),
+            "write_us_per_record": per_record(write_log_s, records),
+            "scan_us_per_record": per_record(scan_log_s, records),
+            "random_decode_us": per_record(seek_log_s, len(samples)),
+            "random_compact_us": per_record(state_log_s, len(samples)),
+        },
+        "jsonl": {
+            "bytes": os.path.getsize(jsonl_path),
+            "write_us_per_record": per_record(write_jsonl_s, records),
+            "scan_us_per_record": per_record(scan_jsonl_s, records),
+            "random_decode_us": per_record(seek_jsonl_s, len(samples)),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--samples", type=int, default=500, help="Random records decoded.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = run(args, directory)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Many concurrent games against one Ollama, directly and through the gateway.
+
+The mock server answers ``--slots`` requests at once and queues the rest, as
+Ollama does with ``OLLAMA_NUM_PARALLEL``. ``--games`` callers each make
+``--decisions`` sequential ``choose_move`` calls:
+
+- ``direct``: every caller talks to the server through a shared
+  ``AsyncOllamaClient`` that allows one connection per game
+- ``gateway``: the same client pointed at a ``BatchingGateway`` (over HTTP)
+  dispatching ``--slots`` requests at a time
+
+Reported per mode: throughput, decision latency percentiles and the longest
+queue inside the server; for the gateway also its own queue, batch and wait
+metrics:
+
+    python -m benchmarks.bench_gateway --games 64 --slots 4 --latency 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from catan_bot.async_client import AsyncOllamaClient
+from catan_bot.gateway import BatchingGateway, GatewayConfig, serve
+from catan_bot.newgame import random_game_state
+from catan_bot.ollama_client import OllamaConfig
+
+from .bench_ensemble import percentiles
+from .mock_ollama import MockOllamaServer
+
+
+async def drive(args: argparse.Namespace, url: str) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    states = [random_game_state(rng=rng) for _ in range(args.games)]
+    config = OllamaConfig(base_url=url, max_concurrency=args.games, pool_maxsize=args.games)
+    latencies: List[float] = []
+
+    async def game(state: Any) -> None:
+        for _ in range(args.decisions):
+            start = time.perf_counter()
+            await client.choose_move(state)
+            latencies.append(time.perf_counter() - start)
+
+    async with AsyncOllamaClient(config) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(game(state) for state in states))
+        elapsed = time.perf_counter() - start
+    return {
+        "decisions_per_s": round(len(latencies) / elapsed, 1),
+        **percentiles(latencies),
+    }
+
+
+async def run(args: argparse.Namespace, server: MockOllamaServer) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    results["direct"] = await drive(args, server.url)
+    results["direct"]["server_peak_queued"] = server.peak_queued
+
+    server.peak_queued = 0
+    config = GatewayConfig(
+        upstream_url=server.url,
+        parallel=args.slots,
+        max_batch_size=args.max_batch,
+        window_seconds=args.window,
+    )
+    async with BatchingGateway(config) as gateway:
+        front = await serve(gateway, port=0)
+        port = front.sockets[0].getsockname()[1]
+        results["gateway"] = await drive(args, f"http://127.0.0.1:{port}")
+        front.close()
+        await front.wait_closed()
+    results["gateway"]["server_peak_queued"] = server.peak_queued
+    results["gateway"]["stats"] = gateway.stats.as_dict()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=64)
+    parser.add_argument("--decisions", type=int, default=10)
+    parser.add_argument("--slots", type=int, default=4, help="Server's parallel slots.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Mock model latency.")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--window", type=float, default=0.005, help="Batch window, seconds.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    with MockOllamaServer(latency=args.latency, seed=args.seed, slots=args.slots) as server:
+        results = asyncio.run(run(args, server))
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
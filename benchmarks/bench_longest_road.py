@@ -0,0 +1,198 @@
+"""
+Longest road: incremental tracking vs. full recomputation.
+
+Plays games with the rollout policy on the standard board, recording every
+road and settlement placement. Each game is then replayed three times and
+after every placement every player's longest road is measured by:
+
+- ``naive``: a DFS over ``Player.roads`` edge lists, rebuilding adjacency
+  from scratch, as a straightforward implementation would
+- ``bitset_full``: ``roads.components_for`` over the whole edge mask
+- ``incremental``: ``CompactState.longest_road``, which only re-measures the
+  components a placement touched
+
+All three must agree. Results (mean microseconds per placement) are printed
+and optionally written as JSON:
+
+    python -m benchmarks.bench_longest_road --games 20 --output roads.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from catan_bot.compact import PHASE_INDEX, CompactState
+from catan_bot.models import TurnPhase
+from catan_bot.movegen import KIND_ROAD, KIND_SETTLEMENT, move_kind, move_payload
+from catan_bot.newgame import random_game_state
+from catan_bot.roads import components_for, longest
+from catan_bot.rollout import MAX_ACTIONS_PER_TURN, default_policy
+from catan_bot.rules import apply_move, roll_dice, winner
+from catan_bot.topology import edge_node_ids
+
+_START_OF_TURN = PHASE_INDEX[TurnPhase.START_OF_TURN]
+_MAIN_ACTION = PHASE_INDEX[TurnPhase.MAIN_ACTION]
+
+# (kind, player, edge or node index)
+Placement = Tuple[int, int, int]
+
+
+def record_game(seed: int, max_turns: int = 600) -> Tuple[CompactState, List[Placement]]:
+    """Play a game and return its start state and every placement made."""
+
+    rng = random.Random(seed)
+    start = CompactState.from_game_state(random_game_state(rng=rng))
+    state = start.clone()
+    placements: List[Placement] = []
+    actions = 0
+    while state.turn_number < max_turns and winner(state) is None:
+        if state.phase == _START_OF_TURN:
+            roll_dice(state, rng)
+            actions = 0
+        elif state.phase == _MAIN_ACTION and actions >= MAX_ACTIONS_PER_TURN:
+            state.end_turn()
+        else:
+            code = default_policy(state, rng)
+            if move_kind(code) in (KIND_ROAD, KIND_SETTLEMENT):
+                placements.append((move_kind(code), state.current, move_payload(code)))
+            apply_move(state, code, rng)
+            actions += 1
+    return start, placements
+
+
+def naive_longest_road(roads: List[Tuple[int, int]], blocked: Set[int]) -> int:
+    adjacency: Dict[int, List[Tuple[int, int]]] = defaultdict(list)
+    for i, (a, b) in enumerate(roads):
+        adjacency[a].append((b, i))
+        adjacency[b].append((a, i))
+
+    def walk(node: int, used: Set[int]) -> int:
+        best = 0
+        for other, i in adjacency[node]:
+            if i in used:
+                continue
+            used.add(i)
+            length = 1 + (0 if other in blocked else walk(other, used))
+            used.discard(i)
+            best = max(best, length)
+        return best
+
+    return max((walk(node, set()) for node in adjacency), default=0)
+
+
+def replay_naive(start: CompactState, placements: List[Placement]) -> Tuple[float, List[List[int]]]:
+    n = start.num_players
+    roads = [[edge_node_ids(e) for e in _bits(start.roads[p])] for p in range(n)]
+    buildings = [
+        {i + 1 for i in _bits(start.settlements[p] | start.cities[p])} for p in range(n)
+    ]
+    results = []
+    elapsed = 0.0
+    for kind, player, index in placements:
+        if kind == KIND_ROAD:
+            roads[player].append(edge_node_ids(index))
+        else:
+            buildings[player].add(index + 1)
+        t = time.perf_counter()
+        lengths = []
+        for p in range(n):
+            blocked = set().union(*(buildings[q] for q in range(n) if q != p))
+            lengths.append(naive_longest_road(roads[p], blocked))
+        elapsed += time.perf_counter() - t
+        results.append(lengths)
+    return elapsed, results
+
+
+def replay_bitset_full(
+    start: CompactState, placements: List[Placement]
+) -> Tuple[float, List[List[int]]]:
+    state = start.clone()
+    results = []
+    elapsed = 0.0
+    for kind, player, index in placements:
+        _place(state, kind, player, index)
+        t = time.perf_counter()
+        lengths = [
+            longest(components_for(state.roads[p], state._blocking_nodes(p)))
+            for p in range(state.num_players)
+        ]
+        elapsed += time.perf_counter() - t
+        results.append(lengths)
+    return elapsed, results
+
+
+def replay_incremental(
+    start: CompactState, placements: List[Placement]
+) -> Tuple[float, List[List[int]]]:
+    state = start.clone()
+    state.longest_road(0)  # Build the index before timing.
+    results = []
+    elapsed = 0.0
+    for kind, player, index in placements:
+        t = time.perf_counter()
+        _place(state, kind, player, index)
+        lengths = [state.longest_road(p) for p in range(state.num_players)]
+        elapsed += time.perf_counter() - t
+        results.append(lengths)
+    return elapsed, results
+
+
+def _place(state: CompactState, kind: int, player: int, index: int) -> None:
+    if kind == KIND_ROAD:
+        state.place_road(player, index)
+    else:
+        state.place_settlement(player, index)
+
+
+def _bits(mask: int) -> List[int]:
+    return [i for i in range(mask.bit_length()) if mask >> i & 1]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    games = [record_game(args.seed + i) for i in range(args.games)]
+    total = sum(len(placements) for _, placements in games)
+    expected: List[List[List[int]]] = []
+    results: Dict[str, Dict[str, float]] = {}
+    for name, replay in (
+        ("naive", replay_naive),
+        ("bitset_full", replay_bitset_full),
+        ("incremental", replay_incremental),
+    ):
+        elapsed = 0.0
+        for g, (start, placements) in enumerate(games):
+            seconds, lengths = replay(start, placements)
+            elapsed += seconds
+            if name == "naive":
+                expected.append(lengths)
+            elif lengths != expected[g]:
+                raise AssertionError(f"{name} disagrees with the naive DFS in game {g}.")
+        results[name] = {
+            "placements": total,
+            "mean_us_per_placement": round(1e6 * elapsed / total, 2),
+        }
+
+    baseline = results["naive"]["mean_us_per_placement"]
+    for name in ("bitset_full", "incremental"):
+        mean = results[name]["mean_us_per_placement"]
+        results[name]["speedup_vs_naive"] = round(baseline / mean, 1)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
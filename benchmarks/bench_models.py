@@ -0,0 +1,223 @@
+"""
+Per-call cost of parsing responses and building/dumping game states.
+
+Responses (one of each action type, as the model would return them):
+
+- ``untagged``: ``json.loads`` + ``model_validate`` against the plain
+  ``MoveAction`` union, which pydantic resolves by trying each member
+- ``tagged``: ``json.loads`` + ``model_validate`` with the union
+  discriminated on ``type``
+- ``tagged_json``: ``ModelMoveResponse.model_validate_json``, the path the
+  clients use
+- ``orjson``: ``orjson.loads`` + ``model_validate`` (if orjson is installed)
+
+Game states (from games played with the rollout policy), built from a
+``CompactState`` and dumped to JSON:
+
+- ``constructors``: ``GameState`` built through the nested model
+  constructors, as ``CompactState.to_game_state`` used to, then
+  ``model_dump_json``
+- ``model_construct``: the same tree built with ``model_construct``, then
+  ``model_dump_json``
+- ``to_game_state``: one ``model_validate`` of plain data, then
+  ``model_dump_json``
+- ``game_state_json``: the plain data dumped directly, no models (orjson if
+  installed)
+- ``game_state_json_stdlib``: the same with the standard ``json`` module
+
+Results (mean microseconds per call) are printed and optionally written as
+JSON:
+
+    python -m benchmarks.bench_models --output models.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Sequence, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+from catan_bot import topology
+from catan_bot.compact import NUM_RESOURCES, PHASES, RESOURCES, CompactState, iter_bits
+from catan_bot.jsonio import orjson
+from catan_bot.models import (
+    BoardState,
+    BuildAction,
+    EndTurnAction,
+    GameState,
+    HexTile,
+    ModelMoveResponse,
+    Player,
+    RobberAction,
+    RobberState,
+    TradeAction,
+)
+from catan_bot.newgame import random_game_state
+from catan_bot.rollout import default_policy
+from catan_bot.rules import apply_move, roll_dice, winner
+
+M = TypeVar("M", bound=BaseModel)
+
+RESPONSES = [
+    '{"reasoning": "Expand toward the 8.", "action": '
+    '{"type": "build", "build_type": "road", "location": "edge_12_13"}}',
+    '{"reasoning": "Ore for the city.", "action": {"type": "trade", "trade_type": "bank", '
+    '"target_player_id": null, "give": {"wool": 4}, "receive": {"ore": 1}}}',
+    '{"reasoning": "Block the leader.", "action": '
+    '{"type": "move_robber", "target_hex_id": 7, "steal_from_player_id": 2}}',
+    '{"reasoning": "Nothing affordable.", "action": {"type": "end_turn"}}',
+]
+
+
+class UntaggedMoveResponse(BaseModel):
+    """``ModelMoveResponse`` with the union as it was before it was tagged."""
+
+    reasoning: str
+    action: Union[BuildAction, TradeAction, RobberAction, EndTurnAction]
+
+
+def built_game_state(state: CompactState, construct: bool = False) -> GameState:
+    """``CompactState.to_game_state`` through the nested model constructors.
+
+    With ``construct`` every model is built by ``model_construct`` instead.
+    """
+
+    def make(model: Type[M], **fields: Any) -> M:
+        return model.model_construct(**fields) if construct else model(**fields)
+
+    header = state.header
+    players = []
+    for i, player_id in enumerate(header.player_ids):
+        base = i * NUM_RESOURCES
+        players.append(
+            make(
+                Player,
+                id=player_id,
+                name=header.player_names[i],
+                victory_points=state.victory_points[i],
+                resources={r: state.resources[base + k] for k, r in enumerate(RESOURCES)},
+                roads=[topology.edge_node_ids(e) for e in iter_bits(state.roads[i])],
+                settlements=[n + 1 for n in iter_bits(state.settlements[i])],
+                cities=[n + 1 for n in iter_bits(state.cities[i])],
+            )
+        )
+    board = make(
+        BoardState,
+        hexes=[
+            make(
+                HexTile,
+                id=hex_id,
+                resource=None if code is None else RESOURCES[code],
+                number_token=token,
+            )
+            for hex_id, code, token in zip(
+                header.hex_ids, header.hex_resources, header.hex_tokens
+            )
+        ],
+        robber=make(RobberState, hex_id=state.robber_hex_id),
+    )
+    return make(
+        GameState,
+        players=players,
+        current_player_id=header.player_ids[state.current],
+        board=board,
+        turn_number=state.turn_number,
+        phase=PHASES[state.phase],
+    )
+
+
+def sample_states(games: int, seed: int, every: int = 10) -> List[CompactState]:
+    """Every ``every``-th state of ``games`` policy games."""
+
+    states = []
+    for g in range(games):
+        rng = random.Random(seed + g)
+        state = CompactState.from_game_state(random_game_state(rng=rng))
+        steps = 0
+        while state.turn_number < 300 and winner(state) is None:
+            if state.phase == 0:
+                roll_dice(state, rng)
+            else:
+                apply_move(state, default_policy(state, rng), rng)
+            steps += 1
+            if steps % every == 0:
+                states.append(state.clone())
+    return states
+
+
+def time_per_call(fn: Callable[[Any], Any], inputs: Sequence[Any], repeat: int) -> float:
+    """Mean microseconds of ``fn(x)`` over ``repeat`` passes of ``inputs``."""
+
+    for x in inputs:  # Warm up.
+        fn(x)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for x in inputs:
+            fn(x)
+    return round(1e6 * (time.perf_counter() - start) / (repeat * len(inputs)), 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=2000, help="Passes over the responses.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    for text in RESPONSES:
+        expected = ModelMoveResponse.model_validate_json(text)
+        if UntaggedMoveResponse.model_validate_json(text).action != expected.action:
+            raise AssertionError(f"Tagged and untagged unions disagree on {text}.")
+
+    responses: Dict[str, Callable[[str], Any]] = {
+        "untagged": lambda t: UntaggedMoveResponse.model_validate(json.loads(t)),
+        "tagged": lambda t: ModelMoveResponse.model_validate(json.loads(t)),
+        "tagged_json": ModelMoveResponse.model_validate_json,
+    }
+    if orjson is not None:
+        responses["orjson"] = lambda t: ModelMoveResponse.model_validate(orjson.loads(t))
+
+    states = sample_states(args.games, args.seed)
+    for state in states:
+        expected = built_game_state(state)
+        if state.to_game_state() != expected or built_game_state(state, True) != expected:
+            raise AssertionError("Game state construction paths disagree.")
+        if state.game_state_json() != expected.model_dump_json():
+            raise AssertionError("game_state_json disagrees with model_dump_json.")
+
+    game_states: Dict[str, Callable[[CompactState], Any]] = {
+        "constructors": lambda s: built_game_state(s).model_dump_json(),
+        "model_construct": lambda s: built_game_state(s, True).model_dump_json(),
+        "to_game_state": lambda s: s.to_game_state().model_dump_json(),
+        "game_state_json": lambda s: s.game_state_json(),
+        "game_state_json_stdlib": lambda s: json.dumps(
+            s.game_state_data(), separators=(",", ":")
+        ),
+    }
+    state_repeat = max(1, args.repeat * len(RESPONSES) // (10 * len(states)))
+
+    results: Dict[str, Any] = {"orjson": orjson is not None, "responses": {}, "game_states": {}}
+    for name, fn in responses.items():
+        results["responses"][name] = {"mean_us": time_per_call(fn, RESPONSES, args.repeat)}
+    for name, fn in game_states.items():
+        results["game_states"][name] = {"mean_us": time_per_call(fn, states, state_repeat)}
+    for group, baseline in (("responses", "untagged"), ("game_states", "constructors")):
+        base = results[group][baseline]["mean_us"]
+        for entry in results[group].values():
+            entry["speedup"] = round(base / entry["mean_us"], 2)
+    results["game_states_sampled"] = len(states)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Latency and throughput of the model decision pipeline, stage by stage.
+
+Runs ``OllamaClient`` against the local ``MockOllamaServer`` and times each
+stage of a decision separately:
+
+- ``serialize``: building the chat request and encoding it as JSON
+- ``http``: the POST round trip, including reading the body
+- ``extract``: decoding the body and pulling the JSON object out of the text
+- ``validate``: ``ModelMoveResponse.model_validate``
+- ``end_to_end``: ``OllamaClient.choose_move`` as a whole, plus a streaming
+  run and a run with malformed answers (counting errors)
+- ``legal_menu``: malformed answers again, with the legal move menu
+  offered, so illegal answers are rejected too
+- ``constrained``: the same with ``constrain_output``; the mock answers as
+  schema-constrained decoding would
+
+Each stage reports p50/p95/p99 latency in milliseconds and moves per second
+(one over the mean). Results are written as JSON, tagged with the current git
+commit, so runs can be compared across commits:
+
+    python -m benchmarks.bench_pipeline --iterations 500 --output pipeline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from catan_bot.models import GameState, ModelMoveResponse
+from catan_bot.newgame import random_game_state
+from catan_bot.ollama_client import (
+    OllamaClient,
+    OllamaConfig,
+    _extract_json_object,
+    build_chat_request,
+)
+
+from .mock_ollama import MockOllamaServer
+
+
+def percentile(samples: List[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``q`` in 0..100)."""
+
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    mean = statistics.fmean(samples)
+    return {
+        "samples": len(samples),
+        "p50_ms": round(1000 * percentile(samples, 50), 4),
+        "p95_ms": round(1000 * percentile(samples, 95), 4),
+        "p99_ms": round(1000 * percentile(samples, 99), 4),
+        "mean_ms": round(1000 * mean, 4),
+        "moves_per_second": round(1 / mean, 1) if mean else float("inf"),
+    }
+
+
+def _timed(fn: Callable[[], Any], samples: List[float]) -> Any:
+    start = time.perf_counter()
+    result = fn()
+    samples.append(time.perf_counter() - start)
+    return result
+
+
+def bench_stages(
+    client: OllamaClient, states: List[GameState], iterations: int
+) -> Dict[str, Dict[str, float]]:
+    """Time each stage of ``choose_move`` separately."""
+
+    config = client.config
+    url = f"{config.base_url}/v1/chat/completions"
+    timings: Dict[str, List[float]] = {
+        "serialize": [],
+        "http": [],
+        "extract": [],
+        "validate": [],
+    }
+    for i in range(iterations):
+        game_state = states[i % len(states)]
+
+        def serialize() -> bytes:
+            payload, _ = build_chat_request(config, game_state)
+            return json.dumps(payload).encode()
+
+        body = _timed(serialize, timings["serialize"])
+
+        def post() -> bytes:
+            resp = client.session.post(
+                url,
+                data=body,
+                headers={"Content-Type": "application/json"},
+                timeout=(config.connect_timeout_seconds, config.timeout_seconds),
+            )
+            resp.raise_for_status()
+            return resp.content
+
+        raw = _timed(post, timings["http"])
+
+        def extract() -> Dict[str, Any]:
+            content = json.loads(raw)["choices"][0]["message"]["content"]
+            return json.loads(_extract_json_object(content))
+
+        parsed = _timed(extract, timings["extract"])
+        _timed(lambda: ModelMoveResponse.model_validate(parsed), timings["validate"])
+    return {stage: summarize(samples) for stage, samples in timings.items()}
+
+
+def bench_end_to_end(
+    client: OllamaClient, states: List[GameState], iterations: int
+) -> Dict[str, float]:
+    """Time whole ``choose_move`` calls, counting the ones that raise."""
+
+    samples: List[float] = []
+    errors = 0
+    for i in range(iterations):
+        start = time.perf_counter()
+        try:
+            client.choose_move(states[i % len(states)])
+        except (ValueError, RuntimeError):
+            errors += 1
+        samples.append(time.perf_counter() - start)
+    result = summarize(samples)
+    result["errors"] = errors
+    result["error_rate"] = round(errors / iterations, 4)
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--states", type=int, default=16, help="Distinct game states to cycle through.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock server delay in seconds.")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument(
+        "--token-latency", type=float, default=0.001, help="Delay between streamed chunks."
+    )
+    parser.add_argument(
+        "--malformed-rate", type=float, default=0.2, help="Malformed answers in the error run."
+    )
+    parser.add_argument("--compact", action="store_true", help="Use the compact prompt encoding.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    states = [random_game_state(rng=rng) for _ in range(args.states)]
+    results: Dict[str, Any] = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "params": vars(args),
+    }
+
+    server_options = dict(latency=args.latency, jitter=args.jitter, seed=args.seed)
+    with MockOllamaServer(**server_options) as server:
+        config = OllamaConfig(base_url=server.url, compact_prompt=args.compact)
+        with OllamaClient(config) as client:
+            results["stages"] = bench_stages(client, states, args.iterations)
+            results["end_to_end"] = bench_end_to_end(client, states, args.iterations)
+
+    # Streaming: the move arrives chunk by chunk with trailing chatter after it.
+    with MockOllamaServer(
+        token_latency=args.token_latency,
+        trailing_text="\nLet me explain why this is a good move in more detail.",
+        **server_options,
+    ) as server:
+        config = OllamaConfig(base_url=server.url, compact_prompt=args.compact, stream=True)
+        with OllamaClient(config) as client:
+            results["streaming"] = bench_end_to_end(client, states, args.iterations)
+
+    with MockOllamaServer(
+        malformed_rate=args.malformed_rate,
+        preamble="Sure! Here is my move: ",
+        **server_options,
+    ) as server:
+        config = OllamaConfig(base_url=server.url, compact_prompt=args.compact)
+        with OllamaClient(config) as client:
+            results["malformed"] = bench_end_to_end(client, states, args.iterations)
+        for name, options in (
+            ("legal_menu", {"offer_legal_moves": True}),
+            ("constrained", {"offer_legal_moves": True, "constrain_output": True}),
+        ):
+            config = OllamaConfig(base_url=server.url, compact_prompt=args.compact, **options)
+            with OllamaClient(config) as client:
+                results[name] = bench_end_to_end(client, states, args.iterations)
+                results[name]["invalid_rate"] = round(client.output_stats.invalid_rate, 4)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
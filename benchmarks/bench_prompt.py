@@ -0,0 +1,137 @@
+"""
+Prompt size benchmark: verbose JSON vs. compact encoding vs. compact deltas.
+
+Plays a few simulated games and, for every decision of player 1, measures the
+user message that each prompt mode would send. Token counts use a rough
+word-piece estimate (runs of word characters and single punctuation marks),
+which tracks BPE token counts for JSON closely enough for comparisons.
+
+Latency saved is estimated from a prompt-processing rate. With ``--base-url``
+the same decisions are also sent to a live server and timed.
+
+Run from the repo root:
+
+    python -m benchmarks.bench_prompt --games 3 --output prompt.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import statistics
+import time
+from typing import Dict, List
+
+from catan_bot.compact import PHASE_INDEX, CompactState
+from catan_bot.models import EndTurnAction, GameState, ModelMoveResponse, TurnPhase
+from catan_bot.newgame import random_game_state
+from catan_bot.ollama_client import OllamaClient, OllamaConfig, build_chat_request
+from catan_bot.prompt import PromptSession
+from catan_bot.rollout import default_policy
+from catan_bot.rules import apply_move, roll_dice, winner
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+_MAIN_ACTION = PHASE_INDEX[TurnPhase.MAIN_ACTION]
+_START_OF_TURN = PHASE_INDEX[TurnPhase.START_OF_TURN]
+_PLACEHOLDER_MOVE = ModelMoveResponse(reasoning="", action=EndTurnAction())
+
+
+def estimate_tokens(text: str) -> int:
+    return len(_TOKEN_RE.findall(text))
+
+
+def decision_states(seed: int, max_turns: int = 400) -> List[GameState]:
+    """States at each of player 1's main-action decisions in one simulated game."""
+
+    rng = random.Random(seed)
+    state = CompactState.from_game_state(random_game_state(rng=rng))
+    states = []
+    while state.turn_number < max_turns and winner(state) is None:
+        if state.phase == _START_OF_TURN:
+            roll_dice(state, rng)
+            continue
+        if state.phase == _MAIN_ACTION and state.current == 0:
+            states.append(state.to_game_state())
+        apply_move(state, default_policy(state, rng), rng)
+    return states
+
+
+def prompt_tokens(mode: str, games: List[List[GameState]]) -> List[int]:
+    config = OllamaConfig(compact_prompt=mode != "verbose")
+    counts = []
+    for states in games:
+        session = PromptSession() if mode == "delta" else None
+        for game_state in states:
+            payload, _ = build_chat_request(config, game_state, session)
+            # Only the new user message; earlier turns are a cached prefix.
+            counts.append(estimate_tokens(payload["messages"][-1]["content"]))
+            if session is not None:
+                session.commit(payload["messages"][-1]["content"], _PLACEHOLDER_MOVE)
+    return counts
+
+
+def live_latency(base_url: str, mode: str, states: List[GameState]) -> List[float]:
+    config = OllamaConfig(base_url=base_url, compact_prompt=mode != "verbose", keep_alive="30m")
+    session = PromptSession() if mode == "delta" else None
+    timings = []
+    with OllamaClient(config) as client:
+        for game_state in states:
+            start = time.perf_counter()
+            try:
+                client.choose_move(game_state, session)
+            except ValueError:
+                pass  # Malformed model output still costs the full round trip.
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--prefill-tokens-per-second",
+        type=float,
+        default=500.0,
+        help="Prompt processing rate used to estimate latency saved.",
+    )
+    parser.add_argument("--base-url", help="Also time requests against this Ollama server.")
+    parser.add_argument("--live-decisions", type=int, default=10)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    games = [decision_states(args.seed + i) for i in range(args.games)]
+    results: Dict[str, Dict[str, float]] = {}
+    for mode in ("verbose", "compact", "delta"):
+        counts = prompt_tokens(mode, games)
+        mean = statistics.fmean(counts)
+        results[mode] = {
+            "decisions": len(counts),
+            "mean_tokens": round(mean, 1),
+            "max_tokens": max(counts),
+            "estimated_prefill_ms": round(1000 * mean / args.prefill_tokens_per_second, 1),
+        }
+
+    baseline = results["verbose"]["estimated_prefill_ms"]
+    for mode in ("compact", "delta"):
+        results[mode]["estimated_ms_saved"] = round(
+            baseline - results[mode]["estimated_prefill_ms"], 1
+        )
+
+    if args.base_url:
+        states = games[0][: args.live_decisions]
+        for mode in ("verbose", "compact", "delta"):
+            timings = live_latency(args.base_url, mode, states)
+            results[mode]["live_mean_ms"] = round(1000 * statistics.fmean(timings), 1)
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+First-decision latency with and without speculative pre-computation.
+
+Seat 0 is an LLM player talking to a mock Ollama server; the other seats run
+the rollout default policy but take ``--opponent-think`` seconds per
+decision, as a model or human opponent would. The same seeded games are
+played twice:
+
+- ``baseline``: seat 0 calls ``AsyncOllamaClient.choose_move`` when its turn
+  arrives
+- ``speculative``: a ``SpeculativeScheduler`` observes every opponent state
+  and seat 0 decides through it
+
+Answers the mock gives that are not legal end the turn (or, when the robber
+must move, are replaced by a random legal move), as in tournaments. Reported
+per mode: latency of the first decision of each of seat 0's turns, plus the
+scheduler's hit and cancellation counts:
+
+    python -m benchmarks.bench_speculation --games 3 --latency 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from catan_bot.async_client import AsyncOllamaClient
+from catan_bot.cache import MoveCache
+from catan_bot.compact import PHASE_INDEX, CompactState
+from catan_bot.models import TurnPhase
+from catan_bot.movegen import END_TURN, encode_move, legal_move_codes
+from catan_bot.newgame import random_game_state
+from catan_bot.ollama_client import OllamaConfig
+from catan_bot.rollout import MAX_ACTIONS_PER_TURN, default_policy
+from catan_bot.rules import apply_move, roll_dice, winner
+from catan_bot.speculate import SpeculativeScheduler
+
+from .mock_ollama import MockOllamaServer
+
+_START_OF_TURN = PHASE_INDEX[TurnPhase.START_OF_TURN]
+_MAIN_ACTION = PHASE_INDEX[TurnPhase.MAIN_ACTION]
+
+HERO = 0
+
+
+async def play(
+    client: AsyncOllamaClient,
+    scheduler: Optional[SpeculativeScheduler],
+    seed: int,
+    players: int,
+    think: float,
+    max_turns: int,
+) -> List[float]:
+    """Play one game; return seat 0's first-decision latencies."""
+
+    rng = random.Random(seed)
+    state = CompactState.from_game_state(random_game_state(players, rng))
+    latencies: List[float] = []
+    actions = 0
+    while state.turn_number <= max_turns and winner(state) is None:
+        if state.phase == _START_OF_TURN:
+            roll_dice(state, rng)
+            actions = 0
+        elif state.phase == _MAIN_ACTION and actions >= MAX_ACTIONS_PER_TURN:
+            state.end_turn()
+        else:
+            if state.current == HERO:
+                legal = legal_move_codes(state)
+                game_state = state.to_game_state()
+                start = time.perf_counter()
+                if scheduler is not None:
+                    move = await scheduler.choose_move(game_state)
+                else:
+                    move = await client.choose_move(game_state)
+                if actions == 0:
+                    latencies.append(time.perf_counter() - start)
+                code = encode_move(state, move.action)
+                if code not in legal:
+                    code = END_TURN if state.phase == _MAIN_ACTION else rng.choice(legal)
+            else:
+                if scheduler is not None:
+                    scheduler.observe(state)
+                await asyncio.sleep(think)
+                code = default_policy(state, rng)
+            apply_move(state, code, rng)
+            actions += 1
+    if scheduler is not None:
+        scheduler.cancel()
+    return latencies
+
+
+async def run(args: argparse.Namespace, url: str) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for mode in ("baseline", "speculative"):
+        latencies: List[float] = []
+        stats = None
+        for g in range(args.games):
+            # A fresh cache per game, so only speculation can produce hits.
+            config = OllamaConfig(base_url=url)
+            async with AsyncOllamaClient(config, cache=MoveCache()) as client:
+                scheduler = None
+                if mode == "speculative":
+                    scheduler = SpeculativeScheduler(client, HERO, args.rolls)
+                latencies += await play(
+                    client,
+                    scheduler,
+                    args.seed + g,
+                    args.players,
+                    args.opponent_think,
+                    args.max_turns,
+                )
+                if scheduler is not None:
+                    if stats is None:
+                        stats = scheduler.stats
+                    else:
+                        for name, value in vars(scheduler.stats).items():
+                            setattr(stats, name, getattr(stats, name) + value)
+        entry: Dict[str, Any] = {
+            "decisions": len(latencies),
+            "mean_ms": round(1000 * statistics.fmean(latencies), 2),
+            "p50_ms": round(1000 * statistics.median(latencies), 2),
+        }
+        if stats is not None:
+            entry.update(vars(stats), hit_rate=round(stats.hit_rate, 3))
+        results[mode] = entry
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=3)
+    parser.add_argument("--players", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.1, help="Mock model latency.")
+    parser.add_argument("--opponent-think", type=float, default=0.05)
+    parser.add_argument("--rolls", type=int, default=4, help="Roll sequences speculated on.")
+    parser.add_argument("--max-turns", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file.")
+    args = parser.parse_args()
+
+    with MockOllamaServer(latency=args.latency, seed=args.seed) as server:
+        results = asyncio.run(run(args, server.url))
+
+    text = json.dumps(results, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Local stand-in for Ollama's ``/v1/chat/completions`` endpoint.
+
+Answers every request with a canned ``ModelMoveResponse`` after a configurable
+delay, either as one JSON body or as a server-sent event stream (when the
+request sets ``"stream": true``). A fraction of answers can be made malformed
+to exercise the client's error paths. A request carrying a JSON schema
+``response_format`` is answered the way constrained decoding would: with a
+random instance of the schema, never malformed. With ``slots`` set, only that
+many requests are answered at once and the rest queue, like Ollama with
+``OLLAMA_NUM_PARALLEL``; ``peak_queued`` records the longest such queue.
+
+Use it from a benchmark:
+
+    with MockOllamaServer(latency=0.05) as server:
+        client = OllamaClient(OllamaConfig(base_url=server.url))
+
+or run it standalone and point the CLI at it:
+
+    python -m benchmarks.mock_ollama --port 11434 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_MOVES: List[Dict[str, Any]] = [
+    {"reasoning": "Nothing useful to build.", "action": {"type": "end_turn"}},
+    {
+        "reasoning": "Extend toward the open ore port.",
+        "action": {"type": "build", "build_type": "road", "location": "edge_12_13"},
+    },
+    {
+        "reasoning": "Swap surplus lumber for grain.",
+        "action": {
+            "type": "trade",
+            "trade_type": "bank",
+            "target_player_id": None,
+            "give": {"lumber": 4},
+            "receive": {"grain": 1},
+        },
+    },
+]
+
+# Each of these fails a different stage of the client's parsing.
+MALFORMED_CONTENT: List[str] = [
+    "I think the best move is to end the turn.",
+    '{"reasoning": "Build a road", "action": {"type": "build", "build_type": "road"',
+    '{"reasoning": "Teleport", "action": {"type": "teleport"}}',
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle's algorithm the
+    # body waits for a delayed ACK (~40 ms) and swamps every measurement.
+    disable_nagle_algorithm = True
+    server: "MockOllamaServer"
+
+    def do_POST(self) -> None:
+        if self.path != "/v1/chat/completions":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        schema = (request.get("response_format") or {}).get("json_schema", {}).get("schema")
+        content = self.server.next_content(schema)
+        self.server.count_request()
+        with self.server.slot():
+            if request.get("stream"):
+                self._send_stream(content)
+            else:
+                self.server.wait(self.server.latency)
+                self._send_json(content)
+
+    def _send_json(self, content: str) -> None:
+        body = json.dumps(
+            {
+                "object": "chat.completion",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+            }
+        ).encode()
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client cancelled the request (e.g. an outvoted ensemble member).
+            self.close_connection = True
+
+    def _send_stream(self, content: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        # Time to first token, then a steady token rate.
+        self.server.wait(self.server.latency)
+        size = self.server.chunk_chars
+        try:
+            for start in range(0, len(content), size):
+                piece = content[start : start + size]
+                delta = {"choices": [{"index": 0, "delta": {"content": piece}}]}
+                self._write_chunk(f"data: {json.dumps(delta)}\n\n".encode())
+                self.server.wait(self.server.token_latency)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client stops reading once it has a complete move.
+            self.close_connection = True
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class MockOllamaServer(ThreadingHTTPServer):
+    """Threaded mock server on ``127.0.0.1``, serving in a background thread.
+
+    Args:
+        latency: Seconds before the response (or, when streaming, the first
+            chunk) is sent.
+        jitter: Extra uniformly random delay, up to this many seconds.
+        token_latency: Seconds between streamed chunks.
+        chunk_chars: Characters of content per streamed chunk.
+        malformed_rate: Fraction of answers drawn from ``MALFORMED_CONTENT``.
+        preamble: Text the "model" writes before its JSON object.
+        trailing_text: Text written after the JSON object, which streaming
+            clients never need to read.
+        slots: Requests answered concurrently; ``None`` for no limit.
+    """
+
+    daemon_threads = True
+    # The default backlog of 5 stalls benchmarks with many concurrent clients.
+    request_queue_size = 256
+
+    def __init__(
+        self,
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        token_latency: float = 0.0,
+        chunk_chars: int = 4,
+        malformed_rate: float = 0.0,
+        preamble: str = "",
+        trailing_text: str = "",
+        moves: Optional[List[Dict[str, Any]]] = None,
+        seed: Optional[int] = None,
+        slots: Optional[int] = None,
+    ) -> None:
+        super().__init__(("127.0.0.1", port), _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.token_latency = token_latency
+        self.chunk_chars = chunk_chars
+        self.malformed_rate = malformed_rate
+        self.preamble = preamble
+        self.trailing_text = trailing_text
+        self.moves = moves or DEFAULT_MOVES
+        self.requests = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self._slots = threading.Semaphore(slots) if slots else None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self) -> "MockOllamaServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self) -> "MockOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        if self._slots is None:
+            yield
+            return
+        with self._lock:
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        self._slots.acquire()
+        with self._lock:
+            self.queued -= 1
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def next_content(self, schema: Optional[Dict[str, Any]] = None) -> str:
+        with self._lock:
+            if schema is not None:
+                return json.dumps(sample_schema(schema, self._rng))
+            malformed = self._rng.random() < self.malformed_rate
+            if malformed:
+                body = self._rng.choice(MALFORMED_CONTENT)
+            else:
+                body = json.dumps(self._rng.choice(self.moves))
+        return self.preamble + body + self.trailing_text
+
+    def wait(self, seconds: float) -> None:
+        if self.jitter:
+            with self._lock:
+                seconds += self._rng.uniform(0.0, self.jitter)
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+def sample_schema(schema: Dict[str, Any], rng: random.Random) -> Any:
+    """A random instance of the JSON schema subset ``catan_bot.schema`` emits."""
+
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "anyOf" in schema:
+        return sample_schema(rng.choice(schema["anyOf"]), rng)
+    if schema.get("type") == "object":
+        return {k: sample_schema(v, rng) for k, v in schema.get("properties", {}).items()}
+    if schema.get("type") == "string":
+        return "Constrained answer."
+    raise ValueError(f"Unsupported schema {schema!r}.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock Ollama chat completions server.")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--slots", type=int, help="Requests answered concurrently.")
+    args = parser.parse_args()
+
+    server = MockOllamaServer(
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        token_latency=args.token_latency,
+        malformed_rate=args.malformed_rate,
+        slots=args.slots,
+    )
+    print(f"Mock Ollama listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,19 @@ Exports models and the Ollama integration for external use.
 """
 
 from . import models  # noqa: F401
+from .async_client import AsyncOllamaClient  # noqa: F401
+from .compact import CompactState  # noqa: F401
+from .ensemble import EnsembleClient  # noqa: F401
+from .gateway import BatchingGateway  # noqa: F401
 from .ollama_client import OllamaClient  # noqa: F401
+from .rollout import RolloutEngine  # noqa: F401
 
-__all__ = ["models", "OllamaClient"]
-
+__all__ = [
+    "models",
+    "AsyncOllamaClient",
+    "BatchingGateway",
+    "CompactState",
+    "EnsembleClient",
+    "OllamaClient",
+    "RolloutEngine",
+]
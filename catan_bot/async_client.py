@@ -0,0 +1,154 @@
+"""
+Asyncio-native Ollama client for driving many games from one process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import httpx
+
+from .cache import MoveCache
+from .jsonio import loads
+from .models import GameState, ModelMoveResponse, MoveAction
+from .ollama_client import (
+    OllamaConfig,
+    OutputStats,
+    build_chat_request,
+    cache_key,
+    parse_chat_response,
+)
+from .prompt import PromptSession
+from .streaming import MoveStreamParser
+
+
+class AsyncOllamaClient:
+    """Async counterpart of ``OllamaClient``.
+
+    At most ``config.max_concurrency`` requests are in flight at once; further
+    calls wait on a semaphore. Cancelling a ``choose_move`` / ``choose_moves``
+    call cancels its outstanding HTTP requests.
+    """
+
+    def __init__(
+        self, config: Optional[OllamaConfig] = None, cache: Optional[MoveCache] = None
+    ) -> None:
+        self.config = config or OllamaConfig()
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(self.config.max_concurrency)
+        self.output_stats = OutputStats()
+        self._in_flight = 0
+        self._client = httpx.AsyncClient(
+            base_url=self.config.base_url,
+            timeout=httpx.Timeout(
+                self.config.timeout_seconds, connect=self.config.connect_timeout_seconds
+            ),
+            limits=httpx.Limits(
+                max_connections=self.config.max_concurrency,
+                max_keepalive_connections=self.config.pool_maxsize,
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=self.config.max_retries),
+        )
+
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently holding a concurrency slot."""
+
+        return self._in_flight
+
+    async def choose_move(
+        self, game_state: GameState, session: Optional[PromptSession] = None
+    ) -> ModelMoveResponse:
+        if self.cache is None:
+            return await self._request_move(game_state, session)
+        key = cache_key(self.config, game_state)
+        move = self.cache.get(key)
+        if move is None:
+            move = await self._request_move(game_state, session)
+            self.cache.put(key, move)
+        return move
+
+    async def _request_move(
+        self, game_state: GameState, session: Optional[PromptSession]
+    ) -> ModelMoveResponse:
+        payload, menu = build_chat_request(self.config, game_state, session)
+        move = await self._post(payload, menu)
+        if session is not None:
+            session.commit(payload["messages"][-1]["content"], move)
+        return move
+
+    async def _post(
+        self, payload: Dict[str, Any], menu: Optional[List[MoveAction]]
+    ) -> ModelMoveResponse:
+        try:
+            move = await self._send(payload, menu)
+        except (ValueError, RuntimeError):
+            # Transport errors are neither; these mean the answer was unusable.
+            self.output_stats.responses += 1
+            self.output_stats.invalid += 1
+            raise
+        self.output_stats.responses += 1
+        return move
+
+    async def _send(
+        self, payload: Dict[str, Any], menu: Optional[List[MoveAction]]
+    ) -> ModelMoveResponse:
+        async with self._semaphore:
+            self._in_flight += 1
+            try:
+                if self.config.stream:
+                    return await self._stream_move(payload, menu)
+                resp = await self._client.post("/v1/chat/completions", json=payload)
+            finally:
+                self._in_flight -= 1
+        resp.raise_for_status()
+        return parse_chat_response(loads(resp.content), menu)
+
+    async def _stream_move(
+        self, payload: Dict[str, Any], menu: Optional[List[MoveAction]]
+    ) -> ModelMoveResponse:
+        # Leaving the stream context early closes the connection, which makes
+        # Ollama stop generating.
+        async with self._client.stream("POST", "/v1/chat/completions", json=payload) as resp:
+            resp.raise_for_status()
+            parser = MoveStreamParser(menu)
+            async for line in resp.aiter_lines():
+                move = parser.feed_line(line)
+                if move is not None:
+                    return move
+        raise ValueError("No JSON object found in model response.")
+
+    async def choose_moves(
+        self,
+        game_states: Sequence[GameState],
+        return_exceptions: bool = False,
+        timeout: Optional[float] = None,
+    ) -> List[Union[ModelMoveResponse, BaseException]]:
+        """Choose a move for each state concurrently, preserving order.
+
+        If any request fails (and ``return_exceptions`` is false) or
+        ``timeout`` expires, the remaining requests are cancelled and the
+        error is raised.
+        """
+
+        async with asyncio.timeout(timeout):
+            if return_exceptions:
+                return await asyncio.gather(
+                    *(self.choose_move(s) for s in game_states), return_exceptions=True
+                )
+            try:
+                async with asyncio.TaskGroup() as group:
+                    tasks = [group.create_task(self.choose_move(s)) for s in game_states]
+            except BaseExceptionGroup as errors:
+                raise errors.exceptions[0] from errors
+            return [task.result() for task in tasks]
@@ -0,0 +1,149 @@
+"""
+Per-layout board indexes.
+
+The geometry in :mod:`catan_bot.topology` is shared by every game; what
+differs from board to board is which resource and number token each hex
+carries. ``layout_topology`` turns a layout into immutable lookup tables once
+and caches them, so rules code indexes by roll, hex id or node instead of
+rescanning the hex list. Every ``StateHeader`` carries the topology of its
+board.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+from . import topology
+from .models import BoardState, Resource
+
+# Same order as compact.RESOURCES.
+_RESOURCE_INDEX: Dict[Resource, int] = {r: i for i, r in enumerate(Resource)}
+_NUM_RESOURCES = len(_RESOURCE_INDEX)
+
+BANK_RATIO = 4
+GENERIC_PORT_RATIO = 3
+SPECIFIC_PORT_RATIO = 2
+
+
+def pips(token: Optional[int]) -> int:
+    """Number of dice combinations (out of 36) that roll ``token``."""
+
+    return 0 if token is None else 6 - abs(7 - token)
+
+
+class BoardTopology:
+    """Lookup tables for one board layout. Treat as immutable.
+
+    Attributes:
+        hex_ids: Hex ids of the layout that exist on the standard board.
+        hex_nodes_mask: Node mask per hex id (index 0 unused; 0 for hexes
+            missing from the layout).
+        roll_hexes: Per dice total 0..12, ``(hex_id, resource, node_mask)``
+            of every hex producing on that roll.
+        hex_yield: Per hex id, ``(resource, token, node_mask)`` if the hex
+            produces, else ``None`` (index 0 unused).
+        node_hexes: Per node, the ids of the layout's hexes it touches.
+        node_yields: Per node, ``(hex_id, resource, token)`` of every
+            producing hex it touches.
+        node_pips: Per node, the summed pips of its producing hexes.
+        port_ratio: Per node, the best bank ratio per resource a building
+            there gives (4 away from harbours).
+        port_nodes_mask: Nodes on a harbour.
+    """
+
+    __slots__ = (
+        "hex_ids",
+        "hex_nodes_mask",
+        "roll_hexes",
+        "hex_yield",
+        "node_hexes",
+        "node_yields",
+        "node_pips",
+        "port_ratio",
+        "port_nodes_mask",
+    )
+
+    def __init__(
+        self,
+        hex_ids: Sequence[int],
+        hex_resources: Sequence[Optional[int]],
+        hex_tokens: Sequence[Optional[int]],
+    ) -> None:
+        hex_nodes_mask = [0] * (topology.NUM_HEXES + 1)
+        roll_hexes = [[] for _ in range(13)]
+        hex_yield = [None] * (topology.NUM_HEXES + 1)
+        node_hexes = [[] for _ in range(topology.NUM_NODES)]
+        node_yields = [[] for _ in range(topology.NUM_NODES)]
+        node_pips = [0] * topology.NUM_NODES
+        present = []
+        for hex_id, resource, token in zip(hex_ids, hex_resources, hex_tokens):
+            if not 1 <= hex_id <= topology.NUM_HEXES:
+                continue
+            present.append(hex_id)
+            nodes = topology.HEX_NODES[hex_id - 1]
+            hex_nodes_mask[hex_id] = topology.HEX_NODES_MASK[hex_id - 1]
+            producing = resource is not None and token is not None and 2 <= token <= 12
+            if producing:
+                roll_hexes[token].append((hex_id, resource, hex_nodes_mask[hex_id]))
+                hex_yield[hex_id] = (resource, token, hex_nodes_mask[hex_id])
+            for n in nodes:
+                node_hexes[n].append(hex_id)
+                if producing:
+                    node_pips[n] += pips(token)
+                    node_yields[n].append((hex_id, resource, token))
+
+        port_ratio = [[BANK_RATIO] * _NUM_RESOURCES for _ in range(topology.NUM_NODES)]
+        port_nodes_mask = 0
+        for edge, kind in topology.PORTS:
+            for n in topology.EDGES[edge]:
+                port_nodes_mask |= 1 << n
+                ratios = port_ratio[n]
+                if kind is None:
+                    for k in range(_NUM_RESOURCES):
+                        ratios[k] = min(ratios[k], GENERIC_PORT_RATIO)
+                else:
+                    ratios[_RESOURCE_INDEX[Resource(kind)]] = SPECIFIC_PORT_RATIO
+
+        self.hex_ids: Tuple[int, ...] = tuple(present)
+        self.hex_nodes_mask: Tuple[int, ...] = tuple(hex_nodes_mask)
+        self.roll_hexes: Tuple[Tuple[Tuple[int, int, int], ...], ...] = tuple(
+            tuple(x) for x in roll_hexes
+        )
+        self.hex_yield: Tuple[Optional[Tuple[int, int, int]], ...] = tuple(hex_yield)
+        self.node_hexes: Tuple[Tuple[int, ...], ...] = tuple(tuple(x) for x in node_hexes)
+        self.node_yields: Tuple[Tuple[Tuple[int, int, int], ...], ...] = tuple(
+            tuple(x) for x in node_yields
+        )
+        self.node_pips: Tuple[int, ...] = tuple(node_pips)
+        self.port_ratio: Tuple[Tuple[int, ...], ...] = tuple(tuple(x) for x in port_ratio)
+        self.port_nodes_mask = port_nodes_mask
+
+    def nodes_of(self, hex_id: int) -> int:
+        """Node mask of ``hex_id``, or 0 if the hex is not on this board."""
+
+        if 0 < hex_id < len(self.hex_nodes_mask):
+            return self.hex_nodes_mask[hex_id]
+        return 0
+
+
+@lru_cache(maxsize=256)
+def layout_topology(
+    hex_ids: Tuple[int, ...],
+    hex_resources: Tuple[Optional[int], ...],
+    hex_tokens: Tuple[Optional[int], ...],
+) -> BoardTopology:
+    """The (cached) topology of a layout given as resource indices and tokens."""
+
+    return BoardTopology(hex_ids, hex_resources, hex_tokens)
+
+
+def board_topology(board: BoardState) -> BoardTopology:
+    """The (cached) topology of a ``BoardState``'s layout."""
+
+    hexes = board.hexes
+    return layout_topology(
+        tuple(h.id for h in hexes),
+        tuple(None if h.resource is None else _RESOURCE_INDEX[h.resource] for h in hexes),
+        tuple(h.number_token for h in hexes),
+    )
@@ -0,0 +1,148 @@
+"""
+Cache of model decisions keyed by canonical state hash.
+
+``MoveCache`` is an in-memory LRU with an optional time-to-live, optionally
+backed by a SQLite file so decisions survive restarts. Pass one to
+``OllamaClient`` / ``AsyncOllamaClient`` to skip the model for positions it
+has already answered.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from .hashing import state_hash, zobrist_key
+from .models import GameState, ModelMoveResponse
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    disk_hits: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class MoveCache:
+    """LRU/TTL cache of ``ModelMoveResponse`` keyed by 64-bit state hashes.
+
+    ``ttl_seconds=None`` keeps entries until evicted. With ``path`` set,
+    entries are also written to a SQLite database and looked up there on an
+    in-memory miss.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        ttl_seconds: Optional[float] = None,
+        path: Union[str, Path, None] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        # key -> (stored_at wall-clock time, response JSON)
+        self._entries: "OrderedDict[int, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS moves "
+                "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, response TEXT NOT NULL)"
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def get(self, key: int) -> Optional[ModelMoveResponse]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._expired(entry[0], now):
+                    del self._entries[key]
+                    self.stats.expirations += 1
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+            if entry is None and self._db is not None:
+                entry = self._load(key, now)
+                if entry is not None:
+                    self.stats.disk_hits += 1
+                    self._remember(key, entry)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+        return ModelMoveResponse.model_validate_json(entry[1])
+
+    def put(self, key: int, move: ModelMoveResponse) -> None:
+        entry = (time.time(), move.model_dump_json())
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO moves (key, stored_at, response) VALUES (?, ?, ?)",
+                    (_db_key(key), entry[0], entry[1]),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM moves")
+                self._db.commit()
+
+    def _expired(self, stored_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - stored_at > self.ttl_seconds
+
+    def _remember(self, key: int, entry: Tuple[float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def _load(self, key: int, now: float) -> Optional[Tuple[float, str]]:
+        assert self._db is not None
+        row = self._db.execute(
+            "SELECT stored_at, response FROM moves WHERE key = ?", (_db_key(key),)
+        ).fetchone()
+        if row is None:
+            return None
+        if self._expired(row[0], now):
+            self._db.execute("DELETE FROM moves WHERE key = ?", (_db_key(key),))
+            self._db.commit()
+            self.stats.expirations += 1
+            return None
+        return row[0], row[1]
+
+
+def _db_key(key: int) -> str:
+    # SQLite integers are signed 64-bit; store the unsigned hash as hex.
+    return f"{key:016x}"
+
+
+def decision_key(game_state: GameState, *options: object) -> int:
+    """Cache key for a state plus whatever request options affect the answer."""
+
+    return state_hash(game_state) ^ zobrist_key(("options",) + tuple(map(str, options)))
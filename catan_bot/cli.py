@@ -1,21 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+from enum import Enum
+from pathlib import Path
+from typing import List, Optional
+
 import typer
 
+from .ensemble import EnsembleClient, parse_member
+from .evaluate import best_move
+from .gamelog import GameLogWriter
+from .gateway import BatchingGateway, GatewayConfig, ollama_num_parallel, serve
 from .models import (
     BoardState,
     GameState,
     HexTile,
+    ModelMoveResponse,
     Player,
     Resource,
     RobberState,
     TurnPhase,
 )
 from .ollama_client import OllamaClient
+from .rollout import DEFAULT_MAX_TURNS, RolloutEngine
+from .tournament import run_tournament
 
 app = typer.Typer(help="Catan bot driven by gpt-oss via Ollama.")
 
 
+class Engine(str, Enum):
+    LLM = "llm"
+    MCTS = "mcts"
+    HEURISTIC = "heuristic"
+    ENSEMBLE = "ensemble"
+
+
 def _sample_initial_game_state() -> GameState:
     """Construct a tiny example game state intended to exercise the model."""
 
@@ -71,23 +90,191 @@ def _sample_initial_game_state() -> GameState:
 
 
 @app.command()
-def choose_move() -> None:
+def choose_move(
+    engine: Engine = typer.Option(
+        Engine.LLM,
+        "--engine",
+        help=(
+            "Decision engine: gpt-oss via Ollama, rollouts, the expected-value "
+            "heuristic, or a vote between several models."
+        ),
+    ),
+    time_budget: float = typer.Option(
+        2.0, "--time-budget", help="Seconds of rollouts per decision (mcts engine)."
+    ),
+    workers: int = typer.Option(
+        0, "--workers", help="Rollout processes (mcts engine); 0 uses every core."
+    ),
+    members: List[str] = typer.Option(
+        ["gpt-oss@0.2", "gpt-oss@0.7", "gpt-oss@1.0"],
+        "--member",
+        help="Ensemble member as model or model@temperature (ensemble engine; repeatable).",
+    ),
+    quorum: Optional[int] = typer.Option(
+        None, "--quorum", help="Agreeing members needed (ensemble engine); default majority."
+    ),
+    log: Optional[Path] = typer.Option(
+        None, "--log", help="Append the state and chosen move to this binary game log."
+    ),
+) -> None:
     """
-    Ask gpt-oss (via Ollama) to choose a move for the current player
-    from a built-in sample game state and print the result.
+    Choose a move for the current player from a built-in sample game state
+    and print the result, either by asking gpt-oss (via Ollama), by
+    Monte Carlo rollouts, by the expected-value heuristic, or by a quorum
+    vote between several models or temperatures.
     """
 
     game_state = _sample_initial_game_state()
-    client = OllamaClient()
 
-    typer.echo("Sending game state to gpt-oss via Ollama...")
-    move = client.choose_move(game_state)
+    if engine is Engine.HEURISTIC:
+        move = best_move(game_state)
+    elif engine is Engine.ENSEMBLE:
+        try:
+            ensemble = EnsembleClient([parse_member(m) for m in members], quorum=quorum)
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc)) from exc
+        typer.echo(f"Asking {len(members)} ensemble members via Ollama...")
+        move = asyncio.run(_ensemble_move(ensemble, game_state))
+        for label, stats in ensemble.stats.members.items():
+            status = "cancelled" if stats.cancelled else f"{stats.mean_latency:.2f}s"
+            agreed = "agreed" if stats.agreements else ""
+            typer.echo(f"  {label:<24} {status:>10} {agreed}")
+    elif engine is Engine.MCTS:
+        typer.echo(f"Running rollouts for {time_budget:.1f}s...")
+        with RolloutEngine(workers=workers or None) as rollouts:
+            move = rollouts.choose_move(game_state, time_budget=time_budget)
+    else:
+        client = OllamaClient()
+        typer.echo("Sending game state to gpt-oss via Ollama...")
+        move = client.choose_move(game_state)
 
     typer.echo("\n=== Model reasoning ===")
     typer.echo(move.reasoning)
     typer.echo("\n=== Model action ===")
     typer.echo(move.action.model_dump_json(indent=2))
 
+    if log is not None:
+        try:
+            with GameLogWriter(log, len(game_state.players)) as writer:
+                writer.begin_game(game_state, {"engine": engine.value})
+                writer.record(game_state, move.action)
+                writer.end_game(game_state)
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc)) from exc
+        typer.echo(f"\nLogged to {log}")
+
+
+async def _ensemble_move(ensemble: EnsembleClient, game_state: GameState) -> ModelMoveResponse:
+    async with ensemble:
+        return await ensemble.choose_move(game_state)
+
+
+@app.command()
+def tournament(
+    agents: List[str] = typer.Option(
+        ["heuristic", "random"],
+        "--agent",
+        help="Agent per seat (2-4): random, policy, heuristic, rollout[:seconds] or llm[:model].",
+    ),
+    games: int = typer.Option(100, "--games", help="Number of games to play."),
+    workers: int = typer.Option(
+        0, "--workers", help="Game processes; 0 uses every core."
+    ),
+    output: Path = typer.Option(
+        Path("tournament.jsonl"),
+        "--output",
+        help="Per-game results, as JSONL or (for *.parquet, needs pyarrow) Parquet.",
+    ),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Seed for reproducible games."),
+    max_turns: int = typer.Option(
+        DEFAULT_MAX_TURNS, "--max-turns", help="Turn horizon; longer games end unfinished."
+    ),
+    log: Optional[Path] = typer.Option(
+        None, "--log", help="Also append every decision to this binary game log."
+    ),
+) -> None:
+    """
+    Play self-play games between bots across a process pool, writing each
+    finished game to a file, then print win rates, Elo ratings and throughput.
+    """
+
+    def progress(result, summary) -> None:
+        if summary.games % 10 == 0 or summary.games == games:
+            typer.echo(
+                f"{summary.games}/{games} games, "
+                f"{summary.games_per_hour:.0f} games/hour, "
+                f"{summary.moves_per_second:.0f} moves/sec"
+            )
+
+    try:
+        summary = run_tournament(
+            agents,
+            games,
+            workers=workers or None,
+            output=output,
+            seed=seed,
+            max_turns=max_turns,
+            on_result=progress,
+            log=log,
+        )
+    except (ValueError, RuntimeError) as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    typer.echo(f"\n=== {summary.games} games ({summary.unfinished} hit the turn limit) ===")
+    typer.echo(f"{'agent':<20} {'games':>6} {'wins':>6} {'win rate':>9} {'elo':>7} {'invalid':>8}")
+    ranked = sorted(summary.agents.items(), key=lambda item: item[1].rating, reverse=True)
+    for label, stats in ranked:
+        typer.echo(
+            f"{label:<20} {stats.games:>6} {stats.wins:>6} {stats.win_rate:>9.1%} "
+            f"{stats.rating:>7.0f} {stats.invalid_moves:>8}"
+        )
+    typer.echo(
+        f"\n{summary.games_per_hour:.0f} games/hour, "
+        f"{summary.moves_per_second:.0f} moves/sec; results in {output}"
+    )
+
+
+@app.command()
+def gateway(
+    host: str = typer.Option("127.0.0.1", "--host"),
+    port: int = typer.Option(11500, "--port"),
+    upstream: str = typer.Option(
+        "http://localhost:11434", "--upstream", help="Ollama server to forward to."
+    ),
+    parallel: int = typer.Option(
+        ollama_num_parallel(),
+        "--parallel",
+        help="Requests in flight to Ollama; defaults to OLLAMA_NUM_PARALLEL or 4.",
+    ),
+    max_batch: int = typer.Option(8, "--max-batch", help="Largest batch dispatched at once."),
+    window_ms: float = typer.Option(
+        5.0, "--window-ms", help="How long a batch waits to fill."
+    ),
+) -> None:
+    """
+    Run a batching gateway in front of Ollama; point clients' base URL at it.
+    Metrics are served as JSON at /metrics.
+    """
+
+    config = GatewayConfig(
+        upstream_url=upstream,
+        parallel=parallel,
+        max_batch_size=max_batch,
+        window_seconds=window_ms / 1000,
+    )
+    typer.echo(f"Gateway on http://{host}:{port} -> {upstream} ({parallel} parallel)")
+    try:
+        asyncio.run(_run_gateway(config, host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _run_gateway(config: GatewayConfig, host: str, port: int) -> None:
+    async with BatchingGateway(config) as batching:
+        server = await serve(batching, host, port)
+        async with server:
+            await server.serve_forever()
+
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,566 @@
+"""
+Compact, fixed-layout game state for search and simulation.
+
+``GameState`` is convenient for talking to the model but every copy allocates
+a tree of Pydantic objects. ``CompactState`` holds the same information in a
+handful of flat buffers:
+
+- per-player resource counts and victory points in ``array`` buffers,
+- per-player settlements, cities and roads as integer bitmasks over the
+  node / edge indices defined in :mod:`catan_bot.topology`,
+- a few scalars (current player, turn, phase, robber),
+- a production table: per dice total, the resources each player collects
+  when it is rolled, kept up to date as buildings and the robber move,
+- an immutable header (player ids and names, hex layout) shared by every
+  state derived from the same game.
+
+``clone()`` is copy-on-write: the clone shares all buffers with its parent and
+a buffer is only copied the first time either side writes to it.
+"""
+
+from __future__ import annotations
+
+import operator
+import struct
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from . import roads as road_index
+from . import topology
+from .board import BoardTopology, layout_topology
+from .jsonio import dumps
+from .models import GameState, Resource, TurnPhase
+
+RESOURCES: Tuple[Resource, ...] = tuple(Resource)
+NUM_RESOURCES = len(RESOURCES)
+RESOURCE_INDEX: Dict[Resource, int] = {r: i for i, r in enumerate(RESOURCES)}
+_RESOURCE_VALUES: Tuple[str, ...] = tuple(r.value for r in RESOURCES)
+
+PHASES: Tuple[TurnPhase, ...] = tuple(TurnPhase)
+PHASE_INDEX: Dict[TurnPhase, int] = {p: i for i, p in enumerate(PHASES)}
+
+# Ownership flags for the copy-on-write buffers.
+_OWN_RESOURCES = 1
+_OWN_VP = 2
+_OWN_PIECES = 4
+_OWN_PRODUCTION = 8
+_OWN_ALL = _OWN_RESOURCES | _OWN_VP | _OWN_PIECES | _OWN_PRODUCTION
+
+# Dice totals index the production table directly (0 and 1 stay empty).
+_ROLLS = 13
+
+# Fixed-width binary layout used by pack()/unpack(): scalars, then per-player
+# resources and victory points, then per-player node and edge bitmasks.
+_SCALARS = struct.Struct("<BBIi")
+_NODE_BYTES = (topology.NUM_NODES + 7) // 8
+_EDGE_BYTES = (topology.NUM_EDGES + 7) // 8
+
+
+def iter_bits(mask: int):
+    """Yield the indices of the set bits of ``mask`` in ascending order."""
+
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class StateHeader:
+    """Per-game data that never changes during play and is shared by clones.
+
+    ``topology`` holds the board's lookup tables (see :mod:`catan_bot.board`).
+    """
+
+    __slots__ = (
+        "player_ids",
+        "player_names",
+        "hex_ids",
+        "hex_resources",
+        "hex_tokens",
+        "topology",
+    )
+
+    def __init__(
+        self,
+        player_ids: Tuple[int, ...],
+        player_names: Tuple[str, ...],
+        hex_ids: Tuple[int, ...],
+        hex_resources: Tuple[Optional[int], ...],
+        hex_tokens: Tuple[Optional[int], ...],
+    ) -> None:
+        self.player_ids = player_ids
+        self.player_names = player_names
+        self.hex_ids = hex_ids
+        self.hex_resources = hex_resources
+        self.hex_tokens = hex_tokens
+        self.topology: BoardTopology = layout_topology(hex_ids, hex_resources, hex_tokens)
+
+    def __reduce__(self):
+        # Send only the layout to worker processes; they rebuild the topology
+        # from their own cache.
+        return (
+            StateHeader,
+            (self.player_ids, self.player_names, self.hex_ids, self.hex_resources, self.hex_tokens),
+        )
+
+
+class CompactState:
+    """Array-backed game state with cheap copy-on-write cloning.
+
+    Players are addressed by index (their position in ``GameState.players``),
+    resources by their index in ``RESOURCES``, nodes and edges by their
+    0-based topology index.
+    """
+
+    __slots__ = (
+        "header",
+        "resources",
+        "victory_points",
+        "settlements",
+        "cities",
+        "roads",
+        "current",
+        "turn_number",
+        "phase",
+        "robber_hex_id",
+        "_owned",
+        "_road_components",
+        "_production",
+    )
+
+    def __init__(
+        self,
+        header: StateHeader,
+        resources: array,
+        victory_points: array,
+        settlements: List[int],
+        cities: List[int],
+        roads: List[int],
+        current: int,
+        turn_number: int,
+        phase: int,
+        robber_hex_id: int,
+    ) -> None:
+        self.header = header
+        self.resources = resources
+        self.victory_points = victory_points
+        self.settlements = settlements
+        self.cities = cities
+        self.roads = roads
+        self.current = current
+        self.turn_number = turn_number
+        self.phase = phase
+        self.robber_hex_id = robber_hex_id
+        self._owned = _OWN_ALL
+        # Per player road components and their lengths; built on the first
+        # longest_road() call, then updated on every placement.
+        self._road_components: Optional[List[Tuple[road_index.Component, ...]]] = None
+        self._production = self._build_production()
+
+    # ------------------------------------------------------------------
+    # Conversion
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_game_state(cls, game_state: GameState) -> "CompactState":
+        """Build a compact state from a ``GameState``.
+
+        Raises ``ValueError`` if a node or road does not exist on the board.
+        """
+
+        players = game_state.players
+        n = len(players)
+        resources = array("H", bytes(2 * n * NUM_RESOURCES))
+        victory_points = array("H", [p.victory_points for p in players])
+        settlements = [0] * n
+        cities = [0] * n
+        roads = [0] * n
+
+        for i, player in enumerate(players):
+            base = i * NUM_RESOURCES
+            for resource, count in player.resources.items():
+                resources[base + RESOURCE_INDEX[resource]] = count
+            settlements[i] = _node_mask(player.settlements)
+            cities[i] = _node_mask(player.cities)
+            mask = 0
+            for a, b in player.roads:
+                mask |= 1 << topology.edge_index(a, b)
+            roads[i] = mask
+
+        hexes = game_state.board.hexes
+        header = StateHeader(
+            player_ids=tuple(p.id for p in players),
+            player_names=tuple(p.name for p in players),
+            hex_ids=tuple(h.id for h in hexes),
+            hex_resources=tuple(
+                None if h.resource is None else RESOURCE_INDEX[h.resource] for h in hexes
+            ),
+            hex_tokens=tuple(h.number_token for h in hexes),
+        )
+
+        return cls(
+            header=header,
+            resources=resources,
+            victory_points=victory_points,
+            settlements=settlements,
+            cities=cities,
+            roads=roads,
+            current=header.player_ids.index(game_state.current_player_id),
+            turn_number=game_state.turn_number,
+            phase=PHASE_INDEX[game_state.phase],
+            robber_hex_id=game_state.board.robber.hex_id,
+        )
+
+    def to_game_state(self) -> GameState:
+        """Rebuild the equivalent ``GameState``.
+
+        Resource dicts always list all five resources, and settlements,
+        cities and roads come back sorted by index with roads as
+        ``(low, high)`` node pairs.
+        """
+
+        # One validation of plain data runs entirely in pydantic-core and is
+        # cheaper than building each nested model (or ``model_construct``).
+        return GameState.model_validate(self.game_state_data())
+
+    def game_state_json(self) -> str:
+        """``to_game_state().model_dump_json()``, written without building models."""
+
+        return dumps(self.game_state_data())
+
+    def game_state_data(self) -> Dict[str, Any]:
+        """The ``GameState`` as plain JSON-ready data (enum values, lists)."""
+
+        header = self.header
+        players = []
+        for i, player_id in enumerate(header.player_ids):
+            base = i * NUM_RESOURCES
+            players.append(
+                {
+                    "id": player_id,
+                    "name": header.player_names[i],
+                    "victory_points": self.victory_points[i],
+                    "resources": {
+                        r: self.resources[base + k] for k, r in enumerate(_RESOURCE_VALUES)
+                    },
+                    "roads": [topology.edge_node_ids(e) for e in iter_bits(self.roads[i])],
+                    "settlements": [n + 1 for n in iter_bits(self.settlements[i])],
+                    "cities": [n + 1 for n in iter_bits(self.cities[i])],
+                }
+            )
+
+        return {
+            "players": players,
+            "current_player_id": header.player_ids[self.current],
+            "board": {
+                "hexes": [
+                    {
+                        "id": hex_id,
+                        "resource": None if code is None else _RESOURCE_VALUES[code],
+                        "number_token": token,
+                    }
+                    for hex_id, code, token in zip(
+                        header.hex_ids, header.hex_resources, header.hex_tokens
+                    )
+                ],
+                "robber": {"hex_id": self.robber_hex_id},
+            },
+            "turn_number": self.turn_number,
+            "phase": PHASES[self.phase].value,
+        }
+
+    # ------------------------------------------------------------------
+    # Binary layout
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def packed_size(num_players: int) -> int:
+        """Size in bytes of ``pack()`` output for a game with ``num_players``."""
+
+        per_player = 2 * (NUM_RESOURCES + 1) + 2 * _NODE_BYTES + _EDGE_BYTES
+        return _SCALARS.size + num_players * per_player
+
+    def pack_into(self, buffer, offset: int = 0) -> None:
+        """Write the mutable part of the state into ``buffer`` at ``offset``.
+
+        The header is not included; ``unpack`` needs it separately.
+        """
+
+        _SCALARS.pack_into(
+            buffer, offset, self.current, self.phase, self.turn_number, self.robber_hex_id
+        )
+        offset += _SCALARS.size
+        for data in (self.resources, self.victory_points):
+            raw = data.tobytes()
+            buffer[offset : offset + len(raw)] = raw
+            offset += len(raw)
+        for masks, width in (
+            (self.settlements, _NODE_BYTES),
+            (self.cities, _NODE_BYTES),
+            (self.roads, _EDGE_BYTES),
+        ):
+            for mask in masks:
+                buffer[offset : offset + width] = mask.to_bytes(width, "little")
+                offset += width
+
+    def pack(self) -> bytes:
+        buffer = bytearray(self.packed_size(self.num_players))
+        self.pack_into(buffer)
+        return bytes(buffer)
+
+    @classmethod
+    def unpack(cls, header: StateHeader, buffer, offset: int = 0) -> "CompactState":
+        """Rebuild a state written by ``pack``/``pack_into``."""
+
+        n = len(header.player_ids)
+        current, phase, turn_number, robber_hex_id = _SCALARS.unpack_from(buffer, offset)
+        offset += _SCALARS.size
+
+        resources = array("H")
+        resources.frombytes(bytes(buffer[offset : offset + 2 * n * NUM_RESOURCES]))
+        offset += 2 * n * NUM_RESOURCES
+        victory_points = array("H")
+        victory_points.frombytes(bytes(buffer[offset : offset + 2 * n]))
+        offset += 2 * n
+
+        masks = []
+        for width in (_NODE_BYTES, _NODE_BYTES, _EDGE_BYTES):
+            group = []
+            for _ in range(n):
+                group.append(int.from_bytes(buffer[offset : offset + width], "little"))
+                offset += width
+            masks.append(group)
+
+        return cls(
+            header=header,
+            resources=resources,
+            victory_points=victory_points,
+            settlements=masks[0],
+            cities=masks[1],
+            roads=masks[2],
+            current=current,
+            turn_number=turn_number,
+            phase=phase,
+            robber_hex_id=robber_hex_id,
+        )
+
+    # ------------------------------------------------------------------
+    # Copy-on-write
+    # ------------------------------------------------------------------
+
+    def clone(self) -> "CompactState":
+        """Return a state sharing every buffer with this one until written."""
+
+        other = CompactState.__new__(CompactState)
+        other.header = self.header
+        other.resources = self.resources
+        other.victory_points = self.victory_points
+        other.settlements = self.settlements
+        other.cities = self.cities
+        other.roads = self.roads
+        other.current = self.current
+        other.turn_number = self.turn_number
+        other.phase = self.phase
+        other.robber_hex_id = self.robber_hex_id
+        other._owned = 0
+        # Never mutated in place, so sharing needs no ownership flag.
+        other._road_components = self._road_components
+        other._production = self._production
+        self._owned = 0
+        return other
+
+    def _own_resources(self) -> array:
+        if not self._owned & _OWN_RESOURCES:
+            self.resources = self.resources[:]
+            self._owned |= _OWN_RESOURCES
+        return self.resources
+
+    def _own_victory_points(self) -> array:
+        if not self._owned & _OWN_VP:
+            self.victory_points = self.victory_points[:]
+            self._owned |= _OWN_VP
+        return self.victory_points
+
+    def _own_pieces(self) -> None:
+        if not self._owned & _OWN_PIECES:
+            self.settlements = self.settlements[:]
+            self.cities = self.cities[:]
+            self.roads = self.roads[:]
+            self._owned |= _OWN_PIECES
+
+    def _own_production(self) -> array:
+        if not self._owned & _OWN_PRODUCTION:
+            self._production = self._production[:]
+            self._owned |= _OWN_PRODUCTION
+        return self._production
+
+    # ------------------------------------------------------------------
+    # Accessors and mutators
+    # ------------------------------------------------------------------
+
+    @property
+    def num_players(self) -> int:
+        return len(self.header.player_ids)
+
+    def player_index(self, player_id: int) -> int:
+        return self.header.player_ids.index(player_id)
+
+    def resource_count(self, player: int, resource: int) -> int:
+        return self.resources[player * NUM_RESOURCES + resource]
+
+    def hand(self, player: int) -> array:
+        """Return a copy of a player's five resource counts."""
+
+        base = player * NUM_RESOURCES
+        return self.resources[base : base + NUM_RESOURCES]
+
+    def add_resources(self, player: int, deltas: Sequence[int]) -> None:
+        """Add (or with negative deltas, remove) resources for a player."""
+
+        resources = self._own_resources()
+        base = player * NUM_RESOURCES
+        for k, delta in enumerate(deltas):
+            if delta:
+                resources[base + k] += delta
+
+    def add_victory_points(self, player: int, delta: int) -> None:
+        self._own_victory_points()[player] += delta
+
+    def place_road(self, player: int, edge: int) -> None:
+        self._own_pieces()
+        self.roads[player] |= 1 << edge
+        if self._road_components is not None:
+            components = self._road_components[:]
+            components[player] = road_index.add_road(
+                components[player], edge, self._blocking_nodes(player)
+            )
+            self._road_components = components
+
+    def place_settlement(self, player: int, node: int) -> None:
+        self._own_pieces()
+        self.settlements[player] |= 1 << node
+        self._add_node_yield(player, node)
+        if self._road_components is not None:
+            components = self._road_components[:]
+            for other in range(self.num_players):
+                if other != player:
+                    components[other] = road_index.block_node(
+                        components[other], node, self._blocking_nodes(other)
+                    )
+            self._road_components = components
+
+    def upgrade_to_city(self, player: int, node: int) -> None:
+        self._own_pieces()
+        bit = 1 << node
+        self.settlements[player] &= ~bit
+        self.cities[player] |= bit
+        # A city yields one more than the settlement it replaces.
+        self._add_node_yield(player, node)
+
+    def longest_road(self, player: int) -> int:
+        """Length of ``player``'s longest road.
+
+        The first call measures every player's road network; after that each
+        placement re-measures only the road components it touches.
+        """
+
+        if self._road_components is None:
+            self._road_components = [
+                road_index.components_for(self.roads[p], self._blocking_nodes(p))
+                for p in range(self.num_players)
+            ]
+        return road_index.longest(self._road_components[player])
+
+    def longest_road_leader(self) -> Optional[int]:
+        """Player with a strictly longest road of at least five, if any."""
+
+        lengths = [self.longest_road(p) for p in range(self.num_players)]
+        return road_index.longest_road_leader(lengths)
+
+    def _blocking_nodes(self, player: int) -> int:
+        """Nodes with another player's building, which break ``player``'s roads."""
+
+        mask = 0
+        for p in range(self.num_players):
+            if p != player:
+                mask |= self.settlements[p] | self.cities[p]
+        return mask
+
+    def move_robber(self, hex_id: int) -> None:
+        if hex_id != self.robber_hex_id:
+            table = self._own_production()
+            self._add_hex_yield(table, self.robber_hex_id, 1)
+            self._add_hex_yield(table, hex_id, -1)
+        self.robber_hex_id = hex_id
+
+    # ------------------------------------------------------------------
+    # Production
+    # ------------------------------------------------------------------
+
+    def production(self, roll: int) -> array:
+        """Resources each player collects on ``roll``, laid out like ``resources``."""
+
+        width = len(self.resources)
+        return self._production[roll * width : (roll + 1) * width]
+
+    def collect(self, roll: int) -> None:
+        """Hand out the resources produced by ``roll`` in a single add."""
+
+        width = len(self.resources)
+        start = roll * width
+        row = self._production[start : start + width]
+        if any(row):
+            self.resources = array("H", map(operator.add, self.resources, row))
+            self._owned |= _OWN_RESOURCES
+
+    def _build_production(self) -> array:
+        table = array("H", bytes(2 * _ROLLS * len(self.resources)))
+        for hex_id in self.header.topology.hex_ids:
+            if hex_id != self.robber_hex_id:
+                self._add_hex_yield(table, hex_id, 1)
+        return table
+
+    def _add_hex_yield(self, table: array, hex_id: int, sign: int) -> None:
+        """Add (``sign=1``) or remove (``-1``) one hex's output to the table."""
+
+        if not 0 < hex_id < len(self.header.topology.hex_yield):
+            return
+        info = self.header.topology.hex_yield[hex_id]
+        if info is None:
+            return
+        resource, token, nodes = info
+        base = token * len(self.resources) + resource
+        for p in range(self.num_players):
+            count = (self.settlements[p] & nodes).bit_count()
+            count += 2 * (self.cities[p] & nodes).bit_count()
+            if count:
+                table[base + p * NUM_RESOURCES] += sign * count
+
+    def _add_node_yield(self, player: int, node: int) -> None:
+        """Count one more building level for ``player`` on ``node``."""
+
+        yields = self.header.topology.node_yields[node]
+        if not yields:
+            return
+        table = self._own_production()
+        width = len(self.resources)
+        offset = player * NUM_RESOURCES
+        for hex_id, resource, token in yields:
+            if hex_id != self.robber_hex_id:
+                table[token * width + offset + resource] += 1
+
+    def end_turn(self) -> None:
+        """Pass play to the next player and start their turn."""
+
+        self.current = (self.current + 1) % self.num_players
+        self.turn_number += 1
+        self.phase = PHASE_INDEX[TurnPhase.START_OF_TURN]
+
+
+def _node_mask(node_ids: Sequence[int]) -> int:
+    mask = 0
+    for node_id in node_ids:
+        if not 1 <= node_id <= topology.NUM_NODES:
+            raise ValueError(f"Node {node_id} is not on the board.")
+        mask |= 1 << (node_id - 1)
+    return mask
@@ -0,0 +1,260 @@
+"""
+Ensemble voting over several models or sampling temperatures.
+
+``EnsembleClient`` sends the same state to every member concurrently and
+counts votes as answers arrive. Two answers vote for the same move when their
+normalized actions match (locations and trade dicts written one canonical
+way). As soon as ``quorum`` members agree the remaining requests are
+cancelled, which closes their connections and makes Ollama stop generating,
+so a decision takes about as long as the slowest member of the fastest
+quorum. If every member answers (or fails) without a quorum, the move with
+the most votes wins, ties going to the move proposed first.
+
+Members are given as ``model[@temperature]`` strings, e.g. ``gpt-oss@0.2``;
+``@`` keeps Ollama's ``model:tag`` names intact.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .async_client import AsyncOllamaClient
+from .models import (
+    BuildAction,
+    GameState,
+    ModelMoveResponse,
+    MoveAction,
+    RobberAction,
+    TradeAction,
+)
+from .movegen import edge_location, node_location, parse_location
+from .ollama_client import OllamaConfig
+
+
+@dataclass(frozen=True)
+class EnsembleMember:
+    model: str
+    temperature: Optional[float] = None
+    # Ollama server for this member; defaults to the ensemble config's.
+    base_url: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        return self.model if self.temperature is None else f"{self.model}@{self.temperature:g}"
+
+
+def parse_member(spec: str) -> EnsembleMember:
+    """Parse ``model[@temperature]``."""
+
+    model, _, temperature = spec.partition("@")
+    if not model:
+        raise ValueError(f"Ensemble member {spec!r} has no model name.")
+    try:
+        return EnsembleMember(model, float(temperature) if temperature else None)
+    except ValueError as exc:
+        raise ValueError(f"Ensemble member {spec!r} has a non-numeric temperature.") from exc
+
+
+@dataclass
+class MemberStats:
+    """Per-member counters; latencies are of completed answers only."""
+
+    requests: int = 0
+    answers: int = 0
+    errors: int = 0
+    cancelled: int = 0
+    # Answers that matched the move the ensemble chose.
+    agreements: int = 0
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def agreement_rate(self) -> float:
+        return self.agreements / self.answers if self.answers else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return statistics.fmean(self.latencies) if self.latencies else 0.0
+
+    @property
+    def p50_latency(self) -> float:
+        return statistics.median(self.latencies) if self.latencies else 0.0
+
+
+@dataclass
+class EnsembleStats:
+    members: Dict[str, MemberStats]
+    decisions: int = 0
+    # Decisions settled by a quorum (the rest fell back to plurality).
+    quorum_reached: int = 0
+    latencies: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def quorum_rate(self) -> float:
+        return self.quorum_reached / self.decisions if self.decisions else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return statistics.fmean(self.latencies) if self.latencies else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "decisions": self.decisions,
+            "quorum_rate": round(self.quorum_rate, 3),
+            "mean_latency_s": round(self.mean_latency, 4),
+            "members": {
+                label: {
+                    "requests": m.requests,
+                    "answers": m.answers,
+                    "errors": m.errors,
+                    "cancelled": m.cancelled,
+                    "agreement_rate": round(m.agreement_rate, 3),
+                    "mean_latency_s": round(m.mean_latency, 4),
+                    "p50_latency_s": round(m.p50_latency, 4),
+                }
+                for label, m in self.members.items()
+            },
+        }
+
+
+def normalize_action(action: MoveAction) -> Hashable:
+    """A key equal for actions that describe the same move."""
+
+    if isinstance(action, BuildAction):
+        return ("build", action.build_type.value, _normalize_location(action.location))
+    if isinstance(action, TradeAction):
+        return (
+            "trade",
+            action.trade_type.value,
+            action.target_player_id,
+            _normalize_amounts(action.give),
+            _normalize_amounts(action.receive),
+        )
+    if isinstance(action, RobberAction):
+        return ("move_robber", action.target_hex_id, action.steal_from_player_id)
+    return ("end_turn",)
+
+
+def _normalize_location(location: str) -> str:
+    try:
+        kind, index = parse_location(location)
+    except ValueError:
+        return location.strip()
+    return node_location(index) if kind == "node" else edge_location(index)
+
+
+def _normalize_amounts(amounts: Dict[Any, int]) -> Tuple[Tuple[str, int], ...]:
+    return tuple(sorted((r.value, n) for r, n in amounts.items() if n))
+
+
+class EnsembleClient:
+    """Quorum voting over one ``AsyncOllamaClient`` per member.
+
+    ``quorum`` defaults to a majority of the members. All members share the
+    other settings of ``config``.
+    """
+
+    def __init__(
+        self,
+        members: Sequence[EnsembleMember],
+        config: Optional[OllamaConfig] = None,
+        quorum: Optional[int] = None,
+    ) -> None:
+        if not members:
+            raise ValueError("An ensemble needs at least one member.")
+        self.members = list(members)
+        self.quorum = quorum if quorum is not None else len(self.members) // 2 + 1
+        if not 1 <= self.quorum <= len(self.members):
+            raise ValueError(f"Quorum must be between 1 and {len(self.members)}.")
+        labels = [m.label for m in self.members]
+        if len(set(labels)) != len(labels):
+            raise ValueError("Ensemble members must differ in model or temperature.")
+        base = config or OllamaConfig()
+        self._clients = [
+            AsyncOllamaClient(
+                dataclasses.replace(
+                    base,
+                    model=m.model,
+                    temperature=m.temperature,
+                    base_url=m.base_url or base.base_url,
+                )
+            )
+            for m in self.members
+        ]
+        self.stats = EnsembleStats(members={label: MemberStats() for label in labels})
+
+    async def __aenter__(self) -> "EnsembleClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await asyncio.gather(*(client.aclose() for client in self._clients))
+
+    async def choose_move(self, game_state: GameState) -> ModelMoveResponse:
+        """The move a quorum of members agrees on (see the module docstring).
+
+        Raises the first member's error if every member fails.
+        """
+
+        started = time.perf_counter()
+        tasks = {
+            asyncio.create_task(self._ask(client, member.label, game_state)): member.label
+            for client, member in zip(self._clients, self.members)
+        }
+        votes: Dict[Hashable, List[Tuple[str, ModelMoveResponse]]] = {}
+        errors: List[BaseException] = []
+        winner: Optional[Hashable] = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    label, move, latency = await next_done
+                except Exception as exc:  # One member failing only loses its vote.
+                    errors.append(exc)
+                    continue
+                member = self.stats.members[label]
+                member.answers += 1
+                member.latencies.append(latency)
+                key = normalize_action(move.action)
+                ballots = votes.setdefault(key, [])
+                ballots.append((label, move))
+                if len(ballots) >= self.quorum:
+                    winner = key
+                    break
+        finally:
+            for task, label in tasks.items():
+                self.stats.members[label].requests += 1
+                if not task.done():
+                    task.cancel()
+                    self.stats.members[label].cancelled += 1
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if winner is None:
+            if not votes:
+                raise errors[0]
+            # dicts keep insertion order, so max() prefers the earliest key.
+            winner = max(votes, key=lambda k: len(votes[k]))
+        else:
+            self.stats.quorum_reached += 1
+
+        for label, _ in votes[winner]:
+            self.stats.members[label].agreements += 1
+        self.stats.decisions += 1
+        self.stats.latencies.append(time.perf_counter() - started)
+        return votes[winner][0][1]
+
+    async def _ask(
+        self, client: AsyncOllamaClient, label: str, game_state: GameState
+    ) -> Tuple[str, ModelMoveResponse, float]:
+        started = time.perf_counter()
+        try:
+            move = await client.choose_move(game_state)
+        except Exception:
+            self.stats.members[label].errors += 1
+            raise
+        return label, move, time.perf_counter() - started
@@ -0,0 +1,284 @@
+"""
+Expected-value scoring of candidate moves.
+
+Every candidate is described by the same small feature vector, and its score
+is the dot product with a weight vector:
+
+- ``vp``: victory points gained
+- ``income``: change in the mover's expected cards per turn, from the dice
+  probabilities of the hexes a building touches (or the robber leaves/blocks)
+- ``opponent_income``: expected cards per turn taken from the strongest
+  opponent by the robber
+- ``turns_to_build``: estimated turns until the mover can pay for its next
+  settlement or city, given the hand after the move and expected income
+- ``steal``: a card stolen
+- ``spot``: pips of the best settlement spot a road newly reaches (at half
+  value if it is one more road away)
+
+Features for a whole batch of states and candidates are built first, then
+each row is scored with a plain Python dot product; ranking a few hundred
+moves costs a few hundred microseconds.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from .board import pips
+from .compact import NUM_RESOURCES, CompactState, iter_bits
+from .models import GameState, ModelMoveResponse, MoveAction
+from .movegen import (
+    BANK_TRADE_RATIO,
+    CITY_COST,
+    DEV_CARD_COST,
+    KIND_BANK_TRADE,
+    KIND_CITY,
+    KIND_DEV_CARD,
+    KIND_PLAYER_TRADE,
+    KIND_ROAD,
+    KIND_ROBBER,
+    KIND_SETTLEMENT,
+    ROAD_COST,
+    SETTLEMENT_COST,
+    decode_move,
+    legal_move_codes,
+    move_kind,
+    move_payload,
+    settlement_candidates,
+)
+from .topology import DISTANCE_MASK, EDGE_NODES_MASK, NODE_NEIGHBORS_MASK
+
+# Probability of each dice total 0..12.
+DICE_PROBABILITIES: Tuple[float, ...] = tuple(
+    pips(roll) / 36 if roll >= 2 else 0.0 for roll in range(13)
+)
+
+FEATURES: Tuple[str, ...] = (
+    "vp",
+    "income",
+    "opponent_income",
+    "turns_to_build",
+    "steal",
+    "spot",
+)
+DEFAULT_WEIGHTS: Tuple[float, ...] = (10.0, 25.0, 8.0, -0.5, 1.0, 0.15)
+
+# Never expect a resource to take longer than this many turns to arrive.
+MAX_TURNS_TO_BUILD = 20.0
+_MIN_INCOME = 1 / MAX_TURNS_TO_BUILD
+
+# Without an open spot a settlement needs (at least) one more road first.
+_SETTLEMENT_VIA_ROAD = tuple(a + b for a, b in zip(SETTLEMENT_COST, ROAD_COST))
+
+_COSTS = {
+    KIND_ROAD: ROAD_COST,
+    KIND_SETTLEMENT: SETTLEMENT_COST,
+    KIND_CITY: CITY_COST,
+    KIND_DEV_CARD: DEV_CARD_COST,
+}
+
+
+@dataclass
+class ScoredMove:
+    action: MoveAction
+    score: float
+
+
+def expected_income(state: CompactState, player: int) -> List[float]:
+    """Expected cards of each resource ``player`` collects per roll."""
+
+    income = [0.0] * NUM_RESOURCES
+    base = player * NUM_RESOURCES
+    for roll in range(2, 13):
+        row = state.production(roll)
+        p = DICE_PROBABILITIES[roll]
+        for k in range(NUM_RESOURCES):
+            if row[base + k]:
+                income[k] += p * row[base + k]
+    return income
+
+
+def turns_to_afford(hand: Sequence[int], income: Sequence[float], cost: Sequence[int]) -> float:
+    """Rough turns until ``hand`` plus ``income`` per turn covers ``cost``.
+
+    Cards beyond the cost, and income of other resources, count at the bank
+    ratio, so a missing resource is never out of reach.
+    """
+
+    missing = 0
+    spare = 0
+    for have, need in zip(hand, cost):
+        if need > have:
+            missing += need - have
+        else:
+            spare += have - need
+    missing -= spare // BANK_TRADE_RATIO
+    if missing <= 0:
+        return 0.0
+
+    total = sum(income)
+    turns = 0.0
+    for have, rate, need in zip(hand, income, cost):
+        if need > have:
+            effective = rate + (total - rate) / BANK_TRADE_RATIO
+            turns = max(turns, (need - have) / max(effective, _MIN_INCOME))
+    # Spare cards cover some of the missing ones straight away.
+    turns *= missing / sum(max(0, n - h) for h, n in zip(hand, cost))
+    return min(turns, MAX_TURNS_TO_BUILD)
+
+
+def move_features(state: CompactState, codes: Sequence[int]) -> List[Tuple[float, ...]]:
+    """One feature row (see ``FEATURES``) per candidate move code."""
+
+    player = state.current
+    topo = state.header.topology
+    hand = list(state.hand(player))
+    income = expected_income(state, player)
+    opponents = [p for p in range(state.num_players) if p != player]
+    # The robber is aimed at whoever is closest to winning.
+    leader = max(opponents, key=lambda p: state.victory_points[p], default=None)
+    spots = settlement_candidates(state, player)
+    blocked = 0
+    for p in range(state.num_players):
+        for n in iter_bits(state.settlements[p] | state.cities[p]):
+            blocked |= DISTANCE_MASK[n]
+
+    def node_income(node: int) -> List[float]:
+        gained = [0.0] * NUM_RESOURCES
+        for hex_id, resource, token in topo.node_yields[node]:
+            if hex_id != state.robber_hex_id:
+                gained[resource] += DICE_PROBABILITIES[token]
+        return gained
+
+    def hex_income(hex_id: int, p: int) -> Tuple[int, float]:
+        info = topo.hex_yield[hex_id] if 0 < hex_id < len(topo.hex_yield) else None
+        if info is None:
+            return 0, 0.0
+        resource, token, nodes = info
+        count = (state.settlements[p] & nodes).bit_count()
+        count += 2 * (state.cities[p] & nodes).bit_count()
+        return resource, count * DICE_PROBABILITIES[token]
+
+    rows = []
+    for code in codes:
+        kind, payload = move_kind(code), move_payload(code)
+        vp = 0.0
+        steal = 0.0
+        spot = 0.0
+        opponent_loss = 0.0
+        after = hand[:]
+        gained = [0.0] * NUM_RESOURCES
+
+        cost = _COSTS.get(kind)
+        if cost is not None:
+            for k in range(NUM_RESOURCES):
+                after[k] -= cost[k]
+        if kind == KIND_SETTLEMENT or kind == KIND_CITY:
+            vp = 1.0
+            gained = node_income(payload)
+        elif kind == KIND_ROAD:
+            ends = EDGE_NODES_MASK[payload]
+            reach = ends & ~blocked & ~spots
+            # One road out of a settlement only reaches a node the distance
+            # rule blocks, so spots one road further count at half value.
+            beyond = 0
+            for n in iter_bits(ends):
+                beyond |= NODE_NEIGHBORS_MASK[n]
+            beyond &= ~blocked & ~spots & ~reach
+            spot = max(
+                max((topo.node_pips[n] for n in iter_bits(reach)), default=0),
+                max((topo.node_pips[n] for n in iter_bits(beyond)), default=0) / 2,
+            )
+        elif kind == KIND_BANK_TRADE or kind == KIND_PLAYER_TRADE:
+            give, receive = (payload >> 4) & 0xF, payload & 0xF
+            after[give] -= payload >> 8 if kind == KIND_BANK_TRADE else 1
+            after[receive] += 1
+        elif kind == KIND_ROBBER:
+            target = payload >> 8
+            steal = 1.0 if payload & 0xFF else 0.0
+            resource, freed = hex_income(state.robber_hex_id, player)
+            gained[resource] += freed
+            resource, lost = hex_income(target, player)
+            gained[resource] -= lost
+            if leader is not None:
+                opponent_loss = hex_income(target, leader)[1]
+                opponent_loss -= hex_income(state.robber_hex_id, leader)[1]
+
+        open_spots = spots
+        settlements = state.settlements[player].bit_count()
+        if kind == KIND_SETTLEMENT:
+            open_spots &= ~DISTANCE_MASK[payload]
+            settlements += 1
+        elif kind == KIND_CITY:
+            settlements -= 1
+        elif kind == KIND_ROAD:
+            open_spots |= reach
+
+        new_income = [a + b for a, b in zip(income, gained)]
+        turns = turns_to_afford(
+            after, new_income, SETTLEMENT_COST if open_spots else _SETTLEMENT_VIA_ROAD
+        )
+        if settlements:
+            turns = min(turns, turns_to_afford(after, new_income, CITY_COST))
+        rows.append((vp, sum(gained), opponent_loss, turns, steal, spot))
+    return rows
+
+
+def score_batch(
+    states: Sequence[CompactState],
+    codes: Sequence[Sequence[int]],
+    weights: Sequence[float] = DEFAULT_WEIGHTS,
+) -> List[List[float]]:
+    """Score ``codes[i]`` in ``states[i]`` for every state in the batch."""
+
+    matrix: List[Tuple[float, ...]] = []
+    sizes = []
+    for state, candidates in zip(states, codes):
+        rows = move_features(state, candidates)
+        matrix.extend(rows)
+        sizes.append(len(rows))
+
+    w = tuple(weights)
+    flat = [sum(x * y for x, y in zip(row, w)) for row in matrix]
+    out = []
+    start = 0
+    for size in sizes:
+        out.append(flat[start : start + size])
+        start += size
+    return out
+
+
+def score_codes(
+    state: CompactState,
+    codes: Optional[Sequence[int]] = None,
+    weights: Sequence[float] = DEFAULT_WEIGHTS,
+) -> List[Tuple[int, float]]:
+    """``(code, score)`` for each candidate (default: every legal move), best first."""
+
+    if codes is None:
+        codes = legal_move_codes(state)
+    scores = score_batch([state], [codes], weights)[0]
+    return sorted(zip(codes, scores), key=lambda item: item[1], reverse=True)
+
+
+def rank_moves(game_state: GameState, k: Optional[int] = None) -> List[ScoredMove]:
+    """The legal moves of ``game_state`` ranked by expected value, best first."""
+
+    state = CompactState.from_game_state(game_state)
+    ranked = score_codes(state)
+    if k is not None:
+        ranked = ranked[:k]
+    return [ScoredMove(action=decode_move(state, code), score=score) for code, score in ranked]
+
+
+def best_move(game_state: GameState) -> ModelMoveResponse:
+    ranked = rank_moves(game_state)
+    best = ranked[0]
+    return ModelMoveResponse(
+        reasoning=(
+            f"Highest expected value ({best.score:.2f}) of {len(ranked)} legal moves, "
+            "scored on victory points, expected income and turns to the next build."
+        ),
+        action=best.action,
+    )
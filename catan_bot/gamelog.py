@@ -0,0 +1,410 @@
+"""
+Append-only binary game logs.
+
+A log holds (state, move, outcome) tuples for many games in far less space
+than JSON ``GameState`` dumps, and can be scanned or randomly accessed
+without loading it: ``GameLogReader`` maps the file with ``mmap`` and only
+decodes the records it is asked for.
+
+Layout (little-endian):
+
+- a 32-byte preamble: magic ``CATNLOG1``, version, number of players, the
+  record size, then the offset and length of the current index footer (0 if
+  none has been written); every game in a file has the same number of players,
+- fixed-width records, one per move: the move code (see
+  :mod:`catan_bot.movegen`) then the state before the move in the
+  ``CompactState.pack`` layout; a game's records are contiguous,
+- index footers (JSON): per game its board layout and players, the byte
+  offset of its records, first record number and record count, outcome
+  (winning seat, final victory points, turns) and any caller-supplied
+  ``info``.
+
+Nothing already written is ever overwritten except the preamble's footer
+pointer. Appending writes new records after the end of the file and, on
+``close``, a new footer covering every game, then repoints the preamble. If
+the writer dies before that, the previous footer still indexes every earlier
+game; the new records are left as unreferenced bytes.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .compact import CompactState, StateHeader
+from .jsonio import dumps, loads
+from .models import GameState, MoveAction
+from .movegen import decode_move, encode_move
+from .rules import winner
+
+MAGIC = b"CATNLOG1"
+VERSION = 2
+
+_PREAMBLE = struct.Struct("<8sHBxIQQ")
+# Footer offset and length, the last two preamble fields.
+_FOOTER_POINTER = struct.Struct("<QQ")
+_FOOTER_POINTER_OFFSET = _PREAMBLE.size - _FOOTER_POINTER.size
+_MOVE = struct.Struct("<I")
+
+
+def record_size(num_players: int) -> int:
+    """Bytes per record in a log of ``num_players``-player games."""
+
+    return _MOVE.size + CompactState.packed_size(num_players)
+
+
+def _layout(header: StateHeader) -> Dict[str, Any]:
+    return {
+        "player_ids": list(header.player_ids),
+        "player_names": list(header.player_names),
+        "hex_ids": list(header.hex_ids),
+        "hex_resources": list(header.hex_resources),
+        "hex_tokens": list(header.hex_tokens),
+    }
+
+
+@dataclass
+class LoggedGame:
+    """Index entry for one game: where its records are and how it ended."""
+
+    layout: Dict[str, Any]
+    # Byte offset of the game's first record, and that record's number.
+    offset: int = 0
+    first: int = 0
+    count: int = 0
+    # Seat index of the winner; None for a game cut off at the turn limit.
+    winner: Optional[int] = None
+    victory_points: List[int] = field(default_factory=list)
+    turns: int = 0
+    # Anything the caller wants kept with the game (seed, agent labels...).
+    info: Dict[str, Any] = field(default_factory=dict)
+    _header: Optional[StateHeader] = field(default=None, repr=False, compare=False)
+
+    @property
+    def header(self) -> StateHeader:
+        if self._header is None:
+            self._header = StateHeader(
+                player_ids=tuple(self.layout["player_ids"]),
+                player_names=tuple(self.layout["player_names"]),
+                hex_ids=tuple(self.layout["hex_ids"]),
+                hex_resources=tuple(self.layout["hex_resources"]),
+                hex_tokens=tuple(self.layout["hex_tokens"]),
+            )
+        return self._header
+
+    def finish(self, state: CompactState) -> None:
+        self.winner = winner(state)
+        self.victory_points = list(state.victory_points)
+        self.turns = state.turn_number
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "layout": self.layout,
+            "offset": self.offset,
+            "first": self.first,
+            "count": self.count,
+            "winner": self.winner,
+            "victory_points": self.victory_points,
+            "turns": self.turns,
+            "info": self.info,
+        }
+
+
+class GameRecording:
+    """One game's records built in memory, for ``GameLogWriter.append``.
+
+    Picklable, so tournament workers can record their games and hand them to
+    the process that owns the log.
+    """
+
+    def __init__(self, state: CompactState, info: Optional[Dict[str, Any]] = None) -> None:
+        self.game = LoggedGame(_layout(state.header), info=info or {})
+        self.num_players = state.num_players
+        self.data = bytearray()
+
+    def record(self, state: CompactState, code: int) -> None:
+        """Add ``state`` (before the move) and the move ``code``."""
+
+        offset = len(self.data)
+        self.data.extend(bytes(record_size(self.num_players)))
+        _pack_record(self.data, offset, state, code)
+        self.game.count += 1
+
+    def finish(self, state: CompactState) -> None:
+        """Store the outcome from the game's final ``state``."""
+
+        self.game.finish(state)
+
+
+def _pack_record(buffer, offset: int, state: CompactState, code: int) -> None:
+    _MOVE.pack_into(buffer, offset, code)
+    state.pack_into(buffer, offset + _MOVE.size)
+
+
+class GameLogWriter:
+    """Streams records to a log file, appending if it already exists.
+
+    Either call ``begin_game``, ``record`` for every move and ``end_game``,
+    or ``append`` whole ``GameRecording`` objects. States may be given as
+    ``CompactState`` or ``GameState``, moves as codes or ``MoveAction``.
+    """
+
+    def __init__(self, path: Union[str, Path], num_players: int) -> None:
+        self.path = Path(path)
+        self.num_players = num_players
+        self.record_size = record_size(num_players)
+        self.games: List[LoggedGame] = []
+        self.records = 0
+        self._current: Optional[LoggedGame] = None
+        self._buffer = bytearray(self.record_size)
+
+        if self.path.exists() and self.path.stat().st_size > 0:
+            with GameLogReader(self.path) as existing:
+                if existing.num_players != num_players:
+                    raise ValueError(
+                        f"{self.path} holds {existing.num_players}-player games, "
+                        f"not {num_players}."
+                    )
+                self.games = existing.games
+                self.records = len(existing)
+            # New records go after everything in the file (including any
+            # unreferenced records left by a writer that did not close).
+            self._file = open(self.path, "r+b")
+            self._file.seek(0, os.SEEK_END)
+        else:
+            self._file = open(self.path, "wb")
+            self._file.write(
+                _PREAMBLE.pack(MAGIC, VERSION, num_players, self.record_size, 0, 0)
+            )
+
+    def __enter__(self) -> "GameLogWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def begin_game(
+        self, state: Union[CompactState, GameState], info: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Start a new game from its initial ``state``; returns its index."""
+
+        if self._current is not None:
+            raise RuntimeError("The previous game has not been ended.")
+        state = self._compact(state)
+        self._current = LoggedGame(
+            _layout(state.header),
+            offset=self._file.tell(),
+            first=self.records,
+            info=info or {},
+        )
+        self.games.append(self._current)
+        return len(self.games) - 1
+
+    def record(
+        self, state: Union[CompactState, GameState], move: Union[int, MoveAction]
+    ) -> None:
+        """Write ``state`` (before the move) and the move made in it."""
+
+        if self._current is None:
+            raise RuntimeError("No game in progress; call begin_game first.")
+        state = self._compact(state)
+        if not isinstance(move, int):
+            code = encode_move(state, move)
+            if code is None:
+                raise ValueError(f"Move {move!r} has no encoding in this state.")
+            move = code
+        _pack_record(self._buffer, 0, state, move)
+        self._file.write(self._buffer)
+        self._current.count += 1
+        self.records += 1
+
+    def end_game(self, state: Union[CompactState, GameState]) -> None:
+        """Store the outcome from the game's final ``state``."""
+
+        if self._current is None:
+            raise RuntimeError("No game in progress.")
+        self._current.finish(self._compact(state))
+        self._current = None
+
+    def append(self, recording: GameRecording) -> int:
+        """Write a whole recorded game; returns its index."""
+
+        if self._current is not None:
+            raise RuntimeError("A game is in progress; end it first.")
+        if recording.num_players != self.num_players:
+            raise ValueError(
+                f"Recording has {recording.num_players} players, log has {self.num_players}."
+            )
+        game = recording.game
+        game.offset = self._file.tell()
+        game.first = self.records
+        self._file.write(recording.data)
+        self.games.append(game)
+        self.records += game.count
+        return len(self.games) - 1
+
+    def close(self) -> None:
+        """Write the index footer, point the preamble at it and close the file.
+
+        The footer is on disk before the preamble is repointed, so the file
+        always has one complete index.
+        """
+
+        if self._file.closed:
+            return
+        footer = dumps(
+            {"version": VERSION, "games": [g.as_dict() for g in self.games]}
+        ).encode()
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(footer)
+        self._sync()
+        self._file.seek(_FOOTER_POINTER_OFFSET)
+        self._file.write(_FOOTER_POINTER.pack(offset, len(footer)))
+        self._sync()
+        self._file.close()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _compact(self, state: Union[CompactState, GameState]) -> CompactState:
+        if isinstance(state, GameState):
+            state = CompactState.from_game_state(state)
+        if state.num_players != self.num_players:
+            raise ValueError(
+                f"State has {state.num_players} players, log has {self.num_players}."
+            )
+        return state
+
+
+@dataclass
+class LogRecord:
+    game: int
+    # Position of the move within its game.
+    ply: int
+    move: int
+    state: CompactState
+
+    @property
+    def action(self) -> MoveAction:
+        return decode_move(self.state, self.move)
+
+    def to_game_state(self) -> GameState:
+        return self.state.to_game_state()
+
+
+class GameLogReader:
+    """Random access to a log's records through a read-only memory map."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _PREAMBLE.size:
+                raise ValueError(f"{self.path} is not a game log.")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.num_players, self.record_size, offset, length = (
+            _PREAMBLE.unpack_from(self._map)
+        )
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{self.path} is not a version {VERSION} game log.")
+        if offset + length > size:
+            self._map.close()
+            raise ValueError(f"{self.path} is truncated; its index footer is missing.")
+
+        # A log whose first writer never closed has no footer yet: no games.
+        footer = loads(self._map[offset : offset + length]) if length else {"games": []}
+        self.games = [
+            LoggedGame(
+                layout=g["layout"],
+                offset=g["offset"],
+                first=g["first"],
+                count=g["count"],
+                winner=g["winner"],
+                victory_points=g["victory_points"],
+                turns=g["turns"],
+                info=g["info"],
+            )
+            for g in footer["games"]
+        ]
+        self._firsts = [g.first for g in self.games]
+        self._records = self.games[-1].first + self.games[-1].count if self.games else 0
+
+    def __enter__(self) -> "GameLogReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __len__(self) -> int:
+        return self._records
+
+    def __getitem__(self, index: int) -> LogRecord:
+        index = self._check(index)
+        g = self.game_of(index)
+        game = self.games[g]
+        offset = game.offset + (index - game.first) * self.record_size
+        return LogRecord(
+            game=g,
+            ply=index - game.first,
+            move=_MOVE.unpack_from(self._map, offset)[0],
+            state=CompactState.unpack(game.header, self._map, offset + _MOVE.size),
+        )
+
+    def __iter__(self) -> Iterator[LogRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def game_of(self, index: int) -> int:
+        """Index of the game record ``index`` belongs to."""
+
+        return bisect_right(self._firsts, self._check(index)) - 1
+
+    def game_records(self, game: int) -> range:
+        """Record indices of one game, in move order."""
+
+        entry = self.games[game]
+        return range(entry.first, entry.first + entry.count)
+
+    def move(self, index: int) -> int:
+        """Just the move code of record ``index``; the state is not decoded."""
+
+        return _MOVE.unpack_from(self._map, self._offset(self._check(index)))[0]
+
+    def moves(self) -> Iterator[Tuple[int, int]]:
+        """``(game, move code)`` for every record, without decoding states."""
+
+        size = self.record_size
+        for g, game in enumerate(self.games):
+            offset = game.offset
+            for _ in range(game.count):
+                yield g, _MOVE.unpack_from(self._map, offset)[0]
+                offset += size
+
+    def state(self, index: int) -> CompactState:
+        return self[index].state
+
+    def game_state(self, index: int) -> GameState:
+        """Record ``index``'s state as a ``GameState``."""
+
+        return self[index].to_game_state()
+
+    def _offset(self, index: int) -> int:
+        game = self.games[self.game_of(index)]
+        return game.offset + (index - game.first) * self.record_size
+
+    def _check(self, index: int) -> int:
+        if index < 0:
+            index += self._records
+        if not 0 <= index < self._records:
+            raise IndexError("Record index out of range.")
+        return index
@@ -0,0 +1,361 @@
+"""
+Batching gateway in front of Ollama.
+
+Many games asking for moves at once would each open their own request, and
+Ollama only runs ``OLLAMA_NUM_PARALLEL`` of them at a time per model, queueing
+the rest out of sight. ``BatchingGateway`` takes over that queue: requests
+wait in one FIFO, a dispatcher collects them into batches (up to
+``max_batch_size``, or whatever arrived within ``window_seconds`` of the
+first), and a batch is only released when inference slots are free, so
+Ollama is kept at exactly ``parallel`` requests in flight. Queue depth,
+batch sizes and waiting times are reported by ``stats``.
+
+The gateway speaks the same ``POST /v1/chat/completions`` as Ollama, so
+clients only change their ``base_url``; answers are relayed whole, so requests
+with ``"stream": true`` are rejected with 400. ``GET /metrics`` returns the
+stats as JSON:
+
+    catan-bot gateway --port 11500 --parallel 4
+    OllamaConfig(base_url="http://127.0.0.1:11500")
+
+Games in the same process can call ``BatchingGateway.choose_move`` directly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import statistics
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from .jsonio import dumps, loads
+from .models import GameState, ModelMoveResponse
+from .ollama_client import OllamaConfig, build_chat_request, parse_chat_response
+from .prompt import PromptSession
+
+DEFAULT_PARALLEL = 4
+# Waiting times kept for the percentiles.
+_WAIT_SAMPLES = 4096
+
+
+def ollama_num_parallel(default: int = DEFAULT_PARALLEL) -> int:
+    """Ollama's ``OLLAMA_NUM_PARALLEL`` from the environment, if set."""
+
+    try:
+        return max(1, int(os.environ["OLLAMA_NUM_PARALLEL"]))
+    except (KeyError, ValueError):
+        return default
+
+
+@dataclass
+class GatewayConfig:
+    upstream_url: str = "http://localhost:11434"
+    # Requests sent to Ollama at once; match OLLAMA_NUM_PARALLEL.
+    parallel: int = field(default_factory=ollama_num_parallel)
+    max_batch_size: int = 8
+    # How long the first request of a batch waits for company.
+    window_seconds: float = 0.005
+    # Requests beyond this many queued are refused (HTTP 503).
+    max_queue: int = 1024
+    timeout_seconds: float = 120.0
+
+
+@dataclass
+class GatewayStats:
+    requests: int = 0
+    completed: int = 0
+    errors: int = 0
+    rejected: int = 0
+    batches: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    in_flight: int = 0
+    batch_sizes: Counter = field(default_factory=Counter)
+    # Seconds from arrival until sent to Ollama, most recent last.
+    waits: Deque[float] = field(default_factory=lambda: deque(maxlen=_WAIT_SAMPLES))
+
+    @property
+    def mean_batch_size(self) -> float:
+        total = sum(size * n for size, n in self.batch_sizes.items())
+        return total / self.batches if self.batches else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        waits = sorted(self.waits)
+
+        def pick(q: float) -> float:
+            return round(1000 * waits[min(len(waits) - 1, int(q * len(waits)))], 3)
+
+        return {
+            "requests": self.requests,
+            "completed": self.completed,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+            "batches": self.batches,
+            "mean_batch_size": round(self.mean_batch_size, 2),
+            "batch_sizes": {str(k): v for k, v in sorted(self.batch_sizes.items())},
+            "wait_ms": {
+                "p50": round(1000 * statistics.median(waits), 3) if waits else 0.0,
+                "p95": pick(0.95) if waits else 0.0,
+                "max": round(1000 * waits[-1], 3) if waits else 0.0,
+            },
+        }
+
+
+class GatewayFull(RuntimeError):
+    """The queue already holds ``max_queue`` requests."""
+
+
+# (chat payload, future for the response body, arrival time)
+_Pending = Tuple[Dict[str, Any], "asyncio.Future[Dict[str, Any]]", float]
+
+
+class BatchingGateway:
+    """Queue, batch and rate-limit chat requests to one Ollama server."""
+
+    def __init__(self, config: Optional[GatewayConfig] = None) -> None:
+        self.config = config or GatewayConfig()
+        self.stats = GatewayStats()
+        self._queue: "asyncio.Queue[_Pending]" = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.config.parallel)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._tasks: set = set()
+
+    async def __aenter__(self) -> "BatchingGateway":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def start(self) -> None:
+        self._client = httpx.AsyncClient(
+            base_url=self.config.upstream_url,
+            timeout=self.config.timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=self.config.parallel,
+                max_keepalive_connections=self.config.parallel,
+            ),
+        )
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def submit(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue one chat completion payload and return Ollama's response body.
+
+        Raises ``RuntimeError`` if the gateway is not started and ``ValueError``
+        for a streaming request.
+        """
+
+        if self._dispatcher is None:
+            raise RuntimeError("BatchingGateway.start() has not been called.")
+        if payload.get("stream"):
+            raise ValueError("The gateway does not relay streamed completions.")
+        if self._queue.qsize() >= self.config.max_queue:
+            self.stats.rejected += 1
+            raise GatewayFull(f"Gateway queue is full ({self.config.max_queue} requests).")
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        payload = {**payload, "stream": False}
+        self._queue.put_nowait((payload, future, time.perf_counter()))
+        self.stats.requests += 1
+        self._update_depth()
+        return await future
+
+    async def choose_move(
+        self,
+        game_state: GameState,
+        config: Optional[OllamaConfig] = None,
+        session: Optional[PromptSession] = None,
+    ) -> ModelMoveResponse:
+        """``AsyncOllamaClient.choose_move`` through the gateway's queue."""
+
+        payload, menu = build_chat_request(config or OllamaConfig(), game_state, session)
+        # Answers are relayed whole; a streaming config is answered in one piece.
+        payload["stream"] = False
+        move = parse_chat_response(await self.submit(payload), menu)
+        if session is not None:
+            session.commit(payload["messages"][-1]["content"], move)
+        return move
+
+    def _update_depth(self) -> None:
+        depth = self._queue.qsize()
+        self.stats.queue_depth = depth
+        if depth > self.stats.max_queue_depth:
+            self.stats.max_queue_depth = depth
+
+    async def _dispatch(self) -> None:
+        window = self.config.window_seconds
+        while True:
+            # Hold a free slot before taking the head of the queue, so
+            # requests wait here rather than inside Ollama.
+            await self._slots.acquire()
+            batch: List[_Pending] = [await self._queue.get()]
+            deadline = time.perf_counter() + window
+            while len(batch) < self.config.max_batch_size and not self._slots.locked():
+                remaining = deadline - time.perf_counter()
+                try:
+                    if self._queue.empty() and remaining > 0:
+                        item = await asyncio.wait_for(self._queue.get(), remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                await self._slots.acquire()
+                batch.append(item)
+            self._update_depth()
+            self.stats.batches += 1
+            self.stats.batch_sizes[len(batch)] += 1
+            now = time.perf_counter()
+            for payload, future, arrived in batch:
+                self.stats.waits.append(now - arrived)
+                task = asyncio.create_task(self._forward(payload, future))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _forward(
+        self, payload: Dict[str, Any], future: "asyncio.Future[Dict[str, Any]]"
+    ) -> None:
+        self.stats.in_flight += 1
+        try:
+            if future.cancelled():
+                return
+            assert self._client is not None
+            resp = await self._client.post(
+                "/v1/chat/completions",
+                content=dumps(payload),
+                headers={"Content-Type": "application/json"},
+            )
+            resp.raise_for_status()
+            body = loads(resp.content)
+        except Exception as exc:
+            self.stats.errors += 1
+            if not future.done():
+                future.set_exception(exc)
+        else:
+            self.stats.completed += 1
+            if not future.done():
+                future.set_result(body)
+        finally:
+            self.stats.in_flight -= 1
+            self._slots.release()
+
+
+# ----------------------------------------------------------------------
+# HTTP front end
+# ----------------------------------------------------------------------
+
+
+async def serve(
+    gateway: BatchingGateway, host: str = "127.0.0.1", port: int = 11500
+) -> asyncio.AbstractServer:
+    """Start answering HTTP on ``host:port`` (port 0 picks a free one)."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while await _handle_request(gateway, reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def _handle_request(
+    gateway: BatchingGateway, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> bool:
+    """Answer one request; returns whether to keep the connection open."""
+
+    request_line = await reader.readline()
+    if not request_line:
+        return False
+    try:
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        await _respond(writer, 400, {"error": "Malformed request line."}, keep_alive=False)
+        return False
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        length = -1
+    if length < 0:
+        await _respond(writer, 400, {"error": "Malformed Content-Length."}, keep_alive=False)
+        return False
+    body = await reader.readexactly(length)
+    keep_alive = headers.get("connection", "").lower() != "close"
+
+    if method == "GET" and path == "/metrics":
+        await _respond(writer, 200, gateway.stats.as_dict(), keep_alive)
+    elif method == "POST" and path == "/v1/chat/completions":
+        try:
+            payload = loads(body)
+        except ValueError:
+            await _respond(writer, 400, {"error": "Body is not valid JSON."}, keep_alive)
+            return keep_alive
+        if not isinstance(payload, dict):
+            await _respond(writer, 400, {"error": "Body must be a JSON object."}, keep_alive)
+            return keep_alive
+        if payload.get("stream"):
+            await _respond(writer, 400, {"error": "Streaming is not supported."}, keep_alive)
+            return keep_alive
+        try:
+            result = await gateway.submit(payload)
+        except GatewayFull as exc:
+            await _respond(writer, 503, {"error": str(exc)}, keep_alive)
+        except httpx.HTTPStatusError as exc:
+            await _respond(writer, exc.response.status_code, {"error": str(exc)}, keep_alive)
+        except (httpx.HTTPError, ValueError) as exc:
+            await _respond(writer, 502, {"error": str(exc)}, keep_alive)
+        else:
+            await _respond(writer, 200, result, keep_alive)
+    else:
+        await _respond(writer, 404, {"error": f"No route for {method} {path}."}, keep_alive)
+    return keep_alive
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 502: "Bad Gateway", 503: "Service Unavailable"}
+
+
+async def _respond(
+    writer: asyncio.StreamWriter, status: int, body: Dict[str, Any], keep_alive: bool
+) -> None:
+    data = dumps(body).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode() + data)
+    await writer.drain()
@@ -0,0 +1,59 @@
+"""
+Canonical 64-bit hashing of game states.
+
+The hash is Zobrist-style: every feature of the position (a player holding
+``n`` of a resource, owning a road, the robber's hex, ...) maps to a
+pseudo-random 64-bit key and the state hash is the XOR of its features' keys.
+XOR makes the result independent of list order, so equivalent states hash
+equally even if their players, roads or hexes are listed differently.
+
+Keys are derived with BLAKE2b rather than drawn from a seeded table, so they
+are stable across processes and restarts (needed by the on-disk move cache).
+
+Only features that matter for choosing a move are hashed: player names and
+the turn number are left out, and a resource absent from a player's dict is
+the same as a count of zero.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from functools import lru_cache
+from typing import Hashable, Tuple
+
+from .models import GameState
+
+
+@lru_cache(maxsize=65536)
+def zobrist_key(feature: Tuple[Hashable, ...]) -> int:
+    """Return the 64-bit key for one feature tuple of ints and strings."""
+
+    digest = hashlib.blake2b(repr(feature).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def state_hash(game_state: GameState) -> int:
+    """Order-independent 64-bit hash of a ``GameState``."""
+
+    h = zobrist_key(("current", game_state.current_player_id))
+    h ^= zobrist_key(("phase", game_state.phase.value))
+
+    for player in game_state.players:
+        pid = player.id
+        h ^= zobrist_key(("vp", pid, player.victory_points))
+        for resource, count in player.resources.items():
+            if count:
+                h ^= zobrist_key(("res", pid, resource.value, count))
+        for a, b in player.roads:
+            h ^= zobrist_key(("road", pid, min(a, b), max(a, b)))
+        for node in player.settlements:
+            h ^= zobrist_key(("settlement", pid, node))
+        for node in player.cities:
+            h ^= zobrist_key(("city", pid, node))
+
+    board = game_state.board
+    for tile in board.hexes:
+        resource = tile.resource.value if tile.resource is not None else None
+        h ^= zobrist_key(("hex", tile.id, resource, tile.number_token))
+    h ^= zobrist_key(("robber", board.robber.hex_id))
+    return h
@@ -0,0 +1,49 @@
+"""
+JSON on the hot paths: response bodies, streamed chunks and prompts.
+
+Uses orjson when it is installed (``pip install orjson``) and the standard
+library otherwise. Either way ``dumps`` writes compact JSON (no spaces), so
+prompts differ at most in how non-ASCII text is escaped.
+
+Models are parsed with ``model_validate_json`` and written with
+``model_dump_json`` instead, which already run in pydantic's Rust core and
+skip the intermediate Python dicts.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Type, TypeVar, Union
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up.
+    orjson = None
+
+HAVE_ORJSON = orjson is not None
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text; raises ``ValueError`` if it is malformed."""
+
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Encode ``obj`` as compact JSON text."""
+
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def parse_model(model: Type[M], data: Union[str, bytes]) -> M:
+    """Validate JSON text straight into ``model``, without building a dict first."""
+
+    return model.model_validate_json(data)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import Dict, List, Literal, Optional, Tuple
+from typing import Annotated, Any, Dict, List, Literal, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Discriminator, Field, Tag
 
 
 class Resource(str, Enum):
@@ -108,7 +108,34 @@ class EndTurnAction(BaseModel):
     type: Literal["end_turn"] = "end_turn"
 
 
-MoveAction = BuildAction | TradeAction | RobberAction | EndTurnAction
+def _action_tag(value: Any) -> Optional[str]:
+    """The ``type`` of an action, inferred from its fields if the model left it out."""
+
+    if isinstance(value, dict):
+        tag = value.get("type")
+        if tag is not None:
+            return tag
+        if "build_type" in value:
+            return "build"
+        if "trade_type" in value:
+            return "trade"
+        if "target_hex_id" in value:
+            return "move_robber"
+        return "end_turn"
+    return getattr(value, "type", None)
+
+
+# Tagged by ``type``, so validation goes straight to the matching model
+# instead of trying each in turn.
+MoveAction = Annotated[
+    Union[
+        Annotated[BuildAction, Tag("build")],
+        Annotated[TradeAction, Tag("trade")],
+        Annotated[RobberAction, Tag("move_robber")],
+        Annotated[EndTurnAction, Tag("end_turn")],
+    ],
+    Discriminator(_action_tag),
+]
 
 
 class ModelMoveResponse(BaseModel):
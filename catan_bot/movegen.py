@@ -0,0 +1,449 @@
+"""
+Legal move generation.
+
+Moves are generated for the current player of a :class:`CompactState` as small
+integer codes (``kind << 16 | payload``) using bitmask occupancy and adjacency
+tables from :mod:`catan_bot.topology`, then decoded into
+``MoveAction`` models only when needed.
+
+Phases are interpreted as follows:
+
+- ``START_OF_TURN`` / ``END_OF_TURN``: only ``end_turn``.
+- ``AFTER_ROLL``: a 7 was rolled and the robber must move; only robber moves.
+- ``MAIN_ACTION``: builds, trades and ``end_turn``.
+
+Player trades are enumerated as 1:1 swaps the opponent can actually pay.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from . import topology
+from .compact import (
+    NUM_RESOURCES,
+    PHASE_INDEX,
+    RESOURCE_INDEX,
+    RESOURCES,
+    CompactState,
+    iter_bits,
+)
+from .models import (
+    BuildAction,
+    BuildType,
+    EndTurnAction,
+    GameState,
+    MoveAction,
+    RobberAction,
+    TradeAction,
+    TradeType,
+    TurnPhase,
+)
+from .topology import DISTANCE_MASK, EDGE_NODES_MASK, NODE_EDGES_MASK
+
+KIND_END_TURN = 0
+KIND_ROAD = 1
+KIND_SETTLEMENT = 2
+KIND_CITY = 3
+KIND_DEV_CARD = 4
+KIND_BANK_TRADE = 5
+KIND_PLAYER_TRADE = 6
+KIND_ROBBER = 7
+
+_KIND_SHIFT = 16
+_PAYLOAD_MASK = (1 << _KIND_SHIFT) - 1
+
+END_TURN = KIND_END_TURN
+DEV_CARD = KIND_DEV_CARD << _KIND_SHIFT
+
+# Resource costs in RESOURCES order: brick, lumber, wool, grain, ore.
+ROAD_COST: Tuple[int, ...] = (1, 1, 0, 0, 0)
+SETTLEMENT_COST: Tuple[int, ...] = (1, 1, 1, 1, 0)
+CITY_COST: Tuple[int, ...] = (0, 0, 0, 2, 3)
+DEV_CARD_COST: Tuple[int, ...] = (0, 0, 1, 1, 1)
+
+MAX_ROADS = 15
+MAX_SETTLEMENTS = 5
+MAX_CITIES = 4
+
+BANK_TRADE_RATIO = 4
+
+# Location used for development card purchases, which have no board position.
+DEV_CARD_LOCATION = "deck"
+
+_MAIN_ACTION = PHASE_INDEX[TurnPhase.MAIN_ACTION]
+_AFTER_ROLL = PHASE_INDEX[TurnPhase.AFTER_ROLL]
+
+
+_ALL_RESOURCES = (1 << NUM_RESOURCES) - 1
+
+# _PAIRS[give][receive_mask]: trade payloads ``give << 4 | receive`` for every
+# resource in ``receive_mask`` other than ``give``.
+_PAIRS: Tuple[Tuple[Tuple[int, ...], ...], ...] = tuple(
+    tuple(
+        tuple((give << 4) | r for r in range(NUM_RESOURCES) if r != give and mask >> r & 1)
+        for mask in range(1 << NUM_RESOURCES)
+    )
+    for give in range(NUM_RESOURCES)
+)
+
+
+def make_move(kind: int, payload: int = 0) -> int:
+    return (kind << _KIND_SHIFT) | payload
+
+
+def move_kind(code: int) -> int:
+    return code >> _KIND_SHIFT
+
+
+def move_payload(code: int) -> int:
+    return code & _PAYLOAD_MASK
+
+
+def can_afford(state: CompactState, player: int, cost: Sequence[int]) -> bool:
+    base = player * NUM_RESOURCES
+    resources = state.resources
+    for k in range(NUM_RESOURCES):
+        if resources[base + k] < cost[k]:
+            return False
+    return True
+
+
+def occupied_nodes(state: CompactState) -> int:
+    mask = 0
+    for s, c in zip(state.settlements, state.cities):
+        mask |= s | c
+    return mask
+
+
+def occupied_edges(state: CompactState) -> int:
+    mask = 0
+    for r in state.roads:
+        mask |= r
+    return mask
+
+
+def road_nodes(roads: int) -> int:
+    """Return the mask of nodes touched by a mask of edges."""
+
+    mask = 0
+    for e in iter_bits(roads):
+        mask |= EDGE_NODES_MASK[e]
+    return mask
+
+
+def road_candidates(state: CompactState, player: int) -> int:
+    """Edges where ``player`` may place a road, ignoring cost."""
+
+    own_buildings = state.settlements[player] | state.cities[player]
+    other_buildings = occupied_nodes(state) & ~own_buildings
+    frontier = (road_nodes(state.roads[player]) & ~other_buildings) | own_buildings
+    mask = 0
+    for n in iter_bits(frontier):
+        mask |= NODE_EDGES_MASK[n]
+    return mask & ~occupied_edges(state)
+
+
+def settlement_candidates(state: CompactState, player: int) -> int:
+    """Nodes where ``player`` may place a settlement, ignoring cost."""
+
+    blocked = 0
+    for n in iter_bits(occupied_nodes(state)):
+        blocked |= DISTANCE_MASK[n]
+    return road_nodes(state.roads[player]) & ~blocked
+
+
+def robber_victims(state: CompactState, hex_id: int) -> List[int]:
+    """Opponents of the current player with a building on ``hex_id`` and cards to steal."""
+
+    nodes = state.header.topology.nodes_of(hex_id)
+    if not nodes:
+        return []
+    victims = []
+    for p in range(state.num_players):
+        if p == state.current:
+            continue
+        if (state.settlements[p] | state.cities[p]) & nodes and any(state.hand(p)):
+            victims.append(p)
+    return victims
+
+
+def legal_move_codes(state: CompactState) -> List[int]:
+    """Return the codes of every legal move for the current player."""
+
+    if state.phase == _AFTER_ROLL:
+        return _robber_codes(state)
+    if state.phase != _MAIN_ACTION:
+        return [END_TURN]
+
+    player = state.current
+    codes = [END_TURN]
+    codes += road_codes(state, player)
+    codes += building_codes(state, player)
+    if can_afford(state, player, DEV_CARD_COST):
+        codes.append(DEV_CARD)
+    codes += bank_trade_codes(state, player)
+    codes += player_trade_codes(state, player)
+    return codes
+
+
+def road_codes(state: CompactState, player: int) -> List[int]:
+    """Roads ``player`` can build now: affordable, placeable and under the piece limit."""
+
+    if not can_afford(state, player, ROAD_COST) or state.roads[player].bit_count() >= MAX_ROADS:
+        return []
+    road = KIND_ROAD << _KIND_SHIFT
+    return [road | e for e in iter_bits(road_candidates(state, player))]
+
+
+def building_codes(state: CompactState, player: int) -> List[int]:
+    """Settlements, then cities, that ``player`` can build now."""
+
+    codes: List[int] = []
+    if (
+        can_afford(state, player, SETTLEMENT_COST)
+        and state.settlements[player].bit_count() < MAX_SETTLEMENTS
+    ):
+        settlement = KIND_SETTLEMENT << _KIND_SHIFT
+        codes += [settlement | n for n in iter_bits(settlement_candidates(state, player))]
+
+    if can_afford(state, player, CITY_COST) and state.cities[player].bit_count() < MAX_CITIES:
+        city = KIND_CITY << _KIND_SHIFT
+        codes += [city | n for n in iter_bits(state.settlements[player])]
+    return codes
+
+
+def bank_trade_codes(state: CompactState, player: int) -> List[int]:
+    """Bank trades ``player`` can make now."""
+
+    resources = state.resources
+    base = player * NUM_RESOURCES
+    bank = (KIND_BANK_TRADE << _KIND_SHIFT) | (BANK_TRADE_RATIO << 8)
+    codes: List[int] = []
+    for give in range(NUM_RESOURCES):
+        if resources[base + give] >= BANK_TRADE_RATIO:
+            codes += [bank | pair for pair in _PAIRS[give][_ALL_RESOURCES]]
+    return codes
+
+
+def player_trade_codes(state: CompactState, player: int) -> List[int]:
+    """1:1 trades with opponents that ``player`` and the opponent can both pay."""
+
+    resources = state.resources
+    base = player * NUM_RESOURCES
+    held = 0
+    for give in range(NUM_RESOURCES):
+        if resources[base + give]:
+            held |= 1 << give
+    if not held:
+        return []
+
+    codes: List[int] = []
+    trade = KIND_PLAYER_TRADE << _KIND_SHIFT
+    for other in range(state.num_players):
+        if other == player:
+            continue
+        other_base = other * NUM_RESOURCES
+        other_held = 0
+        for receive in range(NUM_RESOURCES):
+            if resources[other_base + receive]:
+                other_held |= 1 << receive
+        if not other_held:
+            continue
+        prefix = trade | (other << 8)
+        for give in iter_bits(held):
+            codes += [prefix | pair for pair in _PAIRS[give][other_held]]
+    return codes
+
+
+def _robber_codes(state: CompactState) -> List[int]:
+    robber = KIND_ROBBER << _KIND_SHIFT
+    board = state.header.topology
+    # Opponents who could be robbed, with their building masks; see robber_victims.
+    targets = [
+        (p, state.settlements[p] | state.cities[p])
+        for p in range(state.num_players)
+        if p != state.current and any(state.hand(p))
+    ]
+    codes = []
+    for hex_id in state.header.hex_ids:
+        if hex_id == state.robber_hex_id:
+            continue
+        nodes = board.nodes_of(hex_id)
+        victims = [p for p, buildings in targets if buildings & nodes]
+        if victims:
+            codes += [robber | (hex_id << 8) | (v + 1) for v in victims]
+        else:
+            codes.append(robber | (hex_id << 8))
+    return codes
+
+
+# ----------------------------------------------------------------------
+# Codes <-> MoveAction
+# ----------------------------------------------------------------------
+
+
+def node_location(node: int) -> str:
+    return f"node_{node + 1}"
+
+
+def edge_location(edge: int) -> str:
+    a, b = topology.edge_node_ids(edge)
+    return f"edge_{a}_{b}"
+
+
+_LOCATION_RE = re.compile(r"^\s*(node|edge)_(\d+)(?:_(\d+))?\s*$")
+
+
+def parse_location(location: str) -> Tuple[str, int]:
+    """Parse ``'node_12'`` / ``'edge_5_6'`` into ``('node', index)`` / ``('edge', index)``.
+
+    Raises ``ValueError`` for malformed or off-board locations.
+    """
+
+    match = _LOCATION_RE.match(location)
+    if match is None:
+        raise ValueError(f"Unrecognised location {location!r}.")
+    kind, first, second = match.groups()
+    if kind == "node":
+        if second is not None:
+            raise ValueError(f"Unrecognised location {location!r}.")
+        node_id = int(first)
+        if not 1 <= node_id <= topology.NUM_NODES:
+            raise ValueError(f"Node {node_id} is not on the board.")
+        return "node", node_id - 1
+    if second is None:
+        raise ValueError(f"Unrecognised location {location!r}.")
+    return "edge", topology.edge_index(int(first), int(second))
+
+
+def decode_move(state: CompactState, code: int) -> MoveAction:
+    """Turn a move code into the equivalent ``MoveAction``."""
+
+    kind, payload = code >> _KIND_SHIFT, code & _PAYLOAD_MASK
+    if kind == KIND_END_TURN:
+        return EndTurnAction()
+    if kind == KIND_ROAD:
+        return BuildAction(build_type=BuildType.ROAD, location=edge_location(payload))
+    if kind == KIND_SETTLEMENT:
+        return BuildAction(build_type=BuildType.SETTLEMENT, location=node_location(payload))
+    if kind == KIND_CITY:
+        return BuildAction(build_type=BuildType.CITY, location=node_location(payload))
+    if kind == KIND_DEV_CARD:
+        return BuildAction(
+            build_type=BuildType.DEVELOPMENT_CARD, location=DEV_CARD_LOCATION
+        )
+    if kind == KIND_BANK_TRADE:
+        ratio, give, receive = payload >> 8, (payload >> 4) & 0xF, payload & 0xF
+        return TradeAction(
+            trade_type=TradeType.BANK,
+            give={RESOURCES[give]: ratio},
+            receive={RESOURCES[receive]: 1},
+        )
+    if kind == KIND_PLAYER_TRADE:
+        other, give, receive = payload >> 8, (payload >> 4) & 0xF, payload & 0xF
+        return TradeAction(
+            trade_type=TradeType.PLAYER,
+            target_player_id=state.header.player_ids[other],
+            give={RESOURCES[give]: 1},
+            receive={RESOURCES[receive]: 1},
+        )
+    if kind == KIND_ROBBER:
+        victim = (payload & 0xFF) - 1
+        return RobberAction(
+            target_hex_id=payload >> 8,
+            steal_from_player_id=None if victim < 0 else state.header.player_ids[victim],
+        )
+    raise ValueError(f"Unknown move code {code}.")
+
+
+def encode_move(state: CompactState, action: MoveAction) -> Optional[int]:
+    """Return the code for ``action``, or ``None`` if it has no code.
+
+    Actions without a code (malformed locations, multi-resource trades, ...)
+    are never produced by :func:`legal_move_codes`.
+    """
+
+    if isinstance(action, EndTurnAction):
+        return END_TURN
+
+    if isinstance(action, BuildAction):
+        if action.build_type is BuildType.DEVELOPMENT_CARD:
+            return DEV_CARD
+        try:
+            kind, index = parse_location(action.location)
+        except ValueError:
+            return None
+        if action.build_type is BuildType.ROAD:
+            return make_move(KIND_ROAD, index) if kind == "edge" else None
+        if kind != "node":
+            return None
+        if action.build_type is BuildType.SETTLEMENT:
+            return make_move(KIND_SETTLEMENT, index)
+        return make_move(KIND_CITY, index)
+
+    if isinstance(action, TradeAction):
+        if len(action.give) != 1 or len(action.receive) != 1:
+            return None
+        (give, give_count), = action.give.items()
+        (receive, receive_count), = action.receive.items()
+        if receive_count != 1:
+            return None
+        give_idx, receive_idx = RESOURCE_INDEX[give], RESOURCE_INDEX[receive]
+        if action.trade_type is TradeType.BANK:
+            # The count occupies the payload's high byte; anything outside it
+            # would alias another code (256 brick encoding as 0 brick).
+            if not 1 <= give_count <= 0xFF:
+                return None
+            return make_move(
+                KIND_BANK_TRADE, (give_count << 8) | (give_idx << 4) | receive_idx
+            )
+        if action.trade_type is TradeType.PLAYER and give_count == 1:
+            if action.target_player_id not in state.header.player_ids:
+                return None
+            other = state.player_index(action.target_player_id)
+            if not 0 <= other <= 0xFF:
+                return None
+            return make_move(
+                KIND_PLAYER_TRADE, (other << 8) | (give_idx << 4) | receive_idx
+            )
+        return None
+
+    if isinstance(action, RobberAction):
+        victim = 0
+        if action.steal_from_player_id is not None:
+            if action.steal_from_player_id not in state.header.player_ids:
+                return None
+            victim = state.player_index(action.steal_from_player_id) + 1
+        if not 0 <= action.target_hex_id <= 0xFF or victim > 0xFF:
+            return None
+        return make_move(KIND_ROBBER, (action.target_hex_id << 8) | victim)
+
+    return None
+
+
+# ----------------------------------------------------------------------
+# GameState-level helpers
+# ----------------------------------------------------------------------
+
+
+def legal_moves(game_state: GameState) -> List[MoveAction]:
+    """Return every legal ``MoveAction`` for the current player."""
+
+    state = CompactState.from_game_state(game_state)
+    return [decode_move(state, code) for code in legal_move_codes(state)]
+
+
+def is_legal(game_state: GameState, action: MoveAction) -> bool:
+    """Whether ``action`` is among the moves returned by :func:`legal_moves`."""
+
+    state = CompactState.from_game_state(game_state)
+    code = encode_move(state, action)
+    return code is not None and code in legal_move_codes(state)
+
+
+def moves_by_code(state: CompactState) -> Dict[int, MoveAction]:
+    """Map each legal move code to its decoded ``MoveAction``."""
+
+    return {code: decode_move(state, code) for code in legal_move_codes(state)}
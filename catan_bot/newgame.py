@@ -0,0 +1,109 @@
+"""
+Random starting positions on the standard board.
+
+``random_game_state`` shuffles the standard 19 tiles and number tokens and
+plays the opening placement round (settlement + road, twice, in snake order),
+so the result is the state at the start of the first regular turn.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Optional, Sequence
+
+from . import topology
+from .board import board_topology
+from .compact import iter_bits
+from .models import (
+    BoardState,
+    GameState,
+    HexTile,
+    Player,
+    Resource,
+    RobberState,
+    TurnPhase,
+)
+
+STANDARD_RESOURCES: Sequence[Optional[Resource]] = (
+    [Resource.LUMBER] * 4
+    + [Resource.WOOL] * 4
+    + [Resource.GRAIN] * 4
+    + [Resource.BRICK] * 3
+    + [Resource.ORE] * 3
+    + [None]
+)
+STANDARD_TOKENS: Sequence[int] = (2, 3, 3, 4, 4, 5, 5, 6, 6, 8, 8, 9, 9, 10, 10, 11, 11, 12)
+
+DEFAULT_NAMES = ("Red", "Blue", "White", "Orange")
+
+
+def random_board(rng: random.Random) -> BoardState:
+    resources = list(STANDARD_RESOURCES)
+    tokens = list(STANDARD_TOKENS)
+    rng.shuffle(resources)
+    rng.shuffle(tokens)
+    hexes = []
+    desert = 1
+    for i, resource in enumerate(resources):
+        hex_id = i + 1
+        if resource is None:
+            desert = hex_id
+            hexes.append(HexTile(id=hex_id, resource=None, number_token=None))
+        else:
+            hexes.append(HexTile(id=hex_id, resource=resource, number_token=tokens.pop()))
+    return BoardState(hexes=hexes, robber=RobberState(hex_id=desert))
+
+
+def random_game_state(
+    num_players: int = 4,
+    rng: Optional[random.Random] = None,
+    names: Optional[Sequence[str]] = None,
+) -> GameState:
+    """A fresh game after the opening placements, ready for player 1 to roll.
+
+    Opening settlements are drawn at random from the legal nodes, weighted by
+    the pips of their surrounding hexes.
+    """
+
+    rng = rng or random.Random()
+    names = list(names or DEFAULT_NAMES[:num_players])
+    board = random_board(rng)
+
+    layout = board_topology(board)
+    tiles = {tile.id: tile for tile in board.hexes}
+
+    players = [
+        Player(id=i + 1, name=names[i], resources={r: 0 for r in Resource})
+        for i in range(num_players)
+    ]
+    blocked = 0
+    taken_edges = 0
+    order = list(range(num_players)) + list(reversed(range(num_players)))
+    for round_index, p in enumerate(order):
+        free = [n for n in range(topology.NUM_NODES) if not blocked >> n & 1]
+        node = rng.choices(free, weights=[layout.node_pips[n] + 1 for n in free])[0]
+        blocked |= topology.DISTANCE_MASK[node]
+        edge = rng.choice(list(iter_bits(topology.NODE_EDGES_MASK[node] & ~taken_edges)))
+        taken_edges |= 1 << edge
+
+        player = players[p]
+        player.settlements.append(node + 1)
+        player.roads.append(topology.edge_node_ids(edge))
+        player.victory_points += 1
+        if round_index >= num_players:
+            for hex_id in layout.node_hexes[node]:
+                tile = tiles[hex_id]
+                if tile.resource is not None:
+                    player.resources[tile.resource] += 1
+
+    for player in players:
+        player.settlements.sort()
+        player.roads.sort(key=lambda edge: topology.edge_index(*edge))
+
+    return GameState(
+        players=players,
+        current_player_id=1,
+        board=board,
+        turn_number=1,
+        phase=TurnPhase.START_OF_TURN,
+    )
@@ -1,12 +1,20 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from .models import GameState, ModelMoveResponse
+from .cache import MoveCache, decision_key
+from .evaluate import ScoredMove, rank_moves
+from .jsonio import loads, parse_model
+from .models import GameState, ModelMoveResponse, MoveAction
+from .movegen import legal_moves
+from .prompt import COMPACT_LEGEND, PromptSession, dumps, encode_state
+from .schema import response_format
+from .streaming import MoveStreamParser
 
 
 @dataclass
@@ -14,8 +22,71 @@ class OllamaConfig:
     """Configuration for talking to Ollama."""
 
     model: str = "gpt-oss"
+    # Sampling temperature; None leaves the model's default.
+    temperature: Optional[float] = None
     base_url: str = "http://localhost:11434"
     timeout_seconds: int = 60
+    connect_timeout_seconds: float = 5.0
+    # Connection pool: one pool per host, each keeping up to pool_maxsize
+    # keep-alive connections.
+    pool_connections: int = 1
+    pool_maxsize: int = 10
+    # Retries for connection errors and 502/503/504 (never read timeouts),
+    # with exponential backoff
+    # (retry_backoff_seconds * 2 ** (attempt - 1)).
+    max_retries: int = 2
+    retry_backoff_seconds: float = 0.5
+    # Stream the completion and stop as soon as a complete ModelMoveResponse
+    # object has arrived, abandoning the rest of the generation.
+    stream: bool = False
+    # Maximum in-flight requests per AsyncOllamaClient.
+    max_concurrency: int = 16
+    # Send states in the short-key encoding of catan_bot.prompt (and, with a
+    # PromptSession, as deltas against the previous turn).
+    compact_prompt: bool = False
+    # How long Ollama keeps the model (and its prompt cache, which holds the
+    # shared system prompt prefix) loaded after a request, e.g. "30m".
+    keep_alive: Optional[str] = None
+    # Offer the model a numbered menu of legal moves and reject anything else.
+    offer_legal_moves: bool = False
+    # Constrain generation (Ollama structured outputs) to a JSON schema that
+    # only admits the current legal moves; answers are checked against them.
+    constrain_output: bool = False
+    # Append the top N legal moves by expected value (catan_bot.evaluate) as
+    # hints; 0 disables.
+    candidate_hints: int = 0
+
+
+_RETRY_STATUSES = (502, 503, 504)
+
+
+@dataclass
+class OutputStats:
+    """Model answers received, and those rejected as malformed or illegal."""
+
+    responses: int = 0
+    invalid: int = 0
+
+    @property
+    def invalid_rate(self) -> float:
+        return self.invalid / self.responses if self.responses else 0.0
+
+
+@dataclass
+class PoolStats:
+    """Connection reuse counters aggregated over the session's pools."""
+
+    requests: int
+    connections_opened: int
+    idle_connections: int
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Fraction of requests served on an already-open connection."""
+
+        if not self.requests:
+            return 0.0
+        return max(0.0, 1.0 - self.connections_opened / self.requests)
 
 
 SYSTEM_PROMPT = """You are an AI agent that plays the board game Catan.
@@ -57,42 +128,250 @@ Rules:
 class OllamaClient:
     """Thin wrapper around Ollama's OpenAI-compatible chat endpoint."""
 
-    def __init__(self, config: Optional[OllamaConfig] = None) -> None:
+    def __init__(
+        self, config: Optional[OllamaConfig] = None, cache: Optional[MoveCache] = None
+    ) -> None:
         self.config = config or OllamaConfig()
+        self.cache = cache
+        self.session = _make_session(self.config)
+        self.output_stats = OutputStats()
 
-    def choose_move(self, game_state: GameState) -> ModelMoveResponse:
-        payload: Dict[str, Any] = {
-            "model": self.config.model,
-            "messages": [
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {
-                    "role": "user",
-                    "content": (
-                        "Given the following Catan game state, choose a single move.\n"
-                        "Return only the JSON for ModelMoveResponse.\n"
-                        f"game_state_json: {game_state.model_dump_json()}"
-                    ),
-                },
-            ],
-        }
+    def __enter__(self) -> "OllamaClient":
+        return self
 
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def pool_stats(self) -> PoolStats:
+        """Report how many requests reused a pooled keep-alive connection."""
+
+        requests_made = opened = idle = 0
+        # The same adapter is mounted for http:// and https://.
+        adapters = {id(a): a for a in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                requests_made += pool.num_requests
+                opened += pool.num_connections
+                if pool.pool is not None:
+                    # Free slots are padded with None placeholders.
+                    idle += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+        return PoolStats(
+            requests=requests_made, connections_opened=opened, idle_connections=idle
+        )
+
+    def choose_move(
+        self, game_state: GameState, session: Optional[PromptSession] = None
+    ) -> ModelMoveResponse:
+        """Ask the model for a move.
+
+        With ``config.compact_prompt`` set, pass the same ``session`` for every
+        decision of a game so later turns are sent as deltas.
+        """
+
+        if self.cache is None:
+            return self._request_move(game_state, session)
+        key = cache_key(self.config, game_state)
+        move = self.cache.get(key)
+        if move is None:
+            move = self._request_move(game_state, session)
+            self.cache.put(key, move)
+        return move
+
+    def _request_move(
+        self, game_state: GameState, session: Optional[PromptSession]
+    ) -> ModelMoveResponse:
+        payload, menu = build_chat_request(self.config, game_state, session)
+        move = self._post(payload, menu)
+        if session is not None:
+            session.commit(payload["messages"][-1]["content"], move)
+        return move
+
+    def _post(
+        self, payload: Dict[str, Any], menu: Optional[List[MoveAction]]
+    ) -> ModelMoveResponse:
+        try:
+            move = self._send(payload, menu)
+        except (ValueError, RuntimeError):
+            # Transport errors are neither; these mean the answer was unusable.
+            self.output_stats.responses += 1
+            self.output_stats.invalid += 1
+            raise
+        self.output_stats.responses += 1
+        return move
+
+    def _send(
+        self, payload: Dict[str, Any], menu: Optional[List[MoveAction]]
+    ) -> ModelMoveResponse:
         url = f"{self.config.base_url}/v1/chat/completions"
-        resp = requests.post(url, json=payload, timeout=self.config.timeout_seconds)
-        resp.raise_for_status()
-        data = resp.json()
-
-        # Ollama's OpenAI-compatible API returns choices[0].message.content
-        choices: List[Dict[str, Any]] = data.get("choices", [])
-        if not choices:
-            raise RuntimeError("No choices returned from Ollama.")
-
-        content = choices[0].get("message", {}).get("content")
-        if not isinstance(content, str):
-            raise RuntimeError("Unexpected response content from Ollama.")
-
-        json_str = _extract_json_object(content)
-        parsed = json.loads(json_str)
-        return ModelMoveResponse.model_validate(parsed)
+        resp = self.session.post(
+            url,
+            json=payload,
+            timeout=(self.config.connect_timeout_seconds, self.config.timeout_seconds),
+            stream=self.config.stream,
+        )
+        if not self.config.stream:
+            resp.raise_for_status()
+            return parse_chat_response(loads(resp.content), menu)
+
+        # Closing the response early drops the connection, which makes
+        # Ollama stop generating.
+        with resp:
+            resp.raise_for_status()
+            parser = MoveStreamParser(menu)
+            for line in resp.iter_lines(decode_unicode=True):
+                move = parser.feed_line(line)
+                if move is not None:
+                    return move
+        raise ValueError("No JSON object found in model response.")
+
+
+def cache_key(config: OllamaConfig, game_state: GameState) -> int:
+    """Decision cache key: the state hash combined with answer-affecting options."""
+
+    return decision_key(
+        game_state,
+        config.model,
+        config.temperature,
+        config.offer_legal_moves,
+        config.constrain_output,
+        config.compact_prompt,
+        config.candidate_hints,
+    )
+
+
+def build_chat_request(
+    config: OllamaConfig,
+    game_state: GameState,
+    session: Optional[PromptSession] = None,
+) -> Tuple[Dict[str, Any], Optional[List[MoveAction]]]:
+    """Build the chat completion payload, plus the legal moves answers must be among.
+
+    ``session`` is only used with ``config.compact_prompt``; its history is
+    sent ahead of the new message.
+    """
+
+    menu: Optional[List[MoveAction]] = None
+    history: List[Dict[str, str]] = []
+    if config.compact_prompt:
+        system_prompt = COMPACT_SYSTEM_PROMPT
+        if session is not None:
+            user_content = session.prepare(game_state)
+            history = session.history
+        else:
+            user_content = "state:" + dumps(encode_state(game_state))
+    else:
+        system_prompt = SYSTEM_PROMPT
+        user_content = (
+            "Given the following Catan game state, choose a single move.\n"
+            "Return only the JSON for ModelMoveResponse.\n"
+            f"game_state_json: {game_state.model_dump_json()}"
+        )
+    if config.offer_legal_moves or config.constrain_output:
+        menu = legal_moves(game_state)
+    if config.offer_legal_moves:
+        user_content += "\n" + _format_move_menu(menu)
+    if config.candidate_hints > 0:
+        user_content += "\n" + _format_hints(rank_moves(game_state, config.candidate_hints))
+
+    payload: Dict[str, Any] = {
+        "model": config.model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            *history,
+            {"role": "user", "content": user_content},
+        ],
+    }
+    if config.constrain_output:
+        payload["response_format"] = response_format(menu)
+    if config.temperature is not None:
+        payload["temperature"] = config.temperature
+    if config.stream:
+        payload["stream"] = True
+    if config.keep_alive is not None:
+        payload["keep_alive"] = config.keep_alive
+    return payload, menu
+
+
+def parse_chat_response(
+    data: Dict[str, Any], menu: Optional[List[MoveAction]] = None
+) -> ModelMoveResponse:
+    """Extract and validate the ModelMoveResponse from a chat completion body."""
+
+    # Ollama's OpenAI-compatible API returns choices[0].message.content
+    choices: List[Dict[str, Any]] = data.get("choices", [])
+    if not choices:
+        raise RuntimeError("No choices returned from Ollama.")
+
+    content = choices[0].get("message", {}).get("content")
+    if not isinstance(content, str):
+        raise RuntimeError("Unexpected response content from Ollama.")
+
+    return parse_move_content(content, menu)
+
+
+def parse_move_content(
+    content: str, menu: Optional[List[MoveAction]] = None
+) -> ModelMoveResponse:
+    """Parse the model's message text into a ModelMoveResponse."""
+
+    move = parse_model(ModelMoveResponse, _extract_json_object(content))
+    if menu is not None and move.action not in menu:
+        raise ValueError("Model chose a move that is not in the legal move menu.")
+    return move
+
+
+COMPACT_SYSTEM_PROMPT = SYSTEM_PROMPT + COMPACT_LEGEND + """
+Each user message is a game state (or delta); choose a single move for the
+current player and return only the JSON for ModelMoveResponse.
+"""
+
+
+def _make_session(config: OllamaConfig) -> requests.Session:
+    retry = Retry(
+        total=config.max_retries,
+        backoff_factor=config.retry_backoff_seconds,
+        # A read timeout means the model was already generating; resending
+        # would only queue the same generation again.
+        read=False,
+        status_forcelist=_RETRY_STATUSES,
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _format_move_menu(moves: List[MoveAction]) -> str:
+    """Render legal moves as a numbered list the model must choose from."""
+
+    lines = [
+        "legal_moves (the action MUST be copied verbatim from this list):",
+    ]
+    lines.extend(f"{i}. {move.model_dump_json()}" for i, move in enumerate(moves, 1))
+    return "\n".join(lines)
+
+
+def _format_hints(ranked: List[ScoredMove]) -> str:
+    """Render the evaluator's best moves as suggestions, best first."""
+
+    lines = ["suggested_moves (best first by expected value):"]
+    lines.extend(
+        f"{i}. {m.action.model_dump_json()} score={m.score:.2f}"
+        for i, m in enumerate(ranked, 1)
+    )
+    return "\n".join(lines)
 
 
 def _extract_json_object(text: str) -> str:
@@ -0,0 +1,179 @@
+"""
+Token-efficient encoding of game states for the model.
+
+``encode_state`` writes a ``GameState`` with short keys, single-letter
+resource and phase codes, and without default values (zero counts, empty
+lists). ``encode_delta`` writes only what changed since the previous state
+the model saw. ``PromptSession`` keeps one conversation per game so that each
+turn after the first can be sent as a delta, and so that the system prompt and
+earlier turns form a stable prefix Ollama can reuse from its prompt cache.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .jsonio import dumps
+from .models import GameState, ModelMoveResponse, Player, Resource, TurnPhase
+
+RESOURCE_CODES: Dict[Resource, str] = {
+    Resource.BRICK: "b",
+    Resource.LUMBER: "l",
+    Resource.WOOL: "w",
+    Resource.GRAIN: "g",
+    Resource.ORE: "o",
+}
+
+PHASE_CODES: Dict[TurnPhase, str] = {
+    TurnPhase.START_OF_TURN: "start",
+    TurnPhase.AFTER_ROLL: "roll",
+    TurnPhase.MAIN_ACTION: "main",
+    TurnPhase.END_OF_TURN: "end",
+}
+
+COMPACT_LEGEND = """
+Game states are sent in a compact form:
+- "t": turn number, "cur": current player id, "ph": phase (start|roll|main|end),
+  "rob": hex id with the robber.
+- "hex": [[hex_id, resource, number], ...]; a bare [hex_id] is the desert.
+- "pl": players as {"id", "n": name, "vp", "r": resources, "rd": roads as
+  [node_a, node_b], "s": settlement node ids, "c": city node ids}.
+- Resources are b=brick, l=lumber, w=wool, g=grain, o=ore; "r": "b2g1" means
+  2 brick and 1 grain. Missing keys mean zero / none.
+- A message starting with "delta:" lists only what changed since the previous
+  state; player fields that appear replace the old values entirely.
+- Actions still use the full names from ModelMoveResponse.
+"""
+
+
+def _encode_resources(resources: Dict[Resource, int]) -> str:
+    return "".join(
+        f"{code}{resources[r]}" for r, code in RESOURCE_CODES.items() if resources.get(r)
+    )
+
+
+def _encode_player(player: Player) -> Dict[str, Any]:
+    out: Dict[str, Any] = {"id": player.id, "n": player.name}
+    if player.victory_points:
+        out["vp"] = player.victory_points
+    resources = _encode_resources(player.resources)
+    if resources:
+        out["r"] = resources
+    if player.roads:
+        out["rd"] = [list(edge) for edge in player.roads]
+    if player.settlements:
+        out["s"] = list(player.settlements)
+    if player.cities:
+        out["c"] = list(player.cities)
+    return out
+
+
+def _player_fields(player: Player) -> Dict[str, Any]:
+    """All delta-tracked fields of a player, with defaults filled in."""
+
+    return {
+        "vp": player.victory_points,
+        "r": _encode_resources(player.resources),
+        "rd": [list(edge) for edge in player.roads],
+        "s": list(player.settlements),
+        "c": list(player.cities),
+    }
+
+
+def encode_state(game_state: GameState) -> Dict[str, Any]:
+    """Short-key encoding of a full ``GameState``."""
+
+    hexes = []
+    for tile in game_state.board.hexes:
+        if tile.resource is None:
+            hexes.append([tile.id])
+        else:
+            hexes.append([tile.id, RESOURCE_CODES[tile.resource], tile.number_token])
+    return {
+        "t": game_state.turn_number,
+        "cur": game_state.current_player_id,
+        "ph": PHASE_CODES[game_state.phase],
+        "rob": game_state.board.robber.hex_id,
+        "hex": hexes,
+        "pl": [_encode_player(p) for p in game_state.players],
+    }
+
+
+def encode_delta(previous: GameState, current: GameState) -> Optional[Dict[str, Any]]:
+    """Encode what changed from ``previous`` to ``current``.
+
+    Returns ``None`` when a delta cannot describe the change (different
+    players or board), in which case the full state must be sent.
+    """
+
+    if [p.id for p in previous.players] != [p.id for p in current.players]:
+        return None
+    if previous.board.hexes != current.board.hexes:
+        return None
+
+    out: Dict[str, Any] = {
+        "t": current.turn_number,
+        "cur": current.current_player_id,
+        "ph": PHASE_CODES[current.phase],
+    }
+    if previous.board.robber != current.board.robber:
+        out["rob"] = current.board.robber.hex_id
+
+    players = []
+    for before, after in zip(previous.players, current.players):
+        old, new = _player_fields(before), _player_fields(after)
+        changed = {key: value for key, value in new.items() if old[key] != value}
+        if before.name != after.name:
+            changed["n"] = after.name
+        if changed:
+            players.append({"id": after.id, **changed})
+    if players:
+        out["pl"] = players
+    return out
+
+
+class PromptSession:
+    """Conversation state for one game, enabling delta-encoded turns.
+
+    The first turn sends the full compact state; later turns send a delta
+    against the last state the model answered. After ``max_turns`` turns the
+    history is dropped and the next turn starts over with a full state, which
+    bounds prompt growth.
+    """
+
+    def __init__(self, max_turns: int = 8) -> None:
+        self.max_turns = max_turns
+        self.history: List[Dict[str, str]] = []
+        self._last_state: Optional[GameState] = None
+        self._pending: Optional[GameState] = None
+
+    def reset(self) -> None:
+        self.history.clear()
+        self._last_state = None
+        self._pending = None
+
+    def prepare(self, game_state: GameState) -> str:
+        """Return the encoded state (full or delta) for ``game_state``."""
+
+        if len(self.history) >= 2 * self.max_turns:
+            self.reset()
+        delta = None
+        if self._last_state is not None:
+            delta = encode_delta(self._last_state, game_state)
+        if delta is None:
+            self.history.clear()
+            content = "state:" + dumps(encode_state(game_state))
+        else:
+            content = "delta:" + dumps(delta)
+        self._pending = game_state
+        return content
+
+    def commit(self, sent_content: str, move: ModelMoveResponse) -> None:
+        """Record the user message actually sent and the model's answer to it."""
+
+        if self._pending is None:
+            return
+        self.history.append({"role": "user", "content": sent_content})
+        self.history.append({"role": "assistant", "content": move.model_dump_json()})
+        self._last_state = self._pending.model_copy(deep=True)
+        self._pending = None
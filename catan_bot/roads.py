@@ -0,0 +1,193 @@
+"""
+Longest road on edge bitmasks.
+
+A player's longest road is the longest trail (no edge used twice) through
+their roads that does not pass through a node holding another player's
+building. Roads that only meet at such a node are separate pieces, so the
+search runs per connected component, and a new road or settlement only
+changes the components it touches. ``CompactState.longest_road`` keeps the
+per-component lengths and updates just those components on every placement.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+from .models import GameState
+from .topology import EDGE_NODES_MASK, EDGES, NODE_EDGES_MASK, edge_index
+
+# Minimum length for the Longest Road card.
+LONGEST_ROAD_MINIMUM = 5
+
+# (component edge mask, longest trail within it)
+Component = Tuple[int, int]
+
+
+def road_components(roads: int, blocked: int) -> List[int]:
+    """Split a mask of edges into connected pieces.
+
+    Roads only connect through nodes not set in ``blocked``.
+    """
+
+    components = []
+    remaining = roads
+    while remaining:
+        component = frontier = remaining & -remaining
+        while frontier:
+            nodes = 0
+            while frontier:
+                low = frontier & -frontier
+                nodes |= EDGE_NODES_MASK[low.bit_length() - 1]
+                frontier ^= low
+            nodes &= ~blocked
+            reach = 0
+            while nodes:
+                low = nodes & -nodes
+                reach |= NODE_EDGES_MASK[low.bit_length() - 1]
+                nodes ^= low
+            frontier = reach & remaining & ~component
+            component |= frontier
+        components.append(component)
+        remaining &= ~component
+    return components
+
+
+def longest_trail(roads: int, blocked: int) -> int:
+    """Length of the longest trail within ``roads``.
+
+    A trail may start or end at a node in ``blocked`` but not pass through it.
+    """
+
+    nodes = 0
+    mask = roads
+    while mask:
+        low = mask & -mask
+        nodes |= EDGE_NODES_MASK[low.bit_length() - 1]
+        mask ^= low
+
+    # A longest trail can always be taken to start at a node where it cannot
+    # be extended backwards: a blocked node or one whose degree is not 2. If
+    # there is none the roads form a simple cycle and any node will do.
+    starts = nodes & blocked
+    rest = nodes & ~blocked
+    while rest:
+        low = rest & -rest
+        rest ^= low
+        if (NODE_EDGES_MASK[low.bit_length() - 1] & roads).bit_count() != 2:
+            starts |= low
+    if not starts:
+        starts = nodes & -nodes
+
+    best = 0
+    while starts:
+        low = starts & -starts
+        starts ^= low
+        length = _walk(low.bit_length() - 1, roads, blocked)
+        if length > best:
+            best = length
+    return best
+
+
+def _walk(node: int, remaining: int, blocked: int) -> int:
+    """Longest trail leaving ``node`` along ``remaining`` edges."""
+
+    best = 0
+    edges = NODE_EDGES_MASK[node] & remaining
+    while edges:
+        low = edges & -edges
+        edges ^= low
+        a, b = EDGES[low.bit_length() - 1]
+        other = b if a == node else a
+        length = 1
+        if not blocked >> other & 1:
+            length += _walk(other, remaining ^ low, blocked)
+        if length > best:
+            best = length
+    return best
+
+
+def components_for(roads: int, blocked: int) -> Tuple[Component, ...]:
+    """All components of ``roads`` with their longest trail lengths."""
+
+    return tuple((c, longest_trail(c, blocked)) for c in road_components(roads, blocked))
+
+
+def add_road(
+    components: Tuple[Component, ...], edge: int, blocked: int
+) -> Tuple[Component, ...]:
+    """Components after adding ``edge``: merge the ones it joins, re-measure only that."""
+
+    merged = 1 << edge
+    ends = EDGE_NODES_MASK[edge] & ~blocked
+    reach = 0
+    while ends:
+        low = ends & -ends
+        reach |= NODE_EDGES_MASK[low.bit_length() - 1]
+        ends ^= low
+
+    kept = []
+    for component in components:
+        if component[0] & reach:
+            merged |= component[0]
+        else:
+            kept.append(component)
+    kept.append((merged, longest_trail(merged, blocked)))
+    return tuple(kept)
+
+
+def block_node(
+    components: Tuple[Component, ...], node: int, blocked: int
+) -> Tuple[Component, ...]:
+    """Components after another player builds on ``node`` (already in ``blocked``).
+
+    Only a component with roads on both sides of the node can change.
+    """
+
+    incident = NODE_EDGES_MASK[node]
+    out: List[Component] = []
+    changed = False
+    for component in components:
+        if (component[0] & incident).bit_count() < 2:
+            out.append(component)
+            continue
+        changed = True
+        out.extend(components_for(component[0], blocked))
+    return tuple(out) if changed else components
+
+
+def longest(components: Tuple[Component, ...]) -> int:
+    return max((length for _, length in components), default=0)
+
+
+def longest_road_leader(lengths: List[int]) -> Optional[int]:
+    """Index of the player whose road is strictly longest and long enough.
+
+    Ties have no leader: holding the card through a tie depends on who had
+    it first, which states do not record.
+    """
+
+    best = max(lengths, default=0)
+    if best < LONGEST_ROAD_MINIMUM or lengths.count(best) > 1:
+        return None
+    return lengths.index(best)
+
+
+def longest_roads(game_state: GameState) -> Dict[int, int]:
+    """Longest road length per player id of a ``GameState``."""
+
+    buildings = {
+        p.id: {n - 1 for n in p.settlements} | {n - 1 for n in p.cities}
+        for p in game_state.players
+    }
+    out = {}
+    for player in game_state.players:
+        roads = 0
+        for a, b in player.roads:
+            roads |= 1 << edge_index(a, b)
+        blocked = 0
+        for pid, nodes in buildings.items():
+            if pid != player.id:
+                for n in nodes:
+                    blocked |= 1 << n
+        out[player.id] = longest(components_for(roads, blocked))
+    return out
@@ -0,0 +1,406 @@
+"""
+Monte Carlo rollout engine.
+
+For each candidate move of the current player, many games are played forward
+to completion (or a turn horizon) with a fast default policy, and the fraction
+won is used as the move's value. Which candidate to sample next is chosen with
+UCB1, so promising moves get more rollouts within the time budget.
+
+Rollouts run in a process pool. The root state is packed once into a
+``multiprocessing.shared_memory`` buffer; tasks only carry the buffer name,
+a candidate move code and a seed, and each worker unpacks the root once per
+decision.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .compact import NUM_RESOURCES, PHASE_INDEX, CompactState, StateHeader
+from .models import GameState, ModelMoveResponse, MoveAction, TurnPhase
+from .movegen import (
+    CITY_COST,
+    END_TURN,
+    MAX_CITIES,
+    MAX_SETTLEMENTS,
+    SETTLEMENT_COST,
+    bank_trade_codes,
+    building_codes,
+    decode_move,
+    encode_move,
+    legal_move_codes,
+    move_payload,
+    road_codes,
+    settlement_candidates,
+)
+from .rules import apply_move, roll_dice, winner
+
+_START_OF_TURN = PHASE_INDEX[TurnPhase.START_OF_TURN]
+_AFTER_ROLL = PHASE_INDEX[TurnPhase.AFTER_ROLL]
+_MAIN_ACTION = PHASE_INDEX[TurnPhase.MAIN_ACTION]
+
+DEFAULT_MAX_TURNS = 400
+MAX_ACTIONS_PER_TURN = 8
+UCB_EXPLORATION = 1.4
+
+
+# ----------------------------------------------------------------------
+# Default policy and single rollouts
+# ----------------------------------------------------------------------
+
+
+def default_policy(state: CompactState, rng: random.Random) -> int:
+    """Cheap move choice for :func:`play_out`.
+
+    Builds a city or settlement whenever one is legal. Failing that, it makes
+    a bank trade that pays for a building with somewhere to go, or half the
+    time extends a road, and otherwise ends the turn. Robber moves prefer
+    hexes with someone to steal from.
+    """
+
+    if state.phase == _AFTER_ROLL:
+        codes = legal_move_codes(state)
+        stealing = [c for c in codes if move_payload(c) & 0xFF]
+        return rng.choice(stealing or codes)
+    if state.phase != _MAIN_ACTION:
+        return END_TURN
+
+    # Only the kinds of move the policy plays are generated; player trades,
+    # the bulk of a typical move list, never are.
+    player = state.current
+    buildings = building_codes(state, player)
+    if buildings:
+        return rng.choice(buildings)
+    trades = bank_trade_codes(state, player)
+    if trades:
+        targets = _trade_targets(state)
+        if targets:
+            hand = state.hand(player)
+            useful = [c for c in trades if _trade_completes_building(hand, c, targets)]
+            if useful:
+                return rng.choice(useful)
+    roads = road_codes(state, player)
+    if roads and rng.random() < 0.5:
+        return rng.choice(roads)
+    return END_TURN
+
+
+def _trade_targets(state: CompactState) -> Dict[int, List[Tuple[int, ...]]]:
+    """Costs of buildings the current player has room for and is one card
+    short of, keyed by the missing resource."""
+
+    player = state.current
+    costs = []
+    if state.settlements[player] and state.cities[player].bit_count() < MAX_CITIES:
+        costs.append(CITY_COST)
+    if (
+        state.settlements[player].bit_count() < MAX_SETTLEMENTS
+        and settlement_candidates(state, player)
+    ):
+        costs.append(SETTLEMENT_COST)
+    hand = state.hand(player)
+    targets: Dict[int, List[Tuple[int, ...]]] = {}
+    for cost in costs:
+        short = [k for k in range(NUM_RESOURCES) if hand[k] < cost[k]]
+        if len(short) == 1 and cost[short[0]] - hand[short[0]] == 1:
+            targets.setdefault(short[0], []).append(cost)
+    return targets
+
+
+def _trade_completes_building(
+    hand: Sequence[int], code: int, targets: Dict[int, List[Tuple[int, ...]]]
+) -> bool:
+    payload = move_payload(code)
+    costs = targets.get(payload & 0xF)
+    if not costs:
+        return False
+    give = (payload >> 4) & 0xF
+    left = hand[give] - (payload >> 8)
+    return any(left >= cost[give] for cost in costs)
+
+
+def play_out(
+    state: CompactState,
+    rng: random.Random,
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> Optional[int]:
+    """Play ``state`` forward in place with :func:`default_policy`.
+
+    Returns the winner's index, or ``None`` if the horizon was reached first.
+    """
+
+    horizon = state.turn_number + max_turns
+    actions = 0
+    while state.turn_number < horizon:
+        if state.phase == _START_OF_TURN:
+            roll_dice(state, rng)
+            actions = 0
+        elif state.phase == _MAIN_ACTION and actions >= MAX_ACTIONS_PER_TURN:
+            state.end_turn()
+        elif state.phase == _MAIN_ACTION or state.phase == _AFTER_ROLL:
+            apply_move(state, default_policy(state, rng), rng)
+            actions += 1
+            found = winner(state)
+            if found is not None:
+                return found
+        else:
+            state.end_turn()
+    return None
+
+
+def rollout_reward(state: CompactState, player: int, found: Optional[int]) -> float:
+    """1 for a win, 0 for a loss; at the horizon the leaders share the point."""
+
+    if found is not None:
+        return 1.0 if found == player else 0.0
+    best = max(state.victory_points)
+    leaders = [p for p, vp in enumerate(state.victory_points) if vp == best]
+    return 1.0 / len(leaders) if player in leaders else 0.0
+
+
+def simulate(
+    root: CompactState,
+    code: int,
+    count: int,
+    seed: int,
+    deadline: float,
+    max_turns: int = DEFAULT_MAX_TURNS,
+) -> Tuple[float, int]:
+    """Run up to ``count`` rollouts of ``code`` from ``root`` before ``deadline``.
+
+    Returns ``(total_reward, rollouts_run)`` from the root player's view.
+    """
+
+    rng = random.Random(seed)
+    player = root.current
+    reward = 0.0
+    done = 0
+    while done < count and (done == 0 or time.time() < deadline):
+        state = root.clone()
+        apply_move(state, code, rng)
+        found = winner(state)
+        if found is None:
+            found = play_out(state, rng, max_turns)
+        reward += rollout_reward(state, player, found)
+        done += 1
+    return reward, done
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+
+_worker_roots: Dict[str, CompactState] = {}
+
+
+def _run_batch(
+    buffer_name: str,
+    header: StateHeader,
+    code: int,
+    count: int,
+    seed: int,
+    deadline: float,
+    max_turns: int,
+) -> Tuple[int, float, int]:
+    root = _worker_roots.get(buffer_name)
+    if root is None:
+        shm = shared_memory.SharedMemory(name=buffer_name)
+        try:
+            root = CompactState.unpack(header, shm.buf)
+        finally:
+            shm.close()
+        _worker_roots.clear()
+        _worker_roots[buffer_name] = root
+    reward, done = simulate(root, code, count, seed, deadline, max_turns)
+    return code, reward, done
+
+
+# ----------------------------------------------------------------------
+# Engine
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class MoveEstimate:
+    """Rollout statistics for one candidate move."""
+
+    action: MoveAction
+    reward: float
+    rollouts: int
+
+    @property
+    def win_rate(self) -> float:
+        return self.reward / self.rollouts if self.rollouts else 0.0
+
+
+class RolloutEngine:
+    """Chooses moves by parallel Monte Carlo rollouts.
+
+    Use as a context manager (or call ``close()``) to shut down the pool.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        batch_size: int = 16,
+        max_turns: int = DEFAULT_MAX_TURNS,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.max_turns = max_turns
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "RolloutEngine":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def evaluate(
+        self,
+        game_state: GameState,
+        time_budget: float = 1.0,
+        candidates: Optional[Sequence[MoveAction]] = None,
+        seed: Optional[int] = None,
+    ) -> List[MoveEstimate]:
+        """Estimate the win rate of each candidate move (default: all legal moves).
+
+        Results are sorted best first.
+        """
+
+        root = CompactState.from_game_state(game_state)
+        if candidates is None:
+            codes = legal_move_codes(root)
+        else:
+            codes = []
+            for action in candidates:
+                code = encode_move(root, action)
+                if code is None:
+                    raise ValueError(f"Cannot simulate move {action!r}.")
+                codes.append(code)
+
+        rng = random.Random(seed)
+        deadline = time.time() + time_budget
+        if len(codes) <= 1:
+            stats = {code: (0.0, 0) for code in codes}
+        elif self.workers <= 1:
+            stats = self._evaluate_inline(root, codes, rng, deadline)
+        else:
+            stats = self._evaluate_parallel(root, codes, rng, deadline)
+
+        estimates = [
+            MoveEstimate(action=decode_move(root, code), reward=reward, rollouts=n)
+            for code, (reward, n) in stats.items()
+        ]
+        estimates.sort(key=lambda e: (e.win_rate, e.rollouts), reverse=True)
+        return estimates
+
+    def choose_move(self, game_state: GameState, time_budget: float = 1.0) -> ModelMoveResponse:
+        estimates = self.evaluate(game_state, time_budget=time_budget)
+        best = estimates[0]
+        total = sum(e.rollouts for e in estimates)
+        return ModelMoveResponse(
+            reasoning=(
+                f"Won {best.win_rate:.1%} of {best.rollouts} rollouts; best of "
+                f"{len(estimates)} candidate moves ({total} rollouts in total)."
+            ),
+            action=best.action,
+        )
+
+    def _evaluate_inline(
+        self,
+        root: CompactState,
+        codes: List[int],
+        rng: random.Random,
+        deadline: float,
+    ) -> Dict[int, Tuple[float, int]]:
+        stats = {code: (0.0, 0) for code in codes}
+        while time.time() < deadline:
+            code = _select(stats, {})
+            reward, done = simulate(
+                root, code, self.batch_size, rng.getrandbits(63), deadline, self.max_turns
+            )
+            total, n = stats[code]
+            stats[code] = (total + reward, n + done)
+        return stats
+
+    def _evaluate_parallel(
+        self,
+        root: CompactState,
+        codes: List[int],
+        rng: random.Random,
+        deadline: float,
+    ) -> Dict[int, Tuple[float, int]]:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        stats = {code: (0.0, 0) for code in codes}
+        in_flight: Dict[int, int] = {code: 0 for code in codes}
+        pending: Dict[Future, int] = {}
+
+        size = CompactState.packed_size(root.num_players)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            root.pack_into(shm.buf)
+            while True:
+                if time.time() < deadline:
+                    while len(pending) < 2 * self.workers:
+                        code = _select(stats, in_flight)
+                        future = self._pool.submit(
+                            _run_batch,
+                            shm.name,
+                            root.header,
+                            code,
+                            self.batch_size,
+                            rng.getrandbits(63),
+                            deadline,
+                            self.max_turns,
+                        )
+                        pending[future] = code
+                        in_flight[code] += self.batch_size
+                elif not pending:
+                    break
+
+                done, _ = wait(
+                    pending, timeout=max(deadline - time.time(), 0), return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    code = pending.pop(future)
+                    in_flight[code] -= self.batch_size
+                    _, reward, n = future.result()
+                    total, count = stats[code]
+                    stats[code] = (total + reward, count + n)
+        finally:
+            shm.close()
+            shm.unlink()
+        return stats
+
+
+def _select(stats: Dict[int, Tuple[float, int]], in_flight: Dict[int, int]) -> int:
+    """Pick the next candidate to sample with UCB1, counting in-flight rollouts."""
+
+    total = sum(n for _, n in stats.values()) + sum(in_flight.values())
+    log_total = math.log(total) if total > 1 else 0.0
+    best_code = END_TURN
+    best_score = -1.0
+    for code, (reward, n) in stats.items():
+        visits = n + in_flight.get(code, 0)
+        if visits == 0:
+            return code
+        mean = reward / n if n else 0.5
+        score = mean + UCB_EXPLORATION * math.sqrt(log_total / visits)
+        if score > best_score:
+            best_code, best_score = code, score
+    return best_code
@@ -0,0 +1,176 @@
+"""
+Game rules on top of :class:`CompactState`: applying moves, rolling dice,
+resource production, discarding and the robber.
+
+Randomness always comes from a caller-supplied ``random.Random`` so that
+simulations are reproducible from a seed.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Optional
+
+from .compact import NUM_RESOURCES, PHASE_INDEX, CompactState
+from .models import TurnPhase
+from .movegen import (
+    CITY_COST,
+    DEV_CARD_COST,
+    KIND_BANK_TRADE,
+    KIND_CITY,
+    KIND_DEV_CARD,
+    KIND_END_TURN,
+    KIND_PLAYER_TRADE,
+    KIND_ROAD,
+    KIND_ROBBER,
+    KIND_SETTLEMENT,
+    ROAD_COST,
+    SETTLEMENT_COST,
+    move_kind,
+    move_payload,
+)
+
+VICTORY_POINTS_TO_WIN = 10
+DISCARD_LIMIT = 7
+
+_AFTER_ROLL = PHASE_INDEX[TurnPhase.AFTER_ROLL]
+_MAIN_ACTION = PHASE_INDEX[TurnPhase.MAIN_ACTION]
+
+_NEGATED_COSTS = {
+    KIND_ROAD: tuple(-c for c in ROAD_COST),
+    KIND_SETTLEMENT: tuple(-c for c in SETTLEMENT_COST),
+    KIND_CITY: tuple(-c for c in CITY_COST),
+    KIND_DEV_CARD: tuple(-c for c in DEV_CARD_COST),
+}
+
+
+def apply_move(state: CompactState, code: int, rng: random.Random) -> None:
+    """Apply a legal move code for the current player in place.
+
+    Development cards are paid for but have no further effect, since
+    ``GameState`` does not track them.
+    """
+
+    kind, payload = move_kind(code), move_payload(code)
+    player = state.current
+
+    if kind == KIND_END_TURN:
+        state.end_turn()
+    elif kind == KIND_ROAD:
+        state.add_resources(player, _NEGATED_COSTS[KIND_ROAD])
+        state.place_road(player, payload)
+    elif kind == KIND_SETTLEMENT:
+        state.add_resources(player, _NEGATED_COSTS[KIND_SETTLEMENT])
+        state.place_settlement(player, payload)
+        state.add_victory_points(player, 1)
+    elif kind == KIND_CITY:
+        state.add_resources(player, _NEGATED_COSTS[KIND_CITY])
+        state.upgrade_to_city(player, payload)
+        state.add_victory_points(player, 1)
+    elif kind == KIND_DEV_CARD:
+        state.add_resources(player, _NEGATED_COSTS[KIND_DEV_CARD])
+    elif kind == KIND_BANK_TRADE:
+        ratio, give, receive = payload >> 8, (payload >> 4) & 0xF, payload & 0xF
+        deltas = [0] * NUM_RESOURCES
+        deltas[give] = -ratio
+        deltas[receive] = 1
+        state.add_resources(player, deltas)
+    elif kind == KIND_PLAYER_TRADE:
+        other, give, receive = payload >> 8, (payload >> 4) & 0xF, payload & 0xF
+        deltas = [0] * NUM_RESOURCES
+        deltas[give] = -1
+        deltas[receive] = 1
+        state.add_resources(player, deltas)
+        deltas[give], deltas[receive] = 1, -1
+        state.add_resources(other, deltas)
+    elif kind == KIND_ROBBER:
+        state.move_robber(payload >> 8)
+        victim = (payload & 0xFF) - 1
+        if victim >= 0:
+            steal_random_card(state, victim, player, rng)
+        state.phase = _MAIN_ACTION
+    else:
+        raise ValueError(f"Unknown move code {code}.")
+
+
+def produce(state: CompactState, roll: int) -> None:
+    """Hand out resources for every hex showing ``roll``, except under the robber."""
+
+    state.collect(roll)
+
+
+def roll_dice(state: CompactState, rng: random.Random) -> int:
+    """Roll for the current player and resolve the roll (see ``resolve_roll``)."""
+
+    roll = rng.randint(1, 6) + rng.randint(1, 6)
+    resolve_roll(state, roll, rng)
+    return roll
+
+
+def resolve_roll(state: CompactState, roll: int, rng: random.Random) -> None:
+    """Apply the dice total ``roll`` for the current player.
+
+    On a 7 every player over the hand limit discards half their cards and the
+    phase becomes ``AFTER_ROLL`` (robber pending); otherwise resources are
+    produced and the phase becomes ``MAIN_ACTION``.
+    """
+
+    if roll == 7:
+        for p in range(state.num_players):
+            total = sum(state.hand(p))
+            if total > DISCARD_LIMIT:
+                discard_random(state, p, total // 2, rng)
+        state.phase = _AFTER_ROLL
+    else:
+        produce(state, roll)
+        state.phase = _MAIN_ACTION
+
+
+def discard_random(state: CompactState, player: int, count: int, rng: random.Random) -> None:
+    hand = list(state.hand(player))
+    deltas = [0] * NUM_RESOURCES
+    for _ in range(count):
+        k = _random_card(hand, rng)
+        if k is None:
+            break
+        hand[k] -= 1
+        deltas[k] -= 1
+    state.add_resources(player, deltas)
+
+
+def steal_random_card(
+    state: CompactState, victim: int, thief: int, rng: random.Random
+) -> Optional[int]:
+    """Move one random card from ``victim`` to ``thief``; return its resource index."""
+
+    k = _random_card(list(state.hand(victim)), rng)
+    if k is None:
+        return None
+    deltas = [0] * NUM_RESOURCES
+    deltas[k] = -1
+    state.add_resources(victim, deltas)
+    deltas[k] = 1
+    state.add_resources(thief, deltas)
+    return k
+
+
+def _random_card(hand, rng: random.Random) -> Optional[int]:
+    total = sum(hand)
+    if not total:
+        return None
+    pick = rng.randrange(total)
+    for k, count in enumerate(hand):
+        if pick < count:
+            return k
+        pick -= count
+    return None
+
+
+def winner(state: CompactState) -> Optional[int]:
+    """Index of a player who has reached the winning score, if any."""
+
+    for p, vp in enumerate(state.victory_points):
+        if vp >= VICTORY_POINTS_TO_WIN:
+            return p
+    return None
+
@@ -0,0 +1,108 @@
+"""
+JSON schemas that only admit the current legal moves.
+
+Ollama compiles a JSON schema passed as the structured-output format into a
+grammar and samples only tokens the grammar allows, so a response validated
+against ``move_response_schema(legal_moves(state))`` is always well-formed
+JSON and always a legal move. Moves are grouped where the schema can say so
+exactly: one ``enum`` of locations per build type and one ``enum`` of
+victims per robber hex; trades are listed one by one.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+from .models import BuildAction, MoveAction, RobberAction, TradeAction
+
+SCHEMA_NAME = "ModelMoveResponse"
+
+
+def move_response_schema(moves: Sequence[MoveAction]) -> Dict[str, Any]:
+    """Schema for a ``ModelMoveResponse`` whose action is one of ``moves``."""
+
+    return {
+        "type": "object",
+        "properties": {
+            "reasoning": {"type": "string"},
+            "action": {"anyOf": action_schemas(moves)},
+        },
+        "required": ["reasoning", "action"],
+        "additionalProperties": False,
+    }
+
+
+def response_format(moves: Sequence[MoveAction]) -> Dict[str, Any]:
+    """The OpenAI-style ``response_format`` carrying ``move_response_schema``.
+
+    Ollama's OpenAI-compatible endpoint passes the schema on as the native
+    ``format`` parameter.
+    """
+
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": SCHEMA_NAME,
+            "strict": True,
+            "schema": move_response_schema(moves),
+        },
+    }
+
+
+def action_schemas(moves: Sequence[MoveAction]) -> List[Dict[str, Any]]:
+    builds: Dict[str, List[str]] = {}
+    robber: Dict[int, List[Optional[int]]] = {}
+    out: List[Dict[str, Any]] = []
+    end_turn = False
+    for move in moves:
+        if isinstance(move, BuildAction):
+            builds.setdefault(move.build_type.value, []).append(move.location)
+        elif isinstance(move, RobberAction):
+            robber.setdefault(move.target_hex_id, []).append(move.steal_from_player_id)
+        elif isinstance(move, TradeAction):
+            out.append(_trade_schema(move))
+        else:
+            end_turn = True
+
+    for build_type, locations in builds.items():
+        out.append(
+            _object(
+                type={"const": "build"},
+                build_type={"const": build_type},
+                location={"enum": locations},
+            )
+        )
+    for hex_id, victims in robber.items():
+        out.append(
+            _object(
+                type={"const": "move_robber"},
+                target_hex_id={"const": hex_id},
+                steal_from_player_id={"enum": victims},
+            )
+        )
+    if end_turn:
+        out.append(_object(type={"const": "end_turn"}))
+    return out
+
+
+def _trade_schema(move: TradeAction) -> Dict[str, Any]:
+    return _object(
+        type={"const": "trade"},
+        trade_type={"const": move.trade_type.value},
+        target_player_id={"const": move.target_player_id},
+        give=_amounts(move.give),
+        receive=_amounts(move.receive),
+    )
+
+
+def _amounts(amounts: Dict[Any, int]) -> Dict[str, Any]:
+    return _object(**{resource.value: {"const": n} for resource, n in amounts.items()})
+
+
+def _object(**properties: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
@@ -0,0 +1,249 @@
+"""
+Speculative decisions during opponents' turns.
+
+While other players act, ``SpeculativeScheduler`` predicts the states in
+which its player will next have to decide and asks the model about them in
+the background, so the real decision is often already in the client's
+``MoveCache`` (keyed by state hash) when the turn arrives.
+
+A prediction assumes every player before us ends their turn without acting,
+and enumerates the dice totals still to be rolled up to and including ours;
+the ``rolls`` most probable sequences are requested. A sequence is skipped
+when its outcome is random beyond the dice: an opponent rolling 7 (their
+robber move) or a 7 that forces someone to discard. Each time an opponent's
+state changes the predictions are recomputed and requests for states that
+can no longer occur are cancelled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import random
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .async_client import AsyncOllamaClient
+from .cache import MoveCache
+from .compact import PHASE_INDEX, CompactState
+from .evaluate import DICE_PROBABILITIES
+from .models import GameState, ModelMoveResponse, TurnPhase
+from .ollama_client import cache_key
+from .prompt import PromptSession
+from .rules import DISCARD_LIMIT, resolve_roll
+
+_START_OF_TURN = PHASE_INDEX[TurnPhase.START_OF_TURN]
+
+DEFAULT_SPECULATIVE_ROLLS = 4
+
+_ROLLS = tuple(range(2, 13))
+
+# Only passed where no randomness is used (a 7 that forces discards is
+# never replayed).
+_NO_RANDOMNESS = random.Random(0)
+
+
+@dataclass
+class SpeculationStats:
+    # Background requests started, and those cancelled as stale.
+    scheduled: int = 0
+    cancelled: int = 0
+    errors: int = 0
+    # Decisions answered from a finished speculation, or by joining one
+    # still in flight.
+    hits: int = 0
+    joined: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.joined + self.misses
+        return (self.hits + self.joined) / total if total else 0.0
+
+
+@lru_cache(maxsize=64)
+def roll_sequences(count: int, limit: int) -> List[Tuple[float, Tuple[int, ...]]]:
+    """The ``limit`` most probable sequences of ``count`` dice totals, best first."""
+
+    probability = DICE_PROBABILITIES
+    sequences = (
+        (_product(probability[r] for r in rolls), rolls)
+        for rolls in itertools.product(_ROLLS, repeat=count)
+    )
+    return heapq.nlargest(limit, sequences)
+
+
+def _product(values: Iterable[float]) -> float:
+    out = 1.0
+    for v in values:
+        out *= v
+    return out
+
+
+def predict_decision_states(
+    state: CompactState, player: int, limit: int = DEFAULT_SPECULATIVE_ROLLS
+) -> List[Tuple[float, CompactState]]:
+    """Likely states at ``player``'s first decision of their next turn.
+
+    Returns ``(probability, state)`` pairs, most probable first; see the
+    module docstring for the assumptions. Empty while it is ``player``'s
+    own turn.
+    """
+
+    if state.current == player:
+        return []
+    # Rolls still to come: the current player's (if not yet rolled), then
+    # one for each player after them up to and including ``player``.
+    count = (player - state.current) % state.num_players
+    if state.phase == _START_OF_TURN:
+        count += 1
+
+    out = []
+    # Sequences with an unpredictable 7 are dropped, so over-fetch.
+    for probability, rolls in roll_sequences(count, 4 * limit):
+        if 7 in rolls[:-1]:
+            continue
+        predicted = _replay(state, player, rolls)
+        if predicted is None:
+            continue
+        out.append((probability, predicted))
+        if len(out) == limit:
+            break
+    return out
+
+
+def _must_discard(state: CompactState) -> bool:
+    return any(sum(state.hand(p)) > DISCARD_LIMIT for p in range(state.num_players))
+
+
+def _replay(
+    state: CompactState, player: int, rolls: Tuple[int, ...]
+) -> Optional[CompactState]:
+    """``state`` after everyone up to ``player`` rolls ``rolls`` and passes.
+
+    ``None`` if a 7 comes up while someone's hand (after the earlier rolls'
+    production) is over the discard limit, since the discards are random.
+    """
+
+    predicted = state.clone()
+    remaining = iter(rolls)
+    if predicted.phase == _START_OF_TURN:
+        if not _roll(predicted, next(remaining)):
+            return None
+    while predicted.current != player:
+        predicted.end_turn()
+        if not _roll(predicted, next(remaining)):
+            return None
+    return predicted
+
+
+def _roll(state: CompactState, total: int) -> bool:
+    if total == 7 and _must_discard(state):
+        return False
+    resolve_roll(state, total, _NO_RANDOMNESS)
+    return True
+
+
+class SpeculativeScheduler:
+    """Runs background ``choose_move`` calls for ``player``'s likely next states.
+
+    Call ``observe`` with every state while others play and ``choose_move``
+    for the player's own decisions. ``client`` gets a ``MoveCache`` if it
+    has none; the speculative answers are stored there.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOllamaClient,
+        player: int,
+        rolls: int = DEFAULT_SPECULATIVE_ROLLS,
+    ) -> None:
+        if client.cache is None:
+            client.cache = MoveCache()
+        self.client = client
+        self.cache = client.cache
+        self.player = player
+        self.rolls = rolls
+        self.stats = SpeculationStats()
+        self._pending: Dict[int, asyncio.Task] = {}
+        self._ready: Set[int] = set()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def observe(self, state: CompactState) -> int:
+        """Re-speculate from an opponent's state; returns requests started.
+
+        Must be called from the event loop's thread. Does nothing during
+        the player's own turn.
+        """
+
+        if state.current == self.player:
+            return 0
+        wanted: Dict[int, GameState] = {}
+        for _, predicted in predict_decision_states(state, self.player, self.rolls):
+            game_state = predicted.to_game_state()
+            wanted[cache_key(self.client.config, game_state)] = game_state
+
+        for key in list(self._pending):
+            if key not in wanted:
+                self._cancel(key)
+        started = 0
+        for key, game_state in wanted.items():
+            if key in self._pending or key in self._ready:
+                continue
+            self._pending[key] = asyncio.create_task(self._speculate(key, game_state))
+            self.stats.scheduled += 1
+            started += 1
+        return started
+
+    async def choose_move(
+        self, game_state: GameState, session: Optional[PromptSession] = None
+    ) -> ModelMoveResponse:
+        """Decide for the player, using a speculative answer if there is one."""
+
+        key = cache_key(self.client.config, game_state)
+        task = self._pending.pop(key, None)
+        # The turn has arrived, so every other prediction is moot.
+        self.cancel()
+        if task is not None:
+            move = await task
+            if move is not None:
+                self.stats.joined += 1
+                self._ready.clear()
+                return move
+            self.stats.misses += 1
+        elif key in self._ready:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        self._ready.clear()
+        return await self.client.choose_move(game_state, session)
+
+    def cancel(self) -> None:
+        """Cancel every speculative request still in flight."""
+
+        for key in list(self._pending):
+            self._cancel(key)
+
+    def _cancel(self, key: int) -> None:
+        task = self._pending.pop(key)
+        if not task.done():
+            task.cancel()
+            self.stats.cancelled += 1
+
+    async def _speculate(self, key: int, game_state: GameState) -> Optional[ModelMoveResponse]:
+        """Ask in the background; failures only cost the speculation."""
+
+        try:
+            move = await self.client.choose_move(game_state)
+        except Exception:
+            self.stats.errors += 1
+            return None
+        finally:
+            self._pending.pop(key, None)
+        self._ready.add(key)
+        return move
@@ -0,0 +1,122 @@
+"""
+Incremental parsing of streamed chat completions.
+
+With ``stream: true`` Ollama's OpenAI-compatible endpoint sends server-sent
+events (``data: {...}`` lines) carrying content deltas. ``MoveStreamParser``
+feeds those deltas through an incremental JSON scanner and reports the first
+complete object that validates as a ``ModelMoveResponse``, so the caller can
+stop reading (and abort generation) immediately.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import ValidationError
+
+from .jsonio import loads, parse_model
+from .models import ModelMoveResponse, MoveAction
+
+_DONE = "[DONE]"
+
+
+class IncrementalJSONScanner:
+    """Finds top-level ``{...}`` objects in text that arrives in pieces.
+
+    Tracks brace depth and whether the scanner is inside a string (honouring
+    backslash escapes), so braces inside string values are ignored. Text
+    outside objects is discarded.
+    """
+
+    __slots__ = ("_buffer", "_depth", "_in_string", "_escaped")
+
+    def __init__(self) -> None:
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> List[str]:
+        """Consume ``text`` and return any objects completed by it."""
+
+        completed = []
+        start = 0 if self._depth else -1
+        for i, ch in enumerate(text):
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    start = i
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(text[start : i + 1])
+                    completed.append("".join(self._buffer))
+                    self._buffer.clear()
+                    start = -1
+        if self._depth and start >= 0:
+            self._buffer.append(text[start:])
+        return completed
+
+
+def parse_sse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Decode one server-sent event line into its JSON chunk.
+
+    Returns ``None`` for blank lines, comments and the final ``[DONE]``.
+    """
+
+    if not line.startswith("data:"):
+        return None
+    data = line[5:].strip()
+    if not data or data == _DONE:
+        return None
+    return loads(data)
+
+
+class MoveStreamParser:
+    """Accumulates a streamed completion until a ModelMoveResponse appears."""
+
+    def __init__(self, menu: Optional[List[MoveAction]] = None) -> None:
+        self.menu = menu
+        self.scanner = IncrementalJSONScanner()
+        self.chunks = 0
+
+    def feed_line(self, line: str) -> Optional[ModelMoveResponse]:
+        """Consume one SSE line; return the move once a complete one is seen.
+
+        Objects that are not valid JSON or not a ModelMoveResponse (e.g. a
+        snippet quoted in the model's reasoning) are skipped. A valid move
+        outside the offered legal move menu raises ``ValueError``.
+        """
+
+        chunk = parse_sse_line(line)
+        if chunk is None:
+            return None
+        self.chunks += 1
+        choices = chunk.get("choices") or []
+        if not choices:
+            return None
+        content = (choices[0].get("delta") or {}).get("content")
+        if not content:
+            return None
+
+        for candidate in self.scanner.feed(content):
+            try:
+                move = parse_model(ModelMoveResponse, candidate)
+            except (ValueError, ValidationError):
+                continue
+            if self.menu is not None and move.action not in self.menu:
+                raise ValueError("Model chose a move that is not in the legal move menu.")
+            return move
+        return None
@@ -0,0 +1,185 @@
+"""
+Geometry of the standard Catan board.
+
+Hexes, nodes (intersections) and edges (paths) are numbered once, at import
+time, so every other module can refer to them by small integers. Hex and node
+ids are 1-based to match the ids used in ``GameState``; internally we work with
+0-based indices (``id - 1``) so they can double as bit positions.
+
+Hexes are numbered row by row (rows of 3, 4, 5, 4, 3 tiles), left to right.
+Nodes are numbered in order of first appearance while walking each hex's
+corners clockwise from the top, and edges likewise while walking its sides.
+With this numbering the six corners of hex 1 are nodes 1..6.
+
+Besides the numbering, the adjacency indexes every rules module needs are
+built here once: node -> neighbours / edges / hexes, edge -> nodes and
+hex -> nodes, both as index tuples and as bitmasks, plus the distance-rule
+masks and the harbour positions on the frame. Layout-dependent lookups
+(which hexes produce on which roll, and so on) live in
+:mod:`catan_bot.board`.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+ROW_LENGTHS: Tuple[int, ...] = (3, 4, 5, 4, 3)
+
+# Pointy-top hex corners on an integer grid where neighbouring hexes in a row
+# are 2 units apart and rows are 3 units apart: N, NE, SE, S, SW, NW.
+_CORNER_OFFSETS: Tuple[Tuple[int, int], ...] = (
+    (0, -2),
+    (1, -1),
+    (1, 1),
+    (0, 2),
+    (-1, 1),
+    (-1, -1),
+)
+
+
+def _build() -> Tuple[
+    Tuple[Tuple[int, ...], ...],
+    Tuple[Tuple[int, int], ...],
+]:
+    widest = max(ROW_LENGTHS)
+    node_of_point: Dict[Tuple[int, int], int] = {}
+    edge_of_pair: Dict[Tuple[int, int], int] = {}
+    hex_nodes: List[Tuple[int, ...]] = []
+    edges: List[Tuple[int, int]] = []
+
+    for row, length in enumerate(ROW_LENGTHS):
+        for col in range(length):
+            cx = (widest - length) + 2 * col
+            cy = 3 * row
+            corners = []
+            for dx, dy in _CORNER_OFFSETS:
+                point = (cx + dx, cy + dy)
+                if point not in node_of_point:
+                    node_of_point[point] = len(node_of_point)
+                corners.append(node_of_point[point])
+            hex_nodes.append(tuple(corners))
+            for i in range(6):
+                a, b = corners[i], corners[(i + 1) % 6]
+                pair = (min(a, b), max(a, b))
+                if pair not in edge_of_pair:
+                    edge_of_pair[pair] = len(edges)
+                    edges.append(pair)
+
+    return tuple(hex_nodes), tuple(edges)
+
+
+# Per hex index its six node indices; per edge index its (low, high) node indices.
+HEX_NODES, EDGES = _build()
+
+NUM_HEXES = len(HEX_NODES)
+NUM_NODES = 1 + max(n for nodes in HEX_NODES for n in nodes)
+NUM_EDGES = len(EDGES)
+
+EDGE_INDEX: Dict[Tuple[int, int], int] = {pair: i for i, pair in enumerate(EDGES)}
+
+
+def edge_index(node_a_id: int, node_b_id: int) -> int:
+    """Return the edge index joining two node ids, in either order."""
+
+    a, b = node_a_id - 1, node_b_id - 1
+    try:
+        return EDGE_INDEX[(a, b) if a < b else (b, a)]
+    except KeyError:
+        raise ValueError(f"Nodes {node_a_id} and {node_b_id} are not adjacent.") from None
+
+
+def edge_node_ids(edge: int) -> Tuple[int, int]:
+    """Return the (low, high) node ids of an edge index."""
+
+    a, b = EDGES[edge]
+    return a + 1, b + 1
+
+
+def _build_adjacency() -> Tuple[
+    Tuple[Tuple[int, ...], ...],
+    Tuple[Tuple[int, ...], ...],
+    Tuple[Tuple[int, ...], ...],
+]:
+    neighbors: List[List[int]] = [[] for _ in range(NUM_NODES)]
+    node_edges: List[List[int]] = [[] for _ in range(NUM_NODES)]
+    node_hexes: List[List[int]] = [[] for _ in range(NUM_NODES)]
+    for e, (a, b) in enumerate(EDGES):
+        neighbors[a].append(b)
+        neighbors[b].append(a)
+        node_edges[a].append(e)
+        node_edges[b].append(e)
+    for h, nodes in enumerate(HEX_NODES):
+        for n in nodes:
+            node_hexes[n].append(h)
+    return (
+        tuple(tuple(sorted(x)) for x in neighbors),
+        tuple(tuple(x) for x in node_edges),
+        tuple(tuple(x) for x in node_hexes),
+    )
+
+
+# Per node index: neighbouring node indices, incident edge indices and the
+# indices of the (one to three) hexes it touches.
+NODE_NEIGHBORS, NODE_EDGES, NODE_HEXES = _build_adjacency()
+
+
+def _mask(indices) -> int:
+    mask = 0
+    for i in indices:
+        mask |= 1 << i
+    return mask
+
+
+NODE_NEIGHBORS_MASK: Tuple[int, ...] = tuple(_mask(x) for x in NODE_NEIGHBORS)
+NODE_EDGES_MASK: Tuple[int, ...] = tuple(_mask(x) for x in NODE_EDGES)
+EDGE_NODES_MASK: Tuple[int, ...] = tuple(_mask(pair) for pair in EDGES)
+HEX_NODES_MASK: Tuple[int, ...] = tuple(_mask(nodes) for nodes in HEX_NODES)
+# A node and its neighbours: no other settlement may stand inside this mask
+# of an existing one.
+DISTANCE_MASK: Tuple[int, ...] = tuple(
+    (1 << n) | NODE_NEIGHBORS_MASK[n] for n in range(NUM_NODES)
+)
+
+
+def _coast() -> Tuple[int, ...]:
+    """Edge indices on the outer frame, in order walking around the board."""
+
+    hex_count = [0] * NUM_EDGES
+    for nodes in HEX_NODES:
+        for i in range(6):
+            hex_count[edge_index(nodes[i] + 1, nodes[(i + 1) % 6] + 1)] += 1
+    coastal = {e for e in range(NUM_EDGES) if hex_count[e] == 1}
+
+    ring = []
+    node = HEX_NODES[0][0]
+    previous = None
+    while len(ring) < len(coastal):
+        edge = next(e for e in NODE_EDGES[node] if e in coastal and e != previous)
+        ring.append(edge)
+        a, b = EDGES[edge]
+        node = b if a == node else a
+        previous = edge
+    return tuple(ring)
+
+
+COAST_EDGES = _coast()
+
+# Harbours sit on every third or fourth coastal edge. Their kinds follow the
+# standard frame (None is a generic 3:1 harbour, a resource name a 2:1 one);
+# GameState does not describe harbours, so every board uses this frame.
+_PORT_SLOTS = (0, 3, 7, 10, 13, 17, 20, 23, 27)
+_PORT_KINDS: Tuple[Optional[str], ...] = (
+    None,
+    "wool",
+    None,
+    None,
+    "brick",
+    "lumber",
+    None,
+    "grain",
+    "ore",
+)
+# (edge index, resource name or None) per harbour.
+PORTS: Tuple[Tuple[int, Optional[str]], ...] = tuple(
+    (COAST_EDGES[slot], kind) for slot, kind in zip(_PORT_SLOTS, _PORT_KINDS)
+)
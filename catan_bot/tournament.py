@@ -0,0 +1,446 @@
+"""
+Self-play tournaments between bots.
+
+Each game starts from a fresh random board (``newgame.random_game_state``) and
+is played to a win or a turn horizon on ``CompactState``. Games run in a
+process pool; every finished game is written to the output file as soon as it
+arrives and only running totals (wins, Elo, throughput) are kept in memory.
+Games can also be recorded move by move into a binary game log
+(:mod:`catan_bot.gamelog`).
+
+Agents are given as spec strings:
+
+- ``random``: a uniformly random legal move
+- ``policy``: the rollout default policy
+- ``heuristic``: the best move by expected value (:mod:`catan_bot.evaluate`)
+- ``rollout[:seconds]``: ``RolloutEngine`` with a per-decision time budget
+- ``llm[:model]``: the model via Ollama, offered the legal move menu and
+  constrained to it; an illegal or failed answer counts as invalid and ends
+  the turn
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import requests
+
+from .compact import PHASE_INDEX, CompactState
+from .evaluate import score_codes
+from .gamelog import GameLogWriter, GameRecording
+from .models import TurnPhase
+from .movegen import END_TURN, encode_move, legal_move_codes
+from .newgame import random_game_state
+from .ollama_client import OllamaClient, OllamaConfig
+from .prompt import PromptSession
+from .rollout import DEFAULT_MAX_TURNS, MAX_ACTIONS_PER_TURN, RolloutEngine, default_policy
+from .rules import apply_move, roll_dice, winner
+
+_START_OF_TURN = PHASE_INDEX[TurnPhase.START_OF_TURN]
+_AFTER_ROLL = PHASE_INDEX[TurnPhase.AFTER_ROLL]
+_MAIN_ACTION = PHASE_INDEX[TurnPhase.MAIN_ACTION]
+
+INITIAL_RATING = 1500.0
+ELO_K = 16.0
+DEFAULT_ROLLOUT_BUDGET = 0.1
+
+
+# ----------------------------------------------------------------------
+# Agents
+# ----------------------------------------------------------------------
+
+
+class Agent(ABC):
+    """Picks a move code for the current player of a ``CompactState``.
+
+    ``legal`` is the list of legal move codes; returning anything else (or
+    ``None``) counts as an invalid move.
+    """
+
+    @abstractmethod
+    def choose(self, state: CompactState, legal: List[int], rng: random.Random) -> Optional[int]:
+        ...
+
+
+class RandomAgent(Agent):
+    def choose(self, state: CompactState, legal: List[int], rng: random.Random) -> Optional[int]:
+        return rng.choice(legal)
+
+
+class PolicyAgent(Agent):
+    def choose(self, state: CompactState, legal: List[int], rng: random.Random) -> Optional[int]:
+        return default_policy(state, rng)
+
+
+class HeuristicAgent(Agent):
+    def choose(self, state: CompactState, legal: List[int], rng: random.Random) -> Optional[int]:
+        return score_codes(state, legal)[0][0]
+
+
+class RolloutAgent(Agent):
+    def __init__(self, time_budget: float = DEFAULT_ROLLOUT_BUDGET) -> None:
+        self.time_budget = time_budget
+        # Games already run one per process, so rollouts stay in-process.
+        self.engine = RolloutEngine(workers=1)
+
+    def choose(self, state: CompactState, legal: List[int], rng: random.Random) -> Optional[int]:
+        if len(legal) == 1:
+            return legal[0]
+        estimates = self.engine.evaluate(
+            state.to_game_state(), time_budget=self.time_budget, seed=rng.getrandbits(63)
+        )
+        return encode_move(state, estimates[0].action)
+
+
+# One client (and connection pool) per model per process, shared by games.
+_llm_clients: Dict[str, OllamaClient] = {}
+
+
+class LLMAgent(Agent):
+    def __init__(self, model: Optional[str] = None) -> None:
+        config = OllamaConfig(
+            compact_prompt=True, offer_legal_moves=True, constrain_output=True
+        )
+        if model:
+            config.model = model
+        client = _llm_clients.get(config.model)
+        if client is None:
+            client = _llm_clients[config.model] = OllamaClient(config)
+        self.client = client
+        # Conversation for this seat in this game only.
+        self.session = PromptSession()
+
+    def choose(self, state: CompactState, legal: List[int], rng: random.Random) -> Optional[int]:
+        try:
+            move = self.client.choose_move(state.to_game_state(), self.session)
+        except (requests.RequestException, RuntimeError, ValueError):
+            return None
+        return encode_move(state, move.action)
+
+
+def make_agent(spec: str) -> Agent:
+    """Build an agent from a spec string such as ``"rollout:0.5"``."""
+
+    kind, _, arg = spec.partition(":")
+    if kind == "random":
+        return RandomAgent()
+    if kind == "policy":
+        return PolicyAgent()
+    if kind == "heuristic":
+        return HeuristicAgent()
+    if kind == "rollout":
+        return RolloutAgent(float(arg) if arg else DEFAULT_ROLLOUT_BUDGET)
+    if kind == "llm":
+        return LLMAgent(arg or None)
+    raise ValueError(f"Unknown agent {spec!r}; expected random, policy, heuristic, rollout or llm.")
+
+
+def agent_labels(specs: Sequence[str]) -> List[str]:
+    """Unique labels for the agents, numbering repeated specs (``random#2``)."""
+
+    labels = []
+    for i, spec in enumerate(specs):
+        if specs.count(spec) > 1:
+            labels.append(f"{spec}#{specs[: i + 1].count(spec)}")
+        else:
+            labels.append(spec)
+    return labels
+
+
+# ----------------------------------------------------------------------
+# Playing one game
+# ----------------------------------------------------------------------
+
+
+def play_game(
+    seats: Sequence[str],
+    specs: Dict[str, str],
+    seed: int,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    game: int = 0,
+    record: bool = False,
+) -> Dict[str, Any]:
+    """Play one game and return its result record.
+
+    ``seats`` lists agent labels in seat order and ``specs`` maps each label
+    to its agent spec. With ``record``, the result's ``"recording"`` holds
+    every decision as a ``GameRecording``.
+    """
+
+    rng = random.Random(seed)
+    agents = [make_agent(specs[label]) for label in seats]
+    start = time.perf_counter()
+    state = CompactState.from_game_state(random_game_state(len(seats), rng, seats))
+    recording = None
+    if record:
+        recording = GameRecording(state, {"game": game, "seed": seed, "seats": list(seats)})
+
+    moves = 0
+    invalid = [0] * len(seats)
+    actions = 0
+    found = None
+    while state.turn_number < max_turns and found is None:
+        if state.phase == _START_OF_TURN:
+            roll_dice(state, rng)
+            actions = 0
+        elif state.phase == _MAIN_ACTION and actions >= MAX_ACTIONS_PER_TURN:
+            state.end_turn()
+        elif state.phase == _MAIN_ACTION or state.phase == _AFTER_ROLL:
+            player = state.current
+            legal = legal_move_codes(state)
+            code = agents[player].choose(state, legal, rng)
+            if code not in legal:
+                invalid[player] += 1
+                code = END_TURN if state.phase == _MAIN_ACTION else rng.choice(legal)
+            if recording is not None:
+                recording.record(state, code)
+            apply_move(state, code, rng)
+            moves += 1
+            actions += 1
+            found = winner(state)
+        else:
+            state.end_turn()
+
+    result = {
+        "game": game,
+        "seed": seed,
+        "seats": list(seats),
+        "winner": seats[found] if found is not None else None,
+        "victory_points": list(state.victory_points),
+        "turns": state.turn_number,
+        "moves": moves,
+        "invalid_moves": invalid,
+        "duration_seconds": round(time.perf_counter() - start, 4),
+    }
+    if recording is not None:
+        recording.finish(state)
+        result["recording"] = recording
+    return result
+
+
+def _play(args: tuple) -> Dict[str, Any]:
+    return play_game(*args)
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+
+class ResultWriter:
+    """Appends game records to a JSONL file, or to Parquet for ``*.parquet``.
+
+    Parquet output needs the optional ``pyarrow`` package and is written in
+    row groups of ``batch_size`` records.
+    """
+
+    def __init__(self, path: Union[str, Path], batch_size: int = 256) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self._rows: List[Dict[str, Any]] = []
+        self._parquet = None
+        self._schema = None
+        if self.path.suffix == ".parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as exc:
+                raise RuntimeError("Parquet output requires the pyarrow package.") from exc
+            self._file = None
+        else:
+            self._file = open(self.path, "w", encoding="utf-8")
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self._file is not None:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+            return
+        self._rows.append(record)
+        if len(self._rows) >= self.batch_size:
+            self._flush_parquet()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            return
+        self._flush_parquet()
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+
+    def _flush_parquet(self) -> None:
+        if not self._rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pylist(self._rows, schema=self._schema)
+        if self._parquet is None:
+            self._schema = table.schema
+            self._parquet = pq.ParquetWriter(str(self.path), self._schema)
+        self._parquet.write_table(table)
+        self._rows.clear()
+
+
+@dataclass
+class AgentStats:
+    games: int = 0
+    wins: int = 0
+    rating: float = INITIAL_RATING
+    invalid_moves: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+
+@dataclass
+class TournamentSummary:
+    """Running totals over all finished games."""
+
+    agents: Dict[str, AgentStats]
+    games: int = 0
+    unfinished: int = 0
+    moves: int = 0
+    elapsed_seconds: float = 0.0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def games_per_hour(self) -> float:
+        return 3600 * self.games / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.moves / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def record(self, result: Dict[str, Any]) -> None:
+        self.games += 1
+        self.moves += result["moves"]
+        if result["winner"] is None:
+            self.unfinished += 1
+        seats = result["seats"]
+        for label, invalid in zip(seats, result["invalid_moves"]):
+            stats = self.agents[label]
+            stats.games += 1
+            stats.invalid_moves += invalid
+            if label == result["winner"]:
+                stats.wins += 1
+        update_elo(self.agents, seats, _final_scores(result))
+        self.elapsed_seconds = time.perf_counter() - self._started
+
+
+def _final_scores(result: Dict[str, Any]) -> List[float]:
+    # The winner ranks first even if an opponent is level on points.
+    scores = [float(vp) for vp in result["victory_points"]]
+    if result["winner"] is not None:
+        scores[result["seats"].index(result["winner"])] += 0.5
+    return scores
+
+
+def update_elo(agents: Dict[str, AgentStats], seats: Sequence[str], scores: Sequence[float]) -> None:
+    """Multiplayer Elo: each pair of seats is scored as a game by final rank."""
+
+    n = len(seats)
+    if n < 2:
+        return
+    ratings = [agents[label].rating for label in seats]
+    k = ELO_K / (n - 1)
+    for i, j in itertools.combinations(range(n), 2):
+        expected = 1 / (1 + 10 ** ((ratings[j] - ratings[i]) / 400))
+        actual = 1.0 if scores[i] > scores[j] else 0.5 if scores[i] == scores[j] else 0.0
+        agents[seats[i]].rating += k * (actual - expected)
+        agents[seats[j]].rating -= k * (actual - expected)
+
+
+# ----------------------------------------------------------------------
+# Scheduling
+# ----------------------------------------------------------------------
+
+
+def run_tournament(
+    agents: Sequence[str],
+    games: int,
+    workers: Optional[int] = None,
+    output: Union[str, Path, None] = None,
+    seed: Optional[int] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    on_result: Optional[Callable[[Dict[str, Any], TournamentSummary], None]] = None,
+    log: Union[str, Path, None] = None,
+) -> TournamentSummary:
+    """Play ``games`` games between ``agents`` (2 to 4 specs).
+
+    Seats rotate from game to game so every agent moves first equally often.
+    At most ``2 * workers`` games are scheduled at a time, and each result is
+    written to ``output`` and folded into the summary as soon as it finishes.
+    With ``log``, every decision is also appended to that binary game log
+    (:mod:`catan_bot.gamelog`).
+    """
+
+    if not 2 <= len(agents) <= 4:
+        raise ValueError("A tournament needs between 2 and 4 agents.")
+    labels = agent_labels(list(agents))
+    specs = dict(zip(labels, agents))
+    for spec in agents:
+        make_agent(spec)  # Fail fast on bad specs, before starting workers.
+    workers = workers or os.cpu_count() or 1
+    rng = random.Random(seed)
+
+    def tasks():
+        for g in range(games):
+            shift = g % len(labels)
+            seats = labels[shift:] + labels[:shift]
+            yield (seats, specs, rng.getrandbits(63), max_turns, g, log is not None)
+
+    summary = TournamentSummary(agents={label: AgentStats() for label in labels})
+    writer = ResultWriter(output) if output is not None else None
+    game_log = GameLogWriter(log, len(labels)) if log is not None else None
+    try:
+
+        def finish(result: Dict[str, Any]) -> None:
+            recording = result.pop("recording", None)
+            if game_log is not None:
+                game_log.append(recording)
+            summary.record(result)
+            if writer is not None:
+                writer.write(result)
+            if on_result is not None:
+                on_result(result, summary)
+
+        if workers <= 1:
+            for task in tasks():
+                finish(_play(task))
+            return summary
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Dict[Future, int] = {}
+            queue = tasks()
+            for task in itertools.islice(queue, 2 * workers):
+                pending[pool.submit(_play, task)] = task[4]
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    del pending[future]
+                    finish(future.result())
+                    for task in itertools.islice(queue, 1):
+                        pending[pool.submit(_play, task)] = task[4]
+        return summary
+    finally:
+        if writer is not None:
+            writer.close()
+        if game_log is not None:
+            game_log.close()
@@ -0,0 +1,10 @@
+-- Index for listing a user's game sessions newest first with keyset
+-- (created_at, id) pagination: GET /users/{user_id}/sessions walks this index
+-- in order and stops after one page, without sorting or reading older rows.
+
+create index if not exists game_sessions_user_created_idx
+  on public.game_sessions (user_id, created_at desc, id desc);
+
+-- The new index leads with user_id, so it also serves every lookup of the
+-- single-column index from 0001; keeping both would cost every insert twice.
+drop index if exists public.game_sessions_user_id_idx;
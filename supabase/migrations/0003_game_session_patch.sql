@@ -0,0 +1,185 @@
+-- Incremental game-state updates: PATCH /users/{user_id}/sessions/{id} sends
+-- an RFC 6902 JSON Patch or a path delta, and the backend applies it inside
+-- Postgres with the functions below. Clients send the changed values only,
+-- never the whole state, and `version` gives optimistic concurrency: the
+-- UPDATE only matches the version the change was made against.
+
+alter table public.game_sessions
+  add column if not exists version integer not null default 0;
+
+-- JSON Pointer (RFC 6901) -> text[] path usable with #>, #- and jsonb_set.
+create or replace function public.jsonb_pointer_path(pointer text)
+returns text[]
+language plpgsql
+immutable
+as $$
+begin
+  if pointer = '' then
+    return '{}';
+  end if;
+  if pointer is null or left(pointer, 1) <> '/' then
+    raise exception 'json patch: invalid JSON pointer %', coalesce(pointer, 'null')
+      using errcode = '22023';
+  end if;
+  return (
+    select array_agg(replace(replace(token, '~1', '/'), '~0', '~') order by n)
+    from unnest(regexp_split_to_array(substr(pointer, 2), '/')) with ordinality as t(token, n)
+  );
+end;
+$$;
+
+-- Value at path, or null if it does not exist. Unlike #>, array tokens must be
+-- non-negative indexes without leading zeros.
+create or replace function public.jsonb_pointer_get(doc jsonb, path text[])
+returns jsonb
+language plpgsql
+immutable
+as $$
+declare
+  token text;
+begin
+  foreach token in array coalesce(path, '{}') loop
+    if jsonb_typeof(doc) = 'object' then
+      doc := doc -> token;
+    elsif jsonb_typeof(doc) = 'array' and token ~ '^(0|[1-9][0-9]{0,8})$' then
+      doc := doc -> token::int;
+    else
+      return null;
+    end if;
+    if doc is null then
+      return null;
+    end if;
+  end loop;
+  return doc;
+end;
+$$;
+
+-- RFC 6902 "add": set an object member, or insert into an array ("-" appends).
+create or replace function public.jsonb_patch_add(doc jsonb, path text[], value jsonb)
+returns jsonb
+language plpgsql
+immutable
+as $$
+declare
+  n integer := coalesce(array_length(path, 1), 0);
+  parent jsonb;
+  len integer;
+begin
+  if value is null then
+    raise exception 'json patch: missing value for %', array_to_string(path, '/')
+      using errcode = '22023';
+  end if;
+  if n = 0 then
+    return value;
+  end if;
+  parent := public.jsonb_pointer_get(doc, path[1:n - 1]);
+  if jsonb_typeof(parent) = 'object' then
+    return jsonb_set(doc, path, value, true);
+  elsif jsonb_typeof(parent) = 'array' then
+    len := jsonb_array_length(parent);
+    if path[n] = '-' or path[n] = len::text then
+      if n = 1 then
+        return parent || jsonb_build_array(value);
+      end if;
+      return jsonb_set(doc, path[1:n - 1], parent || jsonb_build_array(value));
+    elsif path[n] ~ '^(0|[1-9][0-9]{0,8})$' and path[n]::int < len then
+      return jsonb_insert(doc, path, value);
+    end if;
+    raise exception 'json patch: array index in /% out of range', array_to_string(path, '/')
+      using errcode = '22023';
+  end if;
+  raise exception 'json patch: path /% not found', array_to_string(path, '/')
+    using errcode = '22023';
+end;
+$$;
+
+-- Apply RFC 6902 operations in order. Any failure raises (SQLSTATE 22023) and
+-- the UPDATE using it changes nothing.
+create or replace function public.jsonb_patch(doc jsonb, patch jsonb)
+returns jsonb
+language plpgsql
+immutable
+as $$
+declare
+  op jsonb;
+  path text[];
+  src text[];
+  value jsonb;
+begin
+  for op in select elem from jsonb_array_elements(patch) as t(elem) loop
+    path := public.jsonb_pointer_path(op ->> 'path');
+    case op ->> 'op'
+      when 'add' then
+        doc := public.jsonb_patch_add(doc, path, op -> 'value');
+      when 'remove' then
+        if path = '{}' or public.jsonb_pointer_get(doc, path) is null then
+          raise exception 'json patch: path % not found', op ->> 'path' using errcode = '22023';
+        end if;
+        doc := doc #- path;
+      when 'replace' then
+        if public.jsonb_pointer_get(doc, path) is null or op -> 'value' is null then
+          raise exception 'json patch: path % not found', op ->> 'path' using errcode = '22023';
+        end if;
+        doc := case when path = '{}' then op -> 'value' else jsonb_set(doc, path, op -> 'value', false) end;
+      when 'move', 'copy' then
+        src := public.jsonb_pointer_path(op ->> 'from');
+        value := public.jsonb_pointer_get(doc, src);
+        if value is null then
+          raise exception 'json patch: path % not found', op ->> 'from' using errcode = '22023';
+        end if;
+        if op ->> 'op' = 'move' then
+          if path = src then
+            continue;
+          end if;
+          if path[1:coalesce(array_length(src, 1), 0)] = src then
+            raise exception 'json patch: cannot move % into its own child', op ->> 'from'
+              using errcode = '22023';
+          end if;
+          doc := doc #- src;
+        end if;
+        doc := public.jsonb_patch_add(doc, path, value);
+      when 'test' then
+        if public.jsonb_pointer_get(doc, path) is distinct from op -> 'value' then
+          raise exception 'json patch: test failed at %', op ->> 'path' using errcode = '22023';
+        end if;
+      else
+        raise exception 'json patch: unknown operation %', op ->> 'op' using errcode = '22023';
+    end case;
+  end loop;
+  return doc;
+end;
+$$;
+
+-- Apply a turn delta: [[pointer, value], ...] in order. Each value replaces
+-- what is at its pointer (jsonb_set); a missing object member is created and
+-- "-" appends to an array. The parent must exist.
+create or replace function public.jsonb_set_paths(doc jsonb, delta jsonb)
+returns jsonb
+language plpgsql
+immutable
+as $$
+declare
+  item jsonb;
+  path text[];
+  n integer;
+  parent jsonb;
+begin
+  for item in select elem from jsonb_array_elements(delta) as t(elem) loop
+    path := public.jsonb_pointer_path(item ->> 0);
+    n := coalesce(array_length(path, 1), 0);
+    if n > 0 then
+      parent := public.jsonb_pointer_get(doc, path[1:n - 1]);
+    end if;
+    if n > 0 and jsonb_typeof(parent) = 'array' and path[n] <> '-' then
+      if public.jsonb_pointer_get(parent, path[n:n]) is null then
+        raise exception 'json patch: array index in % out of range', item ->> 0
+          using errcode = '22023';
+      end if;
+      doc := jsonb_set(doc, path, item -> 1, false);
+    else
+      doc := public.jsonb_patch_add(doc, path, item -> 1);
+    end if;
+  end loop;
+  return doc;
+end;
+$$;
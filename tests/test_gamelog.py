@@ -0,0 +1,114 @@
+import os
+import random
+import subprocess
+import sys
+import textwrap
+
+from catan_bot.compact import PHASE_INDEX, CompactState
+from catan_bot.gamelog import GameLogReader, GameLogWriter, GameRecording
+from catan_bot.models import TurnPhase
+from catan_bot.movegen import legal_move_codes
+from catan_bot.newgame import random_game_state
+from catan_bot.rules import apply_move, roll_dice
+
+NUM_PLAYERS = 3
+
+_START_OF_TURN = PHASE_INDEX[TurnPhase.START_OF_TURN]
+
+
+def _random_game(seed: int, moves: int):
+    """Yield ``moves`` random (state before the move, move code) pairs of a seeded game."""
+
+    rng = random.Random(seed)
+    state = CompactState.from_game_state(random_game_state(NUM_PLAYERS, rng))
+    played = 0
+    while played < moves:
+        if state.phase == _START_OF_TURN:
+            roll_dice(state, rng)
+            continue
+        code = rng.choice(legal_move_codes(state))
+        yield state, code
+        apply_move(state, code, rng)
+        played += 1
+
+
+def _play(writer: GameLogWriter, seed: int, moves: int = 40):
+    """Log a seeded game; returns its (packed state, code) pairs."""
+
+    played = []
+    for state, code in _random_game(seed, moves):
+        if not played:
+            writer.begin_game(state, {"seed": seed})
+        writer.record(state, code)
+        played.append((state.pack(), code))
+    writer.end_game(state)
+    return played
+
+
+def _logged(reader: GameLogReader):
+    return [(record.state.pack(), record.move) for record in reader]
+
+
+def test_round_trip_and_append(tmp_path):
+    path = tmp_path / "games.log"
+    with GameLogWriter(path, NUM_PLAYERS) as writer:
+        first = _play(writer, 1)
+
+    with GameLogWriter(path, NUM_PLAYERS) as writer:
+        second = []
+        for state, code in _random_game(2, 10):
+            if not second:
+                recording = GameRecording(state, {"seed": 2})
+            recording.record(state, code)
+            second.append((state.pack(), code))
+        recording.finish(state)
+        assert writer.append(recording) == 1
+        third = _play(writer, 3, moves=25)
+
+    with GameLogReader(path) as reader:
+        assert [g.info["seed"] for g in reader.games] == [1, 2, 3]
+        assert [g.count for g in reader.games] == [40, 10, 25]
+        assert len(reader) == 75
+        assert _logged(reader) == first + second + third
+        assert [code for _, code in reader.moves()] == [code for _, code in first + second + third]
+        assert reader.game_of(39) == 0 and reader.game_of(40) == 1 and reader.game_of(50) == 2
+        assert list(reader.game_records(1)) == list(range(40, 50))
+        record = reader[45]
+        assert (record.game, record.ply) == (1, 5)
+        assert reader[-1].ply == 24
+
+
+def test_previous_index_survives_a_crashed_writer(tmp_path):
+    path = tmp_path / "games.log"
+    with GameLogWriter(path, NUM_PLAYERS) as writer:
+        first = _play(writer, 1)
+    before = os.path.getsize(path)
+
+    # A writer that appends a long game and dies without closing the log.
+    script = textwrap.dedent(
+        f"""
+        import os, sys
+        sys.path.insert(0, {os.getcwd()!r})
+        sys.path.insert(0, {os.path.dirname(__file__)!r})
+        from catan_bot.gamelog import GameLogWriter
+        from test_gamelog import NUM_PLAYERS, _play
+
+        writer = GameLogWriter({str(path)!r}, NUM_PLAYERS)
+        _play(writer, 2, moves=200)
+        os._exit(1)
+        """
+    )
+    result = subprocess.run([sys.executable, "-c", script])
+    assert result.returncode == 1
+    # Some of the crashed game's records reached the file, unreferenced.
+    assert os.path.getsize(path) > before
+
+    with GameLogReader(path) as reader:
+        assert [g.info["seed"] for g in reader.games] == [1]
+        assert _logged(reader) == first
+
+    with GameLogWriter(path, NUM_PLAYERS) as writer:
+        third = _play(writer, 3, moves=20)
+    with GameLogReader(path) as reader:
+        assert [g.info["seed"] for g in reader.games] == [1, 3]
+        assert _logged(reader) == first + third
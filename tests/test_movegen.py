@@ -0,0 +1,221 @@
+import random
+
+from catan_bot.compact import NUM_RESOURCES, PHASE_INDEX, CompactState
+from catan_bot.models import BuildAction, BuildType, RobberAction, TradeAction, TradeType, TurnPhase
+from catan_bot.movegen import (
+    CITY_COST,
+    DEV_CARD,
+    DEV_CARD_COST,
+    END_TURN,
+    KIND_BANK_TRADE,
+    KIND_CITY,
+    KIND_PLAYER_TRADE,
+    KIND_ROAD,
+    KIND_ROBBER,
+    KIND_SETTLEMENT,
+    MAX_CITIES,
+    MAX_ROADS,
+    MAX_SETTLEMENTS,
+    ROAD_COST,
+    SETTLEMENT_COST,
+    decode_move,
+    encode_move,
+    is_legal,
+    legal_move_codes,
+    legal_moves,
+    make_move,
+    move_kind,
+    move_payload,
+)
+from catan_bot.newgame import random_game_state
+from catan_bot.rules import apply_move, roll_dice, winner
+from catan_bot.topology import EDGES, NODE_NEIGHBORS, NUM_EDGES, NUM_NODES
+
+_START_OF_TURN = PHASE_INDEX[TurnPhase.START_OF_TURN]
+_AFTER_ROLL = PHASE_INDEX[TurnPhase.AFTER_ROLL]
+_MAIN_ACTION = PHASE_INDEX[TurnPhase.MAIN_ACTION]
+
+
+def _decision_states(seed: int, limit: int = 60):
+    """Decision states along a random game played with the rules."""
+
+    rng = random.Random(seed)
+    state = CompactState.from_game_state(random_game_state(rng=rng))
+    # Enough cards to make every kind of move reachable early on.
+    for p in range(state.num_players):
+        state.add_resources(p, [6] * NUM_RESOURCES)
+    states = []
+    while len(states) < limit and winner(state) is None:
+        if state.phase == _START_OF_TURN:
+            roll_dice(state, rng)
+        elif state.phase in (_MAIN_ACTION, _AFTER_ROLL):
+            states.append(state.clone())
+            codes = legal_move_codes(state)
+            # Prefer anything over ending the turn so the board fills up.
+            apply_move(state, rng.choice(codes[1:] or codes), rng)
+            if rng.random() < 0.1 and state.phase == _MAIN_ACTION:
+                state.end_turn()
+        else:
+            state.end_turn()
+    return states
+
+
+def _bits(mask: int):
+    return [i for i in range(mask.bit_length()) if mask >> i & 1]
+
+
+def _reference_codes(state: CompactState):
+    """Legal move codes worked out from the rules directly, without bitmask tables."""
+
+    player = state.current
+    buildings = [s | c for s, c in zip(state.settlements, state.cities)]
+    if state.phase == _AFTER_ROLL:
+        codes = []
+        for hex_id in state.header.hex_ids:
+            if hex_id == state.robber_hex_id:
+                continue
+            nodes = state.header.topology.nodes_of(hex_id)
+            victims = [
+                p
+                for p in range(state.num_players)
+                if p != player and buildings[p] & nodes and sum(state.hand(p))
+            ]
+            codes += [make_move(KIND_ROBBER, (hex_id << 8) | (v + 1)) for v in victims]
+            if not victims:
+                codes.append(make_move(KIND_ROBBER, hex_id << 8))
+        return codes
+    if state.phase != _MAIN_ACTION:
+        return [END_TURN]
+
+    hand = state.hand(player)
+
+    def affordable(cost):
+        return all(hand[k] >= cost[k] for k in range(NUM_RESOURCES))
+
+    occupied = 0
+    for b in buildings:
+        occupied |= b
+    all_roads = 0
+    for r in state.roads:
+        all_roads |= r
+    road_ends = {n for e in _bits(state.roads[player]) for n in EDGES[e]}
+    own = buildings[player]
+
+    codes = [END_TURN]
+    if affordable(ROAD_COST) and len(_bits(state.roads[player])) < MAX_ROADS:
+        for e in range(NUM_EDGES):
+            if all_roads >> e & 1:
+                continue
+            if any(
+                own >> n & 1 or (n in road_ends and not occupied >> n & 1)
+                for n in EDGES[e]
+            ):
+                codes.append(make_move(KIND_ROAD, e))
+    if affordable(SETTLEMENT_COST) and len(_bits(state.settlements[player])) < MAX_SETTLEMENTS:
+        for n in range(NUM_NODES):
+            if n in road_ends and not any(
+                occupied >> m & 1 for m in (n,) + NODE_NEIGHBORS[n]
+            ):
+                codes.append(make_move(KIND_SETTLEMENT, n))
+    if affordable(CITY_COST) and len(_bits(state.cities[player])) < MAX_CITIES:
+        codes += [make_move(KIND_CITY, n) for n in _bits(state.settlements[player])]
+    if affordable(DEV_CARD_COST):
+        codes.append(DEV_CARD)
+    for give in range(NUM_RESOURCES):
+        if hand[give] >= 4:
+            codes += [
+                make_move(KIND_BANK_TRADE, (4 << 8) | (give << 4) | receive)
+                for receive in range(NUM_RESOURCES)
+                if receive != give
+            ]
+    for other in range(state.num_players):
+        if other == player:
+            continue
+        other_hand = state.hand(other)
+        for give in range(NUM_RESOURCES):
+            for receive in range(NUM_RESOURCES):
+                if give != receive and hand[give] and other_hand[receive]:
+                    codes.append(
+                        make_move(KIND_PLAYER_TRADE, (other << 8) | (give << 4) | receive)
+                    )
+    return codes
+
+
+def test_codes_round_trip_through_move_actions():
+    for seed in range(5):
+        for state in _decision_states(seed):
+            for code in legal_move_codes(state):
+                assert make_move(move_kind(code), move_payload(code)) == code
+                assert encode_move(state, decode_move(state, code)) == code
+
+
+def test_generated_codes_match_the_rules():
+    seen_kinds = set()
+    for seed in range(5):
+        for state in _decision_states(seed):
+            codes = legal_move_codes(state)
+            assert len(codes) == len(set(codes))
+            assert sorted(codes) == sorted(_reference_codes(state))
+            seen_kinds.update(move_kind(c) for c in codes)
+
+            game_state = state.to_game_state()
+            moves = legal_moves(game_state)
+            assert moves == [decode_move(state, c) for c in codes]
+            assert all(is_legal(game_state, m) for m in moves)
+    assert seen_kinds >= {
+        KIND_ROAD,
+        KIND_SETTLEMENT,
+        KIND_CITY,
+        KIND_BANK_TRADE,
+        KIND_PLAYER_TRADE,
+        KIND_ROBBER,
+    }
+
+
+def test_encode_rejects_actions_outside_the_code_space():
+    state = _decision_states(0, limit=1)[0]
+    ids = state.header.player_ids
+    stranger = max(ids) + 1
+
+    def bank(count):
+        return TradeAction(
+            trade_type=TradeType.BANK, give={"brick": count}, receive={"ore": 1}
+        )
+
+    assert move_payload(encode_move(state, bank(0xFF))) >> 8 == 0xFF
+    assert encode_move(state, bank(0x100)) is None
+    assert encode_move(state, bank(0)) is None
+    assert (
+        encode_move(
+            state,
+            TradeAction(
+                trade_type=TradeType.BANK, give={"brick": 4}, receive={"ore": 2}
+            ),
+        )
+        is None
+    )
+    assert (
+        encode_move(
+            state,
+            TradeAction(
+                trade_type=TradeType.PLAYER,
+                target_player_id=stranger,
+                give={"brick": 1},
+                receive={"ore": 1},
+            ),
+        )
+        is None
+    )
+    assert encode_move(state, RobberAction(target_hex_id=0x100)) is None
+    assert (
+        encode_move(state, RobberAction(target_hex_id=1, steal_from_player_id=stranger))
+        is None
+    )
+    assert (
+        encode_move(state, BuildAction(build_type=BuildType.ROAD, location="node_1"))
+        is None
+    )
+    assert (
+        encode_move(state, BuildAction(build_type=BuildType.CITY, location="nowhere"))
+        is None
+    )
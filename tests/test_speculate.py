@@ -0,0 +1,36 @@
+import random
+
+from catan_bot.compact import NUM_RESOURCES, PHASE_INDEX, CompactState
+from catan_bot.models import TurnPhase
+from catan_bot.newgame import random_game_state
+from catan_bot.rules import DISCARD_LIMIT
+from catan_bot.speculate import predict_decision_states
+
+
+def _near_discard_state(seed: int) -> CompactState:
+    state = CompactState.from_game_state(random_game_state(rng=random.Random(seed)))
+    state.phase = PHASE_INDEX[TurnPhase.START_OF_TURN]
+    state.current = 1
+    # Two hands one production away from the limit.
+    for p in (0, 1):
+        base = p * NUM_RESOURCES
+        for k in range(NUM_RESOURCES):
+            state.resources[base + k] = DISCARD_LIMIT if k == 0 else 0
+    return state
+
+
+def test_no_prediction_contains_a_discard():
+    for seed in range(20):
+        state = _near_discard_state(seed)
+        totals = [sum(state.hand(p)) for p in range(state.num_players)]
+        for _, predicted in predict_decision_states(state, player=0, limit=16):
+            for p in range(state.num_players):
+                assert sum(predicted.hand(p)) >= totals[p]
+
+
+def test_predictions_are_deterministic():
+    for seed in range(20):
+        state = _near_discard_state(seed)
+        first = [s.pack() for _, s in predict_decision_states(state, player=0, limit=16)]
+        second = [s.pack() for _, s in predict_decision_states(state, player=0, limit=16)]
+        assert first == second